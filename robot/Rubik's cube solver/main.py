@@ -1,5 +1,7 @@
 #!/usr/bin/env pybricks-micropython
 import socket
+import select
+import struct
 import time
 import sys
 import json
@@ -24,6 +26,60 @@ cube_index_to_pos = {
 	7: (2, 0),
 }
 
+def expand_item(item, macros:list):
+	"""Moves (primitives separated by spaces) of item of compressed program
+	(see solver/robot_model.py compress_program): move, index of macro or [item, n].
+	"""
+	if isinstance(item, str):
+		return [item]
+	if isinstance(item, int):
+		moves = list()
+		for macro_item in macros[item]:
+			moves += expand_item(macro_item, macros)
+		return moves
+
+	item, n = item
+	return expand_item(item, macros) * n
+
+class Link:
+	"""Framed messages with server (see solver/protocol.py):
+	length of body (4 bytes, big-endian), then JSON {"seq", "cmd", "data"}.
+	"""
+	def __init__(self, sock):
+		self.sock = sock
+		self.poller = select.poll()
+		self.poller.register(sock, select.POLLIN)
+		self.buffer = b""
+		self.seq = 0
+
+	def send(self, cmd:str, data=None):
+		body = json.dumps({"seq": self.seq, "cmd": cmd, "data": data}).encode()
+		self.seq += 1
+		frame = struct.pack(">I", len(body)) + body
+		while frame:
+			frame = frame[self.sock.send(frame):]
+
+	def recv(self, timeout:int=-1):
+		"""Return next message or None if there is no message for timeout ms.
+		:timeout - -1 waits forever.
+		"""
+		while True:
+			if len(self.buffer) >= 4:
+				length = struct.unpack(">I", self.buffer[:4])[0]
+				if len(self.buffer) >= 4 + length:
+					body = self.buffer[4:4 + length]
+					self.buffer = self.buffer[4 + length:]
+					return json.loads(body.decode())
+
+			if not self.poller.poll(timeout):
+				return None
+
+			data = self.sock.recv(1024)
+			if not data:
+				raise OSError("Server disconnected")
+			self.buffer += data
+
+
 class Robot:
 	def __init__(self):
 		"""Initalizing main robot parameters."""
@@ -53,6 +109,8 @@ class Robot:
 		# Codes of sides from color sensor
 		# 0 - Top, 1 - front, 2 - left, 3 - back, 4 - right, 5 - bottom
 		self.side_codes_seq = [0, 1, 2, 3, 4, 5]
+		# Side codes sequence and rotation of colors matrix at scan of every side
+		self.scan_states = list()
 
 		# Stabilization
 		self.hand.run_time(-90, 4000, wait=False) # -360
@@ -172,39 +230,117 @@ class Robot:
 		self.color_scanner_off()
 		return side_colors
 	
-	def scan_cube(self):
-		"""Full scan of all cube sides."""
+	def scan_cube(self, on_side_scanned=None):
+		"""Full scan of all cube sides.
+		:on_side_scanned - function(side, side_colors) which is called as soon as every side is scanned.
+		"""
 		cube_colors = list()
+		self.scan_states = list()
 		# 0 side
+		self.scan_states.append((list(self.side_codes_seq), 0))
 		cube_colors.append(self.scan_side())
+		if on_side_scanned:
+			on_side_scanned(0, cube_colors[-1])
 		# 1 side
 		self.hand_rotate(1, hand_raised=True)
+		self.scan_states.append((list(self.side_codes_seq), 0))
 		cube_colors.append(self.scan_side())
+		if on_side_scanned:
+			on_side_scanned(1, cube_colors[-1])
 		# 2 side
 		self.rotate_platform(n=1)
 		self.hand_rotate(1, hand_raised=True)
+		self.scan_states.append((list(self.side_codes_seq), 1))
 		side_colors = self.scan_side()
 		side_colors = self.rotate_matrix(side_colors, n=1, byclockwise=False)
 		cube_colors.append(side_colors)
+		if on_side_scanned:
+			on_side_scanned(2, side_colors)
 		# 3 side
 		self.hand_rotate(1, hand_raised=True)
+		self.scan_states.append((list(self.side_codes_seq), 1))
 		side_colors = self.scan_side()
 		side_colors = self.rotate_matrix(side_colors, n=1, byclockwise=False)
 		cube_colors.append(side_colors)
+		if on_side_scanned:
+			on_side_scanned(3, side_colors)
 		# 4 side
 		self.hand_rotate(1, hand_raised=True)
+		self.scan_states.append((list(self.side_codes_seq), 1))
 		side_colors = self.scan_side()
 		side_colors = self.rotate_matrix(side_colors, n=1, byclockwise=False)
 		cube_colors.append(side_colors)
+		if on_side_scanned:
+			on_side_scanned(4, side_colors)
 		# 5 side
 		self.rotate_platform(n=1, byclockwise=False)
 		self.hand_rotate(1, hand_raised=True)
+		self.scan_states.append((list(self.side_codes_seq), 0))
 		cube_colors.append(self.scan_side())
+		if on_side_scanned:
+			on_side_scanned(5, cube_colors[-1])
 
 		return cube_colors
-	
-	def rotate_current_side(self, n:int=1, byclockwise:bool=True):
-		"""Rotate side on which cube stands byclockwise n times."""
+
+	def scan_squares(self, positions:list):
+		"""Scan only positions (row, col) of top side as scan_side does, returns {position: color at percentage}."""
+		colors = dict()
+		if (1, 1) in positions:
+			colors[(1, 1)] = self.scan_central_cube()
+
+		indexes = [i for i in range(8) if cube_index_to_pos[i] in positions]
+		if indexes:
+			self.scan_corner_cube()
+			current = 0
+			for i in indexes:
+				# Half of quarter for every next square of the border
+				if i != current:
+					self.rotate_platform(n=(i - current) / 2, side_control=False, rot_optim=False)
+					current = i
+				if i % 2 == 0:
+					colors[cube_index_to_pos[i]] = self.scan_cross_cube()
+				else:
+					colors[cube_index_to_pos[i]] = self.scan_corner_cube()
+
+			# Back to the start by the shortest way
+			back = 8 - current if current > 4 else -current
+			if back != 0:
+				self.rotate_platform(n=back / 2, side_control=False, rot_optim=False)
+
+		self.color_scanner_off()
+		return colors
+
+	def reread_squares(self, squares:list):
+		"""Scan again squares [side, row, col] of the last scan_cube.
+		Every side is turned to color sensor as it was at scan_cube, then
+		cube is turned back. Returns [side, row, col, color at percentage].
+		"""
+		start_side_codes_seq = list(self.side_codes_seq)
+		squares_colors = list()
+		for side in sorted(set(square[0] for square in squares)):
+			side_codes_seq, n = self.scan_states[side]
+			self.reorient(side_codes_seq)
+			self.hand_raised()
+
+			# Positions at scanned side for positions at colors matrix
+			scanned_positions = self.rotate_matrix([[(row, col) for col in range(3)] for row in range(3)], n=n, byclockwise=False)
+			positions = dict()
+			for _, row, col in filter(lambda square: square[0] == side, squares):
+				positions[tuple(scanned_positions[row][col])] = (row, col)
+
+			colors = self.scan_squares(list(positions))
+			for position, color in colors.items():
+				row, col = positions[position]
+				squares_colors.append([side, row, col, color])
+
+		self.reorient(start_side_codes_seq)
+		self.hand_raised()
+		return squares_colors
+
+	def rotate_current_side(self, n:int=1, byclockwise:bool=True, hand_raised:bool=True):
+		"""Rotate side on which cube stands byclockwise n times.
+		:hand_raised - raise hand after side rotation.
+		"""
 		n %= 4
 		# Because rotate SIDE but not platform!
 		byclockwise = not byclockwise
@@ -216,7 +352,8 @@ class Robot:
 		if n > 0:
 			self.hand_on_cube()
 			self.rotate_platform(n, byclockwise, side_control=False)
-			self.hand_raised()
+			if hand_raised:
+				self.hand_raised()
 	
 	def target_to_current(self, target_side_code:int):
 		"""Move side with target_side_code to the bottom of cube."""
@@ -238,6 +375,59 @@ class Robot:
 		self.target_to_current(side_code)
 		self.rotate_current_side(n, byclockwise=byclockwise)
 
+	def flip(self):
+		"""Rotate cube by hand motor once from any hand position."""
+		if self.hand.angle() > 150:
+			# Hand is pulled after previous flip
+			self.hand_on_cube()
+		self.hand_rotate(1)
+
+	def spin(self, n:int):
+		"""Rotate platform with all cube n times byclockwise."""
+		self.hand_raised()
+		self.rotate_platform(n)
+
+	def run_primitive(self, code:str):
+		"""Run robot primitive from server:
+		F - flip, P{n} - spin, T{n} - rotate current side with hand on cube.
+		"""
+		if code == "F":
+			self.flip()
+		elif code[0] == "P":
+			self.spin(int(code[1]))
+		elif code[0] == "T":
+			self.rotate_current_side(int(code[1]), hand_raised=False)
+
+	def reorient(self, target_side_codes_seq:list):
+		"""Turn the whole cube by the least number of flips and spins until self.side_codes_seq is target_side_codes_seq."""
+		start = tuple(self.side_codes_seq)
+		target = tuple(target_side_codes_seq)
+		paths = {start: []}
+		queue = [start]
+		while target not in paths:
+			side_codes_seq = queue.pop(0)
+			for code in ("F", "P1", "P2", "P3"):
+				next_side_codes_seq = self.side_codes_after(side_codes_seq, code)
+				if next_side_codes_seq not in paths:
+					paths[next_side_codes_seq] = paths[side_codes_seq] + [code]
+					queue.append(next_side_codes_seq)
+
+		for code in paths[target]:
+			self.run_primitive(code)
+
+	@staticmethod
+	def side_codes_after(side_codes_seq:tuple, code:str):
+		"""Side codes sequence after primitive F or P{n} (as hand_rotate and rotate_platform change it)."""
+		scs = list(side_codes_seq)
+		if code == "F":
+			scs[0], scs[1], scs[5], scs[3] = scs[1], scs[5], scs[3], scs[0]
+		else:
+			# P3 is one rotation counterclockwise
+			n = int(code[1])
+			n = -1 if n == 3 else n
+			scs[1], scs[2], scs[3], scs[4] = scs[(1+n-1)%4+1], scs[(2+n-1)%4+1], scs[(3+n-1)%4+1], scs[(4+n-1)%4+1]
+		return tuple(scs)
+
 	@staticmethod
 	def rotate_matrix(matrix:list, n:int=1, byclockwise:bool=True):
 		"""Rotate matrix n times by byclockwise. One time = 90 deg."""
@@ -262,21 +452,35 @@ if __name__ == "__main__":
 	print("[ Connected to host:" + HOST + ", port:" + str(PORT) + " ]")
 	r = Robot()
 	r.color_sensor.rgb()
+	link = Link(s)
 	# Sending test message
-	s.sendto("hello".encode(), server)
+	link.send("hello")
+	# Commands from server which aren't done yet
+	queue = list()
 	while True:
-		# Gets command from server
-		cmd = s.recv(1024).decode()
-		if not cmd:
+		# Gets all commands from server, waits only if there is nothing to do
+		try:
+			message = link.recv(timeout=0 if queue else -1)
+		except OSError:
 			# Error
 			print("[ Server disconnected. Error at server! ]")
 			break
 
-		elif cmd == "scan" or cmd == "rescan":
+		if message is not None:
+			queue.append(message)
+			continue
+
+		message = queue.pop(0)
+		cmd = message["cmd"]
+		if cmd == "scan" or cmd == "rescan":
 			# Scanning
 			print("[ Starts scanning ]")
 
-			cube_colors = r.scan_cube()
+			# Every side is sent at once, so server classifies and solves while robot scans
+			cube_colors = r.scan_cube(on_side_scanned=lambda side, side_colors: link.send("side", [side, side_colors]))
+			link.send("colors", cube_colors)
+			print("[ Colors sended to server ]")
+
 			r.hand_rotate(2, hand_raised=True)
 			r.rotate_platform(1)
 
@@ -284,17 +488,30 @@ if __name__ == "__main__":
 			print(cube_colors)
 			print("[ Scanned ]")
 
-			s.sendto(json.dumps(cube_colors), server)
-			print("[ Colors sended to server ]")
+		elif cmd == "reread":
+			# Doubtful squares only
+			print("[ Rereading " + str(len(message["data"])) + " squares ]")
+			link.send("squares", r.reread_squares(message["data"]))
+			print("[ Squares sended to server ]")
 
 		elif cmd == "solving":
 			print("[ Starts solving the Rubik's cube! ]")
 
-		else:
-			# Solving
-			side_code, n, byclockwise = map(int, list(cmd))
-			r.rotate_side(side_code, n, byclockwise)
-			s.sendto("ok".encode(), server)
+		elif cmd == "move":
+			# Primitives of one move separated by spaces
+			for code in message["data"].split():
+				r.run_primitive(code)
+			link.send("ok", message["seq"])
+
+		elif cmd == "program":
+			# The whole program with macros, every step is acknowledged
+			macros = message["data"]["macros"]
+			for step, items in enumerate(message["data"]["steps"]):
+				for item in items:
+					for move in expand_item(item, macros):
+						for code in move.split():
+							r.run_primitive(code)
+				link.send("ok", [message["seq"], step])
 
 
 	# Stopping client
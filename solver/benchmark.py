@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import time
+import numpy as np
+
+from datatypes import CubeBatch
+from solver import Solver, solve_layers, layers_phases, default_orientation_idx
+
+# Solved cube which is scrambled for the corpus
+solved_sides_map = [[[color] * 3 for _ in range(3)] for color in "ybrgow"]
+# Median latency of a method in reference times (see get_reference_time) may
+# be slower than at baseline by this fraction, timings of the same machine
+# differ by a third from run to run
+time_tolerance = 0.5
+reference_repeats = 20
+# Mean number of moves of a method may be longer than at baseline by this
+moves_tolerance = 0.0
+
+
+def get_corpus(n:int, seed:int=0, n_moves:int=100) -> CubeBatch:
+	"""n cubes scrambled by their own n_moves random moves, the same for the same seed."""
+	moves = np.random.default_rng(seed).integers(0, 18, size=(n, n_moves))
+	return CubeBatch.from_sides_map(solved_sides_map, n).apply_sequence(moves)
+
+
+def get_reference_time() -> float:
+	"""
+	Median seconds of fixed work which doesn't use the solver (python loop
+	and numpy sort). Latencies are compared by their ratio to it, so
+	baseline of one machine fits another one.
+	"""
+	rng = np.random.default_rng(0)
+	array = rng.random(10 ** 5)
+	times = list()
+	for _ in range(reference_repeats):
+		start = time.perf_counter()
+		sum(i * i for i in range(10 ** 5))
+		np.sort(array)
+		times.append(time.perf_counter() - start)
+
+	return float(np.median(times))
+
+
+def get_percentiles(values:list) -> dict:
+	"""p50 / p95 / p99 / max of values."""
+	p50, p95, p99 = np.percentile(values, [50, 95, 99])
+	return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(np.max(values))}
+
+
+def benchmark_method(rubcubes:CubeBatch, method:str) -> dict:
+	"""
+	Solves every cube of rubcubes by Solver.solve(method). Returns
+	solves_per_second, latency_ms percentiles, moves (mean, percentiles and
+	histogram: number of solutions of every length) and number of cubes
+	which were really solved.
+	"""
+	# Tables are loaded by the first solve, it isn't counted
+	Solver(rubcubes[0]).solve(method)
+	latencies, solutions = list(), list()
+	for i in range(len(rubcubes)):
+		rubcube = rubcubes[i]
+		start = time.perf_counter()
+		solutions.append(Solver(rubcube).solve(method))
+		latencies.append(time.perf_counter() - start)
+
+	max_len = max(map(len, solutions))
+	moves = np.array([list(solution) + [-1] * (max_len - len(solution)) for solution in solutions], dtype=int)
+	solved = rubcubes.copy().apply_sequence(moves)
+	lengths = [len(solution) for solution in solutions]
+	return {
+		"solved": int((solved.is_valid_counts() & solved.is_solved()).sum()),
+		"solves_per_second": len(rubcubes) / sum(latencies),
+		"latency_ms": get_percentiles(np.array(latencies) * 1000),
+		"moves": {
+			"mean": float(np.mean(lengths)),
+			**get_percentiles(lengths),
+			"histogram": {str(length): lengths.count(length) for length in sorted(set(lengths))},
+		},
+	}
+
+
+def benchmark_phases(rubcubes:CubeBatch) -> dict:
+	"""
+	Mean milliseconds per cube of every phase (solver.layers_phases) of
+	layer by layer solving, as Solver.solve("layers").
+	"""
+	timings = dict()
+	for i in range(len(rubcubes)):
+		solve_layers(rubcubes.states[i], default_orientation_idx, timings)
+
+	return {phase: timings[phase] * 1000 / len(rubcubes) for phase in layers_phases}
+
+
+def run_benchmark(rubcubes:CubeBatch, methods:tuple=("layers", "two_phase")) -> dict:
+	return {
+		"cubes": len(rubcubes),
+		"reference_ms": get_reference_time() * 1000,
+		"methods": {method: benchmark_method(rubcubes, method) for method in methods},
+		"layers_phases_ms": benchmark_phases(rubcubes),
+	}
+
+
+def compare(results:dict, baseline:dict) -> list:
+	"""
+	Returns regressions of results against baseline (the same corpus):
+	unsolved cubes, mean number of moves longer by more than
+	moves_tolerance (both don't depend on machine), median latency in
+	reference times slower by more than time_tolerance.
+	"""
+	regressions = list()
+	if (results["cubes"], results.get("seed")) != (baseline["cubes"], baseline.get("seed")):
+		regressions.append(f"corpus of {results['cubes']} cubes (seed {results.get('seed')}), "
+						   f"baseline is of {baseline['cubes']} cubes (seed {baseline.get('seed')})")
+
+	for method, result in results["methods"].items():
+		if result["solved"] != results["cubes"]:
+			regressions.append(f"{method}: {results['cubes'] - result['solved']} cubes aren't solved")
+		if method not in baseline["methods"]:
+			continue
+
+		base = baseline["methods"][method]
+		latency = result["latency_ms"]["p50"] / results["reference_ms"]
+		base_latency = base["latency_ms"]["p50"] / baseline["reference_ms"]
+		if latency > base_latency * (1 + time_tolerance):
+			regressions.append(f"{method}: median latency {latency:.2f} reference times, baseline {base_latency:.2f}")
+		moves, base_moves = result["moves"]["mean"], base["moves"]["mean"]
+		if moves > base_moves + moves_tolerance:
+			regressions.append(f"{method}: mean {moves:.2f} moves, baseline {base_moves:.2f} moves")
+
+	return regressions
+
+
+def get_report(results:dict) -> str:
+	lines = [f"reference: {results['reference_ms']:.2f} ms"]
+	for method, result in results["methods"].items():
+		latency, moves = result["latency_ms"], result["moves"]
+		lines.append(f"{method:>10}: {result['solved']}/{results['cubes']} solved, "
+					 f"{result['solves_per_second']:.1f} solves/s, "
+					 f"latency p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, p99 {latency['p99']:.2f} ms, "
+					 f"moves mean {moves['mean']:.1f}, p95 {moves['p95']:.0f}, max {moves['max']:.0f}")
+
+	width = max(map(len, layers_phases))
+	for phase, ms in results["layers_phases_ms"].items():
+		lines.append(f"{phase:>{width}}: {ms:.3f} ms")
+
+	return "\n".join(lines)
+
+
+if __name__ == "__main__":
+	N_CUBES = 50
+	SEED = 0
+	DIR = os.path.dirname(os.path.abspath(__file__))
+	RESULTS_PATH = os.path.join(DIR, "benchmark_results.json")
+	BASELINE_PATH = os.path.join(DIR, "benchmark_baseline.json")
+	# Results become the new baseline instead of being compared with it
+	UPDATE_BASELINE = "--update-baseline" in sys.argv
+
+	results = run_benchmark(get_corpus(N_CUBES, SEED))
+	results["seed"] = SEED
+	print(get_report(results))
+	with open(RESULTS_PATH, "w") as f:
+		json.dump(results, f, indent=1)
+
+	if UPDATE_BASELINE:
+		with open(BASELINE_PATH, "w") as f:
+			json.dump(results, f, indent=1)
+		print(f"[ Baseline saved to {BASELINE_PATH} ]")
+		sys.exit()
+
+	with open(BASELINE_PATH) as f:
+		regressions = compare(results, json.load(f))
+	for regression in regressions:
+		print(f"[ REGRESSION: {regression} ]")
+	if regressions:
+		sys.exit(1)
+	print("[ No regressions ]")
@@ -0,0 +1,113 @@
+import sqlite3
+import threading
+import numpy as np
+from collections import OrderedDict
+
+from datatypes import FaceletCube, orientations
+from moves import MoveSequence
+
+
+# (24, 54) permutations of whole cube rotations and (24, 18) maps of moves
+# indices: move of rotated cube to move of not rotated one and back
+orientations_permutations = np.array([permutation for permutation, _ in orientations])
+moves_to_original = np.array(
+	[[sides_codes[move // 3] * 3 + move % 3 for move in range(18)] for _, sides_codes in orientations],
+	dtype=np.uint8,
+)
+moves_to_rotated = np.argsort(moves_to_original, axis=1).astype(np.uint8)
+
+
+def get_canonical_state(rubcube) -> tuple:
+	"""
+	Returns (state, orientation_idx). rubcube is rotated by every of 24
+	orientations and colors are relabeled by central squares (color of side k
+	gets code k), state is the least of them as 54 bytes. Cubes which differ
+	by whole cube rotation and colors get the same state. Moves of state are
+	moves of rubcube rotated by orientations[orientation_idx].
+	"""
+	facelets = FaceletCube.from_cube(rubcube).facelets
+	states = facelets[orientations_permutations]
+	rows = np.arange(len(states))[:, None]
+	# Colors which aren't at centers (wrong scan) get code 6
+	relabel = np.full((len(states), 6), 6, dtype=np.uint8)
+	relabel[rows, states[:, 4::9]] = np.arange(6, dtype=np.uint8)
+	states = relabel[rows, states]
+
+	keys = [state.tobytes() for state in states]
+	orientation_idx = min(range(len(keys)), key=keys.__getitem__)
+	return keys[orientation_idx], orientation_idx
+
+
+class SolutionCache:
+	"""
+	LRU cache of solutions by canonical state (see get_canonical_state), so
+	rotated and recolored cube is solved by remapped moves of cached one.
+	If path is given, solutions are also kept at sqlite database and survive
+	restarts, max_size limits only solutions in memory.
+	tag separates solutions of different methods for the same state.
+	"""
+	def __init__(self, max_size:int=4096, path:str=None) -> None:
+		self.max_size = max_size
+		self.solutions = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.lock = threading.Lock()
+
+		self.db = None
+		if path is not None:
+			self.db = sqlite3.connect(path, check_same_thread=False)
+			self.db.execute("CREATE TABLE IF NOT EXISTS solutions (key BLOB PRIMARY KEY, moves BLOB NOT NULL)")
+			self.db.commit()
+
+	def __len__(self) -> int:
+		return len(self.solutions)
+
+	def get(self, rubcube, tag:str="") -> MoveSequence:
+		"""Returns moves which solve rubcube or None if there is no solution at cache."""
+		state, orientation_idx = get_canonical_state(rubcube)
+		key = tag.encode() + b":" + state
+		with self.lock:
+			moves = self.solutions.get(key)
+			if moves is not None:
+				self.solutions.move_to_end(key)
+			elif self.db is not None:
+				row = self.db.execute("SELECT moves FROM solutions WHERE key = ?", (key,)).fetchone()
+				if row is not None:
+					moves = bytes(row[0])
+					self.remember(key, moves)
+
+			if moves is None:
+				self.misses += 1
+				return None
+			self.hits += 1
+
+		return MoveSequence.from_bytes(moves_to_original[orientation_idx][np.frombuffer(moves, dtype=np.uint8)].tobytes())
+
+	def put(self, rubcube, moves, tag:str="") -> None:
+		"""Saves moves which solve rubcube (moves are applied to rubcube as it's, not solved)."""
+		state, orientation_idx = get_canonical_state(rubcube)
+		key = tag.encode() + b":" + state
+		moves = moves_to_rotated[orientation_idx][np.asarray(moves, dtype=np.uint8)].tobytes()
+		with self.lock:
+			self.remember(key, moves)
+			if self.db is not None:
+				self.db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)", (key, moves))
+				self.db.commit()
+
+	def remember(self, key:bytes, moves:bytes) -> None:
+		"""Puts solution to memory, the least recently used one is evicted."""
+		self.solutions[key] = moves
+		self.solutions.move_to_end(key)
+		while len(self.solutions) > self.max_size:
+			self.solutions.popitem(last=False)
+
+	def clear(self) -> None:
+		"""Clears memory and counters, database isn't changed."""
+		with self.lock:
+			self.solutions.clear()
+			self.hits = self.misses = 0
+
+	def close(self) -> None:
+		if self.db is not None:
+			self.db.close()
+			self.db = None
@@ -0,0 +1,146 @@
+import itertools
+import numpy as np
+
+from color_detector import idx_to_color
+
+# Typical readings of robot color sensor (red, green, blue at percents),
+# calibrated readings are brought to them
+typical_rgb = {
+	"w": (58, 88, 100),
+	"y": (46, 57, 13),
+	"r": (29, 9, 6),
+	"o": (44, 18, 8),
+	"g": (7, 33, 13),
+	"b": (5, 22, 49),
+}
+reference_rgb = np.array([typical_rgb[idx_to_color[idx]] for idx in range(len(idx_to_color))], dtype=float)
+
+# Every permutation of colors (idx_to_color) of central squares
+centers_permutations = np.array(list(itertools.permutations(range(len(idx_to_color)))))
+
+# Pull of affine transform to identity, six centers fit it without noise otherwise
+ridge = 100.0
+kmedians_iterations = 10
+# Readings are rounded percents, spread of cluster isn't less
+min_variance = 1.0
+# Probability that reading is random (glare, missed square)
+outlier_prob = 0.01
+
+
+def get_readings(raw_colors:list) -> np.ndarray:
+	"""Readings (6, 3, 3, 3) of raw colors, sides which aren't scanned yet (None) are nan."""
+	readings = np.full((6, 3, 3, 3), np.nan)
+	for side, side_colors in enumerate(raw_colors):
+		if side_colors is not None:
+			readings[side] = side_colors
+
+	return readings
+
+
+def get_white_balance_costs(rgb:np.ndarray, reference:np.ndarray) -> np.ndarray:
+	"""
+	Returns array (..., 6): squared error of white balance (gain of every
+	channel) which brings readings of central squares rgb (6, 3) to
+	reference (..., 6, 3), fitted by all central squares but one. It is
+	infinity if any other central square isn't scanned yet (nan).
+	"""
+	costs = list()
+	for excluded in range(6):
+		inliers = np.arange(6) != excluded
+		x, y = rgb[inliers], reference[..., inliers, :]
+		gains = (x * y).sum(axis=-2) / np.maximum((x * x).sum(axis=0), 1e-9)
+		costs.append(((y - gains[..., None, :] * x) ** 2).sum(axis=(-2, -1)))
+
+	return np.nan_to_num(np.stack(costs, axis=-1), nan=np.inf)
+
+
+def get_centers_costs(raw_colors) -> np.ndarray:
+	"""
+	Cost of every centers_permutations by get_white_balance_costs, one
+	central square may be misread or not scanned yet, so the worst one isn't
+	counted. Unlike color_detector model it doesn't depend on brightness of
+	the session.
+	"""
+	rgb = get_readings(raw_colors).reshape(6, 9, 3)[:, 4]
+	return get_white_balance_costs(rgb, reference_rgb[centers_permutations]).min(axis=1)
+
+
+def fit_calibration(raw_colors, centers:list=None) -> np.ndarray:
+	"""
+	Returns affine transform (4, 3) of readings of one scan, which brings
+	readings of central squares to reference_rgb of their colors (centers,
+	the most probable ones by default). White balance and brightness of the
+	session are taken from the cube itself. The central square which fits
+	the worst isn't used.
+	"""
+	rgb = get_readings(raw_colors).reshape(6, 9, 3)[:, 4]
+	if centers is None:
+		centers = centers_permutations[get_centers_costs(raw_colors).argmin()]
+
+	inliers = np.arange(6) != get_white_balance_costs(rgb, reference_rgb[centers]).argmin()
+	x = np.hstack([rgb, np.ones((6, 1))])[inliers]
+	y = reference_rgb[centers][inliers]
+	# Ridge regression to identity: (x'x + ridge) a = x'y + ridge * identity
+	identity = np.vstack([np.eye(3), np.zeros((1, 3))])
+	return np.linalg.solve(x.T.dot(x) + ridge * np.eye(4), x.T.dot(y) + ridge * identity)
+
+
+def apply_calibration(raw_colors, transform:np.ndarray) -> np.ndarray:
+	"""Calibrated readings (6, 3, 3, 3), sides which aren't scanned yet are nan."""
+	rgb = get_readings(raw_colors)
+	return np.clip(rgb.dot(transform[:3]) + transform[3], 0, 100)
+
+
+def calibrate(raw_colors, centers:list=None) -> np.ndarray:
+	"""
+	Readings of the scan with shape (6, 3, 3, 3) calibrated by its central
+	squares. One side may be not scanned yet (None), its readings are nan.
+	"""
+	return apply_calibration(raw_colors, fit_calibration(raw_colors, centers))
+
+
+def get_kmedians_log_probs(rgb, centers:list) -> np.ndarray:
+	"""
+	Alternative to color_detector model: k-medians of 54 readings rgb to 6
+	clusters which start at reference_rgb of colors of central squares
+	centers, so a few random readings don't move clusters. Returns (54, 6)
+	log probabilities of colors (idx_to_color) by gaussian distances to
+	clusters. Reading far from every cluster is probably random
+	(outlier_prob), so all its colors are almost equally probable, as colors
+	of squares which aren't scanned yet (nan).
+	"""
+	points = np.asarray(rgb, dtype=float).reshape(54, 3)
+	known = ~np.isnan(points).any(axis=1)
+	medians = reference_rgb[centers]
+	labels = None
+	for _ in range(kmedians_iterations):
+		distances = ((points[known, None] - medians[None]) ** 2).sum(axis=2)
+		new_labels = np.full(54, -1)
+		new_labels[known] = distances.argmin(axis=1)
+		# Central squares stay at their clusters
+		new_labels[4::9][known[4::9]] = np.arange(6)[known[4::9]]
+		if labels is not None and (new_labels == labels).all():
+			break
+
+		labels = new_labels
+		for cluster in range(6):
+			if (labels == cluster).any():
+				medians[cluster] = np.median(points[labels == cluster], axis=0)
+
+	distances = np.zeros((54, 6))
+	distances[known] = ((points[known, None] - medians[None]) ** 2).sum(axis=2)
+	# Median of chi-squared distribution with 3 degrees of freedom is 2.37
+	variances = np.full(6, min_variance)
+	for cluster in range(6):
+		if (labels == cluster).any():
+			variances[cluster] = max(np.median(distances[labels == cluster, cluster]) / 2.37, min_variance)
+	log_densities = np.log(1 - outlier_prob) - distances / (2 * variances) - 1.5 * np.log(2 * np.pi * variances)
+	# Random reading is uniform at [0, 100] of every channel, whatever color the square is
+	log_densities = np.logaddexp(log_densities, np.log(outlier_prob) - 3 * np.log(100))
+	log_probs = log_densities - np.logaddexp.reduce(log_densities, axis=1, keepdims=True)
+	log_probs[~known] = -np.log(6)
+
+	# Clusters to colors of their centers
+	by_color = np.empty_like(log_probs)
+	by_color[:, centers] = log_probs
+	return by_color
@@ -0,0 +1,216 @@
+import itertools
+import numpy as np
+
+from color_detector import get_scores, side_positions
+from calibration import centers_permutations, get_centers_costs, calibrate, get_kmedians_log_probs
+from two_phase import CubieCube, corners_facelets, edges_facelets, permutation_parity
+from shortcuts import colors_order
+
+# Central squares permutations which are tried, sorted by cost
+n_centers_candidates = 3
+# Squares with less confidence are read again, but not too many and not too often
+min_square_confidence = 0.5
+max_reread_squares = 12
+max_rereads = 2
+# Scan with more misread squares is scanned again
+max_corrected_squares = 8
+
+
+def get_log_probs(raw_colors:list, classifier:str="kmedians") -> np.ndarray:
+	"""
+	Returns array with shape (54, 6): log probability of every color
+	(shortcuts.colors_order) for every square (index side * 9 + row * 3 + col).
+	Readings are calibrated by central squares (see calibration.py), then
+	classified by classifier: "model" (color_detector) or "kmedians". One
+	side may be not scanned yet (None), all colors of its squares are
+	equally probable.
+	"""
+	centers = centers_permutations[get_centers_costs(raw_colors).argmin()]
+	rgb = calibrate(raw_colors, centers)
+	if classifier == "kmedians":
+		return get_kmedians_log_probs(rgb, centers)
+	if classifier != "model":
+		raise ValueError(f"classifier argument must be 'model' or 'kmedians' but not '{classifier}'")
+
+	scores = get_scores(rgb, side_positions).reshape(54, len(colors_order)).astype(float)
+	scores[np.isnan(scores).any(axis=1)] = 0
+	scores -= scores.max(axis=1, keepdims=True)
+	return scores - np.log(np.exp(scores).sum(axis=1, keepdims=True))
+
+
+def linear_sum_assignment(cost:list) -> list:
+	"""
+	Hungarian algorithm for square cost matrix (list of lists), O(n^3).
+	Returns column of every row, sum of their costs is the least.
+	"""
+	n = len(cost)
+	inf = float("inf")
+	# Potentials of rows and columns, row of every column (1-based, 0 is fake)
+	u = [0.0] * (n + 1)
+	v = [0.0] * (n + 1)
+	row_of = [0] * (n + 1)
+	way = [0] * (n + 1)
+	for row in range(1, n + 1):
+		row_of[0] = row
+		col = 0
+		min_reduced = [inf] * (n + 1)
+		used = [False] * (n + 1)
+		while row_of[col] != 0:
+			used[col] = True
+			cur_row = row_of[col]
+			delta, next_col = inf, 0
+			for j in range(1, n + 1):
+				if not used[j]:
+					reduced = cost[cur_row - 1][j - 1] - u[cur_row] - v[j]
+					if reduced < min_reduced[j]:
+						min_reduced[j], way[j] = reduced, col
+					if min_reduced[j] < delta:
+						delta, next_col = min_reduced[j], j
+
+			for j in range(n + 1):
+				if used[j]:
+					u[row_of[j]] += delta
+					v[j] -= delta
+				else:
+					min_reduced[j] -= delta
+			col = next_col
+
+		# Augmenting path
+		while col:
+			prev_col = way[col]
+			row_of[col] = row_of[prev_col]
+			col = prev_col
+
+	cols = [0] * n
+	for col in range(1, n + 1):
+		cols[row_of[col] - 1] = col - 1
+
+	return cols
+
+
+def get_cubies_costs(log_probs:np.ndarray, centers:list, cubies_facelets:tuple) -> np.ndarray:
+	"""
+	Returns array with shape (positions, cubies, orientations): minus log
+	probability that cubie is at position with orientation (see
+	two_phase.CubieCube) for cube with colors of central squares centers.
+	"""
+	n, size = len(cubies_facelets), len(cubies_facelets[0])
+	positions = np.array(cubies_facelets)
+	cubies_colors = np.array([[centers[idx // 9] for idx in cubie] for cubie in cubies_facelets])
+
+	costs = np.zeros((n, n, size))
+	for orient in range(size):
+		for i in range(size):
+			# Facelet (orient + i) of position has color of facelet i of cubie
+			costs[:, :, orient] -= log_probs[positions[:, (orient + i) % size][:, None], cubies_colors[None, :, i]]
+
+	return costs
+
+
+def assign_cubies(costs:np.ndarray) -> tuple:
+	"""
+	Returns (perm, orient): cubies and orientations of positions with the
+	least cost, orientations aren't checked.
+	"""
+	best_orient = costs.argmin(axis=2)
+	perm = linear_sum_assignment(costs.min(axis=2).tolist())
+	orient = [int(best_orient[pos, cubie]) for pos, cubie in enumerate(perm)]
+	return perm, orient
+
+
+def fix_parity(corners:tuple, edges:tuple) -> None:
+	"""Swaps two corners or two edges which adds the least cost, so parities are equal."""
+	best = None
+	for costs, perm, orient in (corners, edges):
+		for a, b in itertools.combinations(range(len(perm)), 2):
+			delta = (costs[a, perm[b]].min() + costs[b, perm[a]].min()
+					 - costs[a, perm[a], orient[a]] - costs[b, perm[b], orient[b]])
+			if best is None or delta < best[0]:
+				best = (delta, costs, perm, orient, a, b)
+
+	_, costs, perm, orient, a, b = best
+	perm[a], perm[b] = perm[b], perm[a]
+	orient[a] = int(costs[a, perm[a]].argmin())
+	orient[b] = int(costs[b, perm[b]].argmin())
+
+
+def fix_orientation(costs:np.ndarray, perm:list, orient:list, modulo:int) -> None:
+	"""Reorients one or two cubies which adds the least cost, so sum of orientations is divisible by modulo."""
+	residue = sum(orient) % modulo
+	if residue == 0:
+		return
+
+	# Changes of orientation of every position: {(pos, change): delta cost}
+	deltas = {(pos, change): costs[pos, perm[pos], (orient[pos] + change) % modulo] - costs[pos, perm[pos], orient[pos]]
+			  for pos in range(len(perm)) for change in range(1, modulo)}
+	options = [((pos, change),) for pos, change in deltas if (residue + change) % modulo == 0]
+	options += [(first, second) for first, second in itertools.combinations(deltas, 2)
+				if first[0] != second[0] and (residue + first[1] + second[1]) % modulo == 0]
+
+	best = min(options, key=lambda option: sum(deltas[change] for change in option))
+	for pos, change in best:
+		orient[pos] = (orient[pos] + change) % modulo
+
+
+def assign_colors(raw_colors:list, classifier:str="kmedians") -> tuple:
+	"""
+	Returns (sides_map, confidences): colors of squares which make a real
+	cube (nine squares of every color, six different centers, every corner
+	and edge is a real cubie, no twisted corner, flipped edge or swapped
+	pair) and are the most probable by get_log_probs, and confidence of
+	every square with shape (6, 3, 3): probability of its color minus
+	probability of the most probable other color. Confidence is negative
+	if the color was changed to make a real cube.
+	Cubies are assigned to positions by Hungarian algorithm, then parity
+	and orientations are repaired by the cheapest changes.
+	"""
+	log_probs = get_log_probs(raw_colors, classifier)
+	centers_costs = -log_probs[np.arange(4, 54, 9)[None, :], centers_permutations].sum(axis=1)
+
+	best = None
+	for centers_idx in np.argsort(centers_costs)[:n_centers_candidates]:
+		centers = centers_permutations[centers_idx].tolist()
+		corners_costs = get_cubies_costs(log_probs, centers, corners_facelets)
+		edges_costs = get_cubies_costs(log_probs, centers, edges_facelets)
+		corners = (corners_costs, *assign_cubies(corners_costs))
+		edges = (edges_costs, *assign_cubies(edges_costs))
+
+		if permutation_parity(corners[1]) != permutation_parity(edges[1]):
+			fix_parity(corners, edges)
+		fix_orientation(*corners, 3)
+		fix_orientation(*edges, 2)
+
+		cost = centers_costs[centers_idx]
+		for costs, perm, orient in (corners, edges):
+			cost += sum(costs[pos, cubie, o] for pos, (cubie, o) in enumerate(zip(perm, orient)))
+		if best is None or cost < best[0]:
+			best = (cost, centers, corners, edges)
+
+	_, centers, (_, cp, co), (_, ep, eo) = best
+	facelets = CubieCube(cp, co, ep, eo).to_facelets(centers)
+
+	# Always true, for safety
+	CubieCube.from_facelets(facelets).verify()
+
+	probs = np.exp(log_probs)
+	chosen = probs[np.arange(54), facelets]
+	probs[np.arange(54), facelets] = -1
+	confidences = (chosen - probs.max(axis=1)).reshape(6, 3, 3)
+	sides_map = [[[colors_order[color] for color in facelets[side * 9 + row * 3:side * 9 + row * 3 + 3]]
+				  for row in range(3)] for side in range(6)]
+	return sides_map, confidences
+
+
+def check_scan(confidences:np.ndarray, rereads:int) -> tuple:
+	"""
+	Returns (doubtful, rescan) for confidences of assign_colors after rereads
+	rereads of the scan: doubtful - [side, row, col] of squares which
+	should be read again (empty if they aren't), rescan - whether too many
+	squares were misread and the cube should be scanned again. The scan
+	is accepted if neither.
+	"""
+	doubtful = np.argwhere(confidences < min_square_confidence).tolist()
+	if doubtful and rereads < max_rereads and len(doubtful) <= max_reread_squares:
+		return doubtful, False
+
+	return list(), bool((confidences < 0).sum() > max_corrected_squares)
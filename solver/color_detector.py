@@ -3,58 +3,65 @@ import numpy as np
 def relu(tensor:np.array) -> np.array:
 	return tensor * (tensor > 0)
 
-def model(rgb:tuple, position:str):
-	"""Convert percent rgb to color."""
-	# weights = [
-	# 	np.array([[-0.375715434551239, 0.006222172174602747, -0.37624290585517883, 0.008464309386909008, -0.29306915402412415, -0.278480589389801], [-0.2583787739276886, 0.014640724286437035, -0.2052038013935089, -0.4088667929172516, 0.027834463864564896, 0.1535203456878662], [-0.37659141421318054, 0.27898234128952026, 0.0708007887005806, -0.2236413210630417, -0.018338939175009727, 0.007888968102633953], [-0.22737780213356018, -0.31164607405662537, 0.060919418931007385, 0.06084316968917847, -0.2594054341316223, 0.3438246548175812], [-0.12750908732414246, -0.042990345507860184, -0.07803457975387573, -0.07182501256465912, 0.1670568585395813, 0.027315914630889893], [0.3599034547805786, 0.2760156989097595, -0.20095573365688324, -0.19916245341300964, -0.23079439997673035, 0.04949335753917694], [-0.09481274336576462, 0.12964841723442078, 0.23326009511947632, -0.34055399894714355, -0.021021608263254166, 0.14837206900119781], [0.02507052570581436, -0.1645250916481018, -0.09006770700216293, -0.14175689220428467, 0.38914966583251953, -0.08506185561418533], [-0.030394311994314194, -0.379715234041214, -0.19114382565021515, -0.08767685294151306, 0.3495703935623169, -0.21081328392028809], [0.35940438508987427, -0.017793387174606323, 0.03135669231414795, -0.35251787304878235, 0.294988214969635, -0.30571654438972473], [-0.3107262849807739, 0.1253812164068222, -0.12625961005687714, 0.19252081215381622, -0.11099227517843246, -0.232396200299263], [-0.09322390705347061, -0.22552275657653809, 0.13292385637760162, -0.3661069869995117, 0.3589838147163391, -0.37052398920059204], [-0.22353707253932953, 0.10790897905826569, -0.1295199990272522, 0.07100290060043335, -0.3484485447406769, -0.1994607299566269], [-0.2289896160364151, 0.011678849346935749, 0.24612711369991302, 0.2393476963043213, -0.5923634767532349, 0.15103957056999207], [0.36812829971313477, 0.08213147521018982, -0.3729535639286041, 0.17482183873653412, -0.15268348157405853, 0.08832335472106934], [0.010850013233721256, 0.060191381722688675, -0.4051192104816437, -0.20781154930591583, -0.25922784209251404, 0.08039125055074692], [0.16625730693340302, 0.3192038834095001, -0.3098008334636688, -0.33771243691444397, -0.12987564504146576, 0.16806797683238983], [0.15402713418006897, -0.18018299341201782, 0.0857740193605423, 0.1285267174243927, -0.09879052639007568, 0.014413595199584961], [0.22354990243911743, -0.22824575006961823, -0.016748519614338875, 0.2512343227863312, 0.27330633997917175, -0.2915950119495392], [-0.3748367130756378, -0.10353126376867294, -0.2833457589149475, -0.002823593793436885, 0.20766593515872955, -0.27643534541130066], [0.06434673815965652, -0.379851758480072, -0.3959147036075592, -0.15165047347545624, -0.08733777701854706, 0.26621806621551514], [0.20528529584407806, 0.12517832219600677, 0.06055162101984024, -0.051373451948165894, 0.1672583818435669, -0.07233186811208725], [-0.27462509274482727, -0.2608323395252228, 0.07626107335090637, 0.008311299607157707, 0.0026199386920779943, -0.07215800881385803], [0.03709816932678223, 0.097209133207798, -0.0648912563920021, -0.020724771544337273, 0.28011807799339294, -0.1131499707698822], [0.34130123257637024, -0.30257803201675415, -0.21281534433364868, -0.15826867520809174, 0.4067056179046631, -0.23141881823539734], [-0.003435013582929969, 0.20048224925994873, 0.1682756543159485, -0.34064507484436035, -0.08935210853815079, -0.12836191058158875], [-0.09616860002279282, 0.3011847734451294, 0.1506011188030243, -0.07918503880500793, -0.27879202365875244, 0.06937824934720993], [-0.11415240168571472, -0.3154951333999634, -0.1161503866314888, -0.029848605394363403, 0.023899346590042114, 0.2896634042263031], [0.05425069481134415, 0.19982469081878662, 0.3320458233356476, 0.2106599062681198, -0.5106386542320251, -0.02067284844815731], [-0.009468594565987587, -0.13552325963974, 0.12212444096803665, 0.21472065150737762, -0.10570745170116425, 0.18325790762901306], [0.09993119537830353, -0.18024396896362305, 0.09192165732383728, -0.04066626355051994, 0.14225952327251434, 0.02358376421034336], [-0.10364798456430435, 0.13902810215950012, 0.3502753973007202, 0.09703265130519867, 0.09209495782852173, -0.28133949637413025]]),
-	# 	np.array([-0.35013189911842346, -0.07662559300661087, -0.2327706664800644, 0.1426277756690979, -0.26829949021339417, -0.2749239206314087, 0.008289753459393978, -0.005134612787514925, -0.13348735868930817, 0.13077761232852936, -0.3399444818496704, -0.1822856068611145, 0.13728028535842896, -0.06740762293338776, -0.37524235248565674, -0.35254666209220886, -0.30924558639526367, -0.40658044815063477, 0.08855806291103363, -0.3710115849971771, 0.04799285903573036, 0.1415630728006363, -0.3119862973690033, -0.2686323821544647, 0.40054965019226074, -0.3456103801727295, 0.2954481542110443, -0.2746080458164215, 0.49937903881073, -0.2764087915420532, -0.3522328734397888, -0.33341240882873535]),
-	# 	np.array([[-0.1277223825454712, 0.038480304181575775, -0.09511411935091019, -0.04501725360751152, -0.10838019102811813, -0.03907988592982292, -0.028251003473997116, -0.07987416535615921, -0.08902031183242798, 0.11550714820623398, -0.05225953087210655, -0.1055372953414917, -0.017984671518206596, -0.10148447006940842, 0.011215844191610813, -0.13509881496429443, -0.04222998023033142, 0.059486351907253265, -0.07268806546926498, 0.054491426795721054, -0.11638081818819046, 0.027601050212979317, 0.043549053370952606, 0.08494274318218231, 0.10856407135725021, -0.025245245546102524, 0.15317626297473907, 0.16332943737506866, 0.11494680494070053, 0.008696518838405609, 0.011656967923045158, 0.13762147724628448], [-0.011051788926124573, 0.10769259929656982, -0.10396938025951385, -0.001124453847296536, -0.10208737850189209, 0.06148356944322586, -0.10203485190868378, 0.04208879917860031, 0.03779646381735802, -0.10110235959291458, -0.06994976103305817, -0.007830646820366383, 0.00814806018024683, -0.032135698944330215, 0.02347487583756447, 0.14413990080356598, -0.05777342990040779, -0.0028052774723619223, -0.04153238609433174, 0.051893528550863266, 0.035465896129608154, -0.03389936313033104, -0.13267754018306732, -0.014378066174685955, 0.07336251437664032, 0.10371329635381699, -0.08981803059577942, -0.04036366567015648, 0.033303167670965195, 0.07781950384378433, -0.008381600491702557, 0.014750420115888119], [-0.16092562675476074, 0.06608253717422485, -0.02308802306652069, 0.06328058987855911, 0.16295291483402252, -0.06544636189937592, -0.12403378635644913, -0.049123093485832214, -0.26523837447166443, -0.09420067816972733, -0.02140757627785206, 0.06914673000574112, 0.10426080971956253, 0.30438050627708435, -0.06974902004003525, 0.02235846035182476, -0.002063348889350891, -0.10268498957157135, 0.07002653181552887, -0.13177305459976196, 0.018611615523695946, 0.2114093005657196, 0.0861697569489479, -0.044849615544080734, 0.1547384113073349, 0.17469266057014465, -0.11307299882173538, -0.08097246289253235, 0.4340546131134033, 0.012066660448908806, -0.05965685099363327, 0.015725860372185707], [-0.109695665538311, 0.004842747002840042, 0.15755459666252136, -0.1208781749010086, -0.0951317772269249, -0.0806490033864975, -0.013799147680401802, 0.09152249246835709, 0.02528965100646019, 0.0870790034532547, 0.15406647324562073, 0.02285461314022541, -0.01755460537970066, -0.20822809636592865, -0.09508014470338821, 0.15762358903884888, -0.050648439675569534, 0.17532439529895782, 0.08595092594623566, 0.11316174268722534, 0.07247680425643921, -0.017120109871029854, 0.0770685225725174, -0.08652453124523163, -0.1406962275505066, -0.1489506959915161, -0.06713920831680298, 0.1328742355108261, -0.20334000885486603, -0.04573554918169975, -0.05829198285937309, -0.06683619320392609], [0.1602477729320526, 0.09294966608285904, 0.1323126256465912, 0.05184043571352959, 0.04736645892262459, -0.002634494099766016, -0.15715517103672028, -0.04914256930351257, 0.06961449980735779, 0.02863796055316925, 0.0071042850613594055, 0.12422611564397812, 0.12307202070951462, 0.001675190171226859, -0.03220616653561592, 0.17087209224700928, -0.04493798688054085, 0.10572489351034164, 0.022567179054021835, -0.02784053422510624, -0.017484445124864578, -0.12334640324115753, -0.04965520277619362, 0.08869720995426178, -0.014529142528772354, -0.1046973243355751, 0.1258557140827179, 0.07328572124242783, -0.04109830781817436, -0.09627965092658997, -0.10834648460149765, -0.014836686663329601], [0.16885565221309662, 0.16862083971500397, 0.144147127866745, 0.10002544522285461, 0.030950594693422318, -0.13965058326721191, -0.014408177696168423, 0.02755114994943142, 0.06932272762060165, 0.07018279284238815, 0.10723481327295303, -0.062175203114748, 0.042500268667936325, -0.14842046797275543, -0.028404489159584045, -0.08654846996068954, -0.06710441410541534, -0.10958336293697357, -0.010443863458931446, -0.1252545416355133, 0.008245271630585194, -0.0694112703204155, -0.07176678627729416, -0.04256371408700943, 0.08422030508518219, -0.15917079150676727, -0.025356872007250786, -0.09687673300504684, 0.027529284358024597, 0.08607015758752823, -0.0750555545091629, 0.0026272465474903584]]),
-	# 	np.array([0.04490027576684952, 0.04691123217344284, 0.1847277134656906, -0.23162177205085754, 0.10889579355716705, -0.1154339537024498]),
-	# ]
-	weights = [
-		np.array([[0.1408301144838333, 0.19454064965248108, 0.14749903976917267, 0.2854022979736328, 0.21521078050136566, -0.13022667169570923], [0.14836880564689636, 0.3784830570220947, -0.1481931507587433, 0.10641366988420486, -0.028707318007946014, -0.35397830605506897], [-0.16601067781448364, 0.0867081731557846, 0.25726303458213806, 0.3214321434497833, -0.20880816876888275, 0.3547455966472626], [0.04655525088310242, -0.031852900981903076, -0.4005471467971802, -0.13768374919891357, -0.13388967514038086, 0.07932883501052856], [0.38578757643699646, 0.20654712617397308, -0.10896828025579453, 0.14501537382602692, 0.05183544009923935, -0.37372729182243347], [-0.23395295441150665, 0.22448578476905823, -0.0035432432778179646, 0.1625971496105194, -0.3737449049949646, -0.05570255219936371], [0.15192270278930664, -0.30027350783348083, 0.19791005551815033, 0.25960785150527954, 0.3304290175437927, -0.2680714726448059], [-0.23557570576667786, -0.08237971365451813, -0.18691092729568481, 0.029760953038930893, -0.1297973245382309, 0.24784326553344727], [-0.1895160675048828, -0.38462013006210327, -0.11480382084846497, -0.27287203073501587, -0.36508992314338684, 0.14493773877620697], [-0.24655038118362427, 0.3678840398788452, 0.3237808644771576, -0.17169645428657532, -0.212789848446846, -0.30973201990127563], [-0.34043949842453003, -0.00354945519939065, 0.17396286129951477, -0.017506156116724014, -0.080662302672863, 0.18085016310214996], [0.3915803134441376, -0.1153460144996643, -0.3900125324726105, 0.1484333574771881, 0.3901553452014923, -0.200985386967659], [0.09523430466651917, -0.01255276519805193, 0.1407184898853302, -0.04384789988398552, 0.19331420958042145, 0.14342239499092102], [-0.2819767892360687, -0.04418213292956352, -0.28220614790916443, -0.018969718366861343, 0.2153273969888687, -0.4306047260761261], [0.08212514966726303, -0.2161654829978943, -0.23918403685092926, 0.14399102330207825, -0.39590540528297424, -0.13941067457199097], [0.373220294713974, 0.1758517026901245, 0.32035040855407715, -0.26860329508781433, 0.039171330630779266, -0.3883984088897705], [0.3488311171531677, 0.06764718890190125, -0.0252677071839571, -0.3586844205856323, -0.02814820036292076, 0.3073626160621643], [-0.31948789954185486, -0.3796921670436859, 0.19711542129516602, -0.3441796600818634, -0.2241695076227188, -0.027091892436146736], [-0.24633276462554932, 0.37341707944869995, 0.18451222777366638, -0.389712393283844, -0.2197210043668747, 0.3434199392795563], [-0.3977641761302948, -0.30333763360977173, -0.04140061140060425, 0.14924708008766174, -0.376769483089447, 0.11723756045103073], [0.24761027097702026, 0.3983491361141205, 0.39988014101982117, 0.04133753851056099, 0.023818477988243103, -0.2504379153251648], [-0.3148113489151001, 0.3058558404445648, 0.15237875282764435, -0.3558921217918396, 0.09389844536781311, 0.19630004465579987], [-0.1571093052625656, 0.34930551052093506, -0.31160253286361694, -0.168978750705719, -0.2975735366344452, -0.020090902224183083], [0.16451895236968994, -0.22599071264266968, -0.12904809415340424, -0.18400366604328156, 0.29404979944229126, 0.3153468072414398], [-0.07822231203317642, 0.29161691665649414, -0.3480796813964844, 0.21777932345867157, 0.2452399730682373, 0.21534118056297302], [-0.1984267681837082, -0.07495983690023422, -0.037784986197948456, -0.4036455452442169, -0.20513954758644104, 0.1726258546113968], [0.3771525025367737, 0.23748140037059784, 0.0010000300826504827, 0.037986718118190765, 0.25189483165740967, -0.2929820716381073], [-0.16128858923912048, -0.2873549163341522, 0.015166337601840496, -0.23306913673877716, -0.2821566164493561, 0.1391248106956482], [0.09129674732685089, -0.3954299986362457, 0.2455274611711502, -0.1307412087917328, 0.31400516629219055, 0.25420182943344116], [0.3290889859199524, 0.2088438868522644, 0.33110541105270386, -0.2889801263809204, 0.24511371552944183, 0.01828797161579132], [0.2698228359222412, 0.2904162108898163, -0.1371413767337799, -0.2917857766151428, -0.049759045243263245, 0.43666356801986694], [0.3524758517742157, -0.3832121789455414, -0.046719104051589966, 0.14308932423591614, 0.1747511774301529, 0.27269479632377625], [-0.07808378338813782, -0.2159283608198166, 0.1753872036933899, 0.3598468005657196, -0.055517155677080154, 0.3608103096485138], [-0.26197606325149536, 0.3712848126888275, 0.37400901317596436, -0.23120123147964478, 0.0036692528519779444, 0.2060711830854416], [-0.31364884972572327, -0.05829878896474838, -0.20306053757667542, 0.20497265458106995, -0.32460805773735046, 0.2722628116607666], [-0.030707983300089836, 0.04389055073261261, 0.2671019732952118, -0.09467554092407227, -0.2715516984462738, 0.26401981711387634], [-0.37305834889411926, -0.2623622417449951, -0.3878762722015381, 0.12818992137908936, 0.3364461660385132, -0.307379812002182], [0.2875237762928009, 0.2699103057384491, 0.145914688706398, 0.07155879586935043, 0.2160395234823227, 0.016109395772218704], [0.04167144373059273, -0.22990746796131134, 0.10893376916646957, 0.19373862445354462, -0.1326342672109604, 0.25643789768218994], [0.27862823009490967, 0.21935266256332397, 0.4080134332180023, 0.35434743762016296, -0.06566736102104187, 0.1858530342578888], [0.011317168362438679, -0.31331899762153625, 0.38174718618392944, -0.052563466131687164, -0.2358657866716385, -0.21739470958709717], [-0.0788128450512886, 0.2852344810962677, 0.16802126169204712, 0.1749308854341507, 0.033067382872104645, 0.3118027150630951], [0.10023542493581772, 0.2689528465270996, 0.22996769845485687, 0.36190715432167053, -0.15340255200862885, 0.20550820231437683], [-0.10517992824316025, 0.11905814707279205, 0.3401851952075958, -0.36313942074775696, -0.06503263115882874, -0.11663467437028885], [0.1869613230228424, 0.3063233494758606, 0.0628257542848587, 0.03784443810582161, 0.27102628350257874, 0.12523379921913147], [-0.21567584574222565, -0.04726920649409294, -0.009042833000421524, -0.07770343124866486, 0.3565843403339386, -0.047862324863672256], [-0.20092104375362396, 0.03159048408269882, 0.29617252945899963, -0.1255147010087967, 0.1581205278635025, -0.3408850431442261], [-0.3808804750442505, 0.053632695227861404, -0.09593378752470016, 0.32794150710105896, -0.2520729899406433, -0.07089588791131973], [-0.4069507122039795, -0.0003677937784232199, 0.06882957369089127, 0.022930091246962547, 0.14255855977535248, 0.07772281765937805], [-0.2558216154575348, 0.2907375693321228, -0.23119884729385376, 0.1976124793291092, 0.11584275215864182, 0.17727041244506836], [-0.029847897589206696, -0.26687517762184143, -0.22875452041625977, -0.07976461946964264, 0.2568201720714569, -0.19615884125232697], [-0.34773245453834534, 0.2949103116989136, 0.2558946907520294, 0.27953988313674927, 0.3597995638847351, -0.08519633859395981], [-0.08056247979402542, -0.3921490013599396, -0.014262326061725616, -0.12451479583978653, -0.2579886019229889, 0.25293266773223877], [0.2848847806453705, 0.130172461271286, -0.2796669900417328, -0.2201225310564041, 0.12125485390424728, -0.11374031752347946], [-0.013764631003141403, -0.2795863449573517, 0.305082231760025, 0.07759175449609756, -0.23756428062915802, -0.27269312739372253], [0.22146663069725037, -0.30782419443130493, 0.006201835349202156, -0.17281527817249298, 0.16354626417160034, 0.2759598195552826], [0.4002018868923187, -0.0878429263830185, 0.3456163704395294, -0.1338839828968048, 0.2176978588104248, 0.22048629820346832], [-0.2735103964805603, 0.40682628750801086, -0.027272403240203857, 0.3046009838581085, 0.2580581605434418, -0.15344949066638947], [-0.2386442869901657, -0.013145935721695423, 0.12178285419940948, 0.18111714720726013, -0.2725662589073181, 0.19318251311779022], [-0.07487626373767853, 0.062062449753284454, 0.13132740557193756, -0.09595062583684921, -0.1739121675491333, 0.07784312218427658], [0.14900654554367065, -0.303507924079895, -0.19386126101016998, -0.29067400097846985, -0.139264777302742, -0.3257085680961609], [-0.20522622764110565, -0.061991412192583084, -0.14048242568969727, -0.2809521555900574, 0.17155073583126068, -0.2979690432548523], [-0.3076677918434143, -0.16759327054023743, -0.33053305745124817, 0.3084845244884491, 0.09042293578386307, 0.040324095636606216], [-0.02046847902238369, -0.15019650757312775, 0.1292853206396103, 0.13502809405326843, -0.2870553135871887, -0.12557046115398407]]),
-		np.array([0.03211063891649246, 0.30488452315330505, -0.3258211612701416, 0.30493324995040894, -0.03140434995293617, 0.39249029755592346, -0.01030000764876604, -0.2868082821369171, -0.0389123260974884, -0.03783099353313446, 0.0313091054558754, -0.3411775231361389, 0.1834053099155426, 0.32996317744255066, 0.23448342084884644, 0.3365872800350189, -0.13228745758533478, 0.22330069541931152, 0.08665965497493744, 0.12337379902601242, 0.2823176980018616, -0.1675911545753479, 0.016565853729844093, 0.21433855593204498, 0.09660926461219788, -0.10026723891496658, 0.29934850335121155, -0.2631601393222809, -0.26411575078964233, -0.2721172869205475, -0.24651722609996796, 0.3665059804916382, -0.3268098533153534, 0.008869041688740253, 0.013468344695866108, -0.01320482138544321, -0.11210254579782486, -0.043711382895708084, -0.3098194897174835, 0.31609559059143066, -0.37570711970329285, 0.25752222537994385, 0.1481480896472931, -0.12161184847354889, -0.29643505811691284, -0.31177961826324463, 0.2197808176279068, 0.11257718503475189, -0.09516043961048126, -0.18946854770183563, -0.4032369554042816, -0.4015476405620575, -0.16192209720611572, 0.04034140333533287, 0.32367220520973206, -0.23390820622444153, -0.12033602595329285, 0.26680630445480347, -0.38340842723846436, 0.16744014620780945, -0.0365508571267128, -0.1957659274339676, -0.20631526410579681, 0.33962613344192505]),
-		np.array([[-0.01581648923456669, -0.1016465276479721, -0.06494140625, -0.01368621177971363, -0.10588621348142624, 0.0002962976577691734, -0.07264469563961029, -0.018496232107281685, 0.055780574679374695, 0.008502110838890076, 0.09297572076320648, 0.0554971881210804, -0.017410116270184517, 0.032032351940870285, 0.012415745295584202, 0.034194424748420715, -0.09390520304441452, 0.033706024289131165, 0.07185348123311996, -0.04499083757400513, 0.09879443049430847, -0.020019348710775375, 0.059434786438941956, -0.13061755895614624, -0.10637246817350388, -0.09006518125534058, -0.08938219398260117, 0.006227031350135803, 0.08061989396810532, -0.02494034543633461, 0.050052445381879807, 0.03275419399142265, 0.07389336824417114, -0.024854298681020737, 0.0670275092124939, -0.1375897079706192, 0.08073902875185013, -0.11881045997142792, 0.014788669534027576, -0.05209038406610489, 0.12364423274993896, 0.10675157606601715, 0.06693069636821747, -0.09644734859466553, 0.033221758902072906, 0.058745626360177994, 0.10780663788318634, 0.06220710650086403, -0.0596950501203537, -0.023085815832018852, 0.12186771631240845, -0.046340834349393845, 0.05585506558418274, -0.09184133261442184, 0.11669731885194778, -0.012071622535586357, 0.08908089995384216, 0.09349818527698517, -0.00867424625903368, 0.09793810546398163, 0.04367166757583618, 0.08519866317510605, -0.014979418367147446, -0.11223442107439041], [0.010685635730624199, 0.08812735229730606, -0.0693579912185669, 0.07682900875806808, 0.009160608984529972, -0.036222752183675766, 0.047752562910318375, -0.02553214132785797, 0.07604962587356567, 0.09071624279022217, -0.047256700694561005, 0.03399454802274704, 0.042491503059864044, 0.10850995779037476, -0.03014145977795124, -0.04633845388889313, 0.02797992154955864, -0.10200290381908417, -0.13500919938087463, 0.10590296238660812, -0.03442149609327316, 0.08162198960781097, 0.0705413818359375, -0.11303916573524475, -0.031533800065517426, 0.025900261476635933, -0.07077797502279282, 0.12451434135437012, 0.03579811379313469, -0.08442185074090958, 0.09576387703418732, 0.010710456408560276, -0.04531511664390564, 0.06264238804578781, 0.0828668475151062, 0.09159202873706818, -0.0021198198664933443, 0.07952133566141129, -0.03451002761721611, 0.005656047724187374, -0.0016569793224334717, 0.11403539031744003, 0.04239946976304054, 0.10426487028598785, -0.05331471934914589, -0.045145921409130096, -0.03995882719755173, -0.07091142982244492, -0.04323047772049904, 0.007191074080765247, -0.030568400397896767, -0.07688234001398087, -0.08564422279596329, 0.08976557105779648, -0.12342124432325363, -0.0020768390968441963, 0.07836878299713135, 0.11397774517536163, -0.10095193982124329, -0.0027489974163472652, -0.03082519769668579, 0.027792692184448242, -0.06570128351449966, -0.03375270217657089], [0.13539308309555054, -0.1311255395412445, 0.04514200612902641, 0.0285320021212101, 0.10969462990760803, 0.03639954328536987, -0.05464813858270645, 0.022993585094809532, -0.020043835043907166, 0.03062736988067627, -0.08350580930709839, -0.03241082280874252, 0.10228698700666428, -0.0266549214720726, -0.09512115269899368, -0.05008973181247711, -0.0014174181269481778, 0.07770992815494537, -0.005984385032206774, 0.062010761350393295, -0.010667279362678528, 0.03987150639295578, 0.0010271966457366943, 0.013414944522082806, -0.08477948606014252, 0.06218026578426361, -0.02970319241285324, 0.11792078614234924, 0.0552661158144474, -0.032527465373277664, 0.03331947699189186, -0.06072544679045677, -0.12168410420417786, -0.1120649203658104, -0.03957359865307808, 0.09422095119953156, -0.03651396185159683, 0.11510957032442093, 0.05722431465983391, -0.049369532614946365, 0.0010809898376464844, 0.09914565831422806, 0.025181928649544716, 0.07861299812793732, -0.033521488308906555, -0.07005961239337921, 0.031544771045446396, 0.09397197514772415, 0.09953623265028, -0.005748974159359932, 0.016893690451979637, 0.01586359180510044, -0.04102878272533417, -0.05889440327882767, 0.035732246935367584, -0.1453501433134079, 0.10108420252799988, 0.0095475809648633, 0.039938803762197495, 0.07769402116537094, -0.025208398699760437, 0.06424163281917572, -0.02119121514260769, 0.029987219721078873], [-0.040128547698259354, 0.07514393329620361, -0.06842698901891708, -0.03691793978214264, -0.05700347572565079, -0.06359098851680756, -0.0319080725312233, -0.07364605367183685, -0.09022918343544006, -0.07192827761173248, -0.10305944830179214, -0.0573093555867672, 0.09376963973045349, -0.035597968846559525, 0.034738440066576004, 0.10830654203891754, 0.0796070322394371, 0.06869792938232422, 0.04293646290898323, -0.012419207021594048, 0.0910770520567894, 0.02873370237648487, 0.07851317524909973, -0.1313551962375641, 0.05225570127367973, 0.07214154303073883, 0.06237788870930672, -0.07733835279941559, -0.02175797149538994, -0.11281266063451767, -0.0741998627781868, 0.08048224449157715, 0.0686500146985054, -0.030879352241754532, 0.07842401415109634, -0.07177764922380447, 0.0703110322356224, -0.014054757542908192, -0.0071450951509177685, -0.06153310835361481, 0.09944896399974823, 0.1099681556224823, 0.005881646182388067, 0.08678990602493286, -0.07134314626455307, 0.05026542767882347, 0.09203647077083588, 0.04751408472657204, 0.12075676023960114, -0.10313892364501953, 0.011334164999425411, -0.06058890372514725, -0.06943720579147339, 0.09157910943031311, 0.038593608886003494, 0.13844336569309235, -0.04510263726115227, -0.05407501384615898, -0.13720428943634033, -0.07994914799928665, -0.06649385392665863, 0.11151636391878128, 0.13235720992088318, -0.032452549785375595], [0.04325848072767258, 0.003317710245028138, -0.06978641450405121, 0.061599019914865494, 0.027980107814073563, -0.07577528059482574, -0.035793937742710114, 0.024619391188025475, 0.019055351614952087, 0.00687660276889801, -0.0451093390583992, 0.055620163679122925, 0.03820167854428291, -0.026312926784157753, -0.06966039538383484, 0.12382060289382935, -0.062443457543849945, -0.09345762431621552, -0.03784148767590523, -0.0787208080291748, -0.10884857922792435, -0.07958019524812698, -0.004536524415016174, 0.10086933523416519, -0.00537102809175849, 0.0058665708638727665, 0.07660991698503494, -0.07082433998584747, -0.005030945409089327, 0.03843597322702408, -0.03153841942548752, -0.052531275898218155, 0.000492749095428735, 0.06043855473399162, -0.03435785323381424, 0.09563916176557541, -0.1073998436331749, -0.041443467140197754, -0.05703030526638031, 0.0836610198020935, 0.0299207866191864, 0.07710970193147659, 0.022144660353660583, -0.012819156050682068, -0.02990957535803318, 0.013902260921895504, -0.00853597093373537, 0.07981809973716736, -0.014044949784874916, -0.05911816284060478, 0.02348349615931511, -0.05513297766447067, 0.08919306099414825, -0.014237573370337486, 0.025005677714943886, 0.015204419381916523, 0.010822860524058342, 0.08756236732006073, 0.04458506777882576, 0.00389429135248065, -0.022149428725242615, 0.03670482710003853, -0.06767596304416656, -0.05258442088961601], [0.062387216836214066, -0.017617013305425644, -0.022926073521375656, 0.02081133797764778, 0.008341045118868351, -0.07016333192586899, -0.0021141518373042345, 0.08693110942840576, -0.04837484657764435, -0.01420624554157257, -0.04857967793941498, -0.003960483241826296, 0.06805358827114105, -0.06789083033800125, 0.07467930018901825, 0.08792293071746826, -0.042822688817977905, -0.08614486455917358, 0.08221742510795593, 0.13011400401592255, 0.11763741821050644, -0.044321320950984955, -0.020026057958602905, 0.020608428865671158, 0.018314996734261513, -0.04350937530398369, 0.09113389253616333, 0.005972996354103088, 0.025972073897719383, 0.10098671168088913, 0.042868562042713165, -0.0013445091899484396, 0.06757594645023346, 0.015456250868737698, -0.07340559363365173, 0.07213359326124191, -0.06948109716176987, -0.010812503285706043, -0.04852399602532387, 0.014460141770541668, 0.0019568800926208496, -0.062113404273986816, -0.0529937781393528, -0.009185194969177246, -0.11526228487491608, 0.005994458217173815, 0.04134715721011162, -0.06503280997276306, 0.00028908991953358054, 0.07312435656785965, -0.024118155241012573, -0.04423627257347107, 0.03650865703821182, 0.04000776633620262, -0.04182025417685509, -0.06732474267482758, -0.05279436707496643, -0.042710259556770325, 0.0619574673473835, -0.11159800738096237, 0.022897228598594666, 0.1252373307943344, 0.11431610584259033, 0.004233251791447401]]),
-		np.array([-0.019082752987742424, -0.06422685831785202, 0.11463014036417007, 0.0955633819103241, 0.14574605226516724, -0.031497012823820114]),
-	]
-
-	ctype = (0, 0, 0)
-	if position == "central": # central
-		ctype = (1, 0, 0)
-	elif position == "cross": # cross
-		ctype = (0, 1, 0)
-	elif position == "corner": # corner
-		ctype = (0, 0, 1)
-	else:
-		raise ValueError(f"position argument must be 'central', 'cross' or 'corner' but not '{position}'")
+# weights = [
+# 	np.array([[-0.375715434551239, 0.006222172174602747, -0.37624290585517883, 0.008464309386909008, -0.29306915402412415, -0.278480589389801], [-0.2583787739276886, 0.014640724286437035, -0.2052038013935089, -0.4088667929172516, 0.027834463864564896, 0.1535203456878662], [-0.37659141421318054, 0.27898234128952026, 0.0708007887005806, -0.2236413210630417, -0.018338939175009727, 0.007888968102633953], [-0.22737780213356018, -0.31164607405662537, 0.060919418931007385, 0.06084316968917847, -0.2594054341316223, 0.3438246548175812], [-0.12750908732414246, -0.042990345507860184, -0.07803457975387573, -0.07182501256465912, 0.1670568585395813, 0.027315914630889893], [0.3599034547805786, 0.2760156989097595, -0.20095573365688324, -0.19916245341300964, -0.23079439997673035, 0.04949335753917694], [-0.09481274336576462, 0.12964841723442078, 0.23326009511947632, -0.34055399894714355, -0.021021608263254166, 0.14837206900119781], [0.02507052570581436, -0.1645250916481018, -0.09006770700216293, -0.14175689220428467, 0.38914966583251953, -0.08506185561418533], [-0.030394311994314194, -0.379715234041214, -0.19114382565021515, -0.08767685294151306, 0.3495703935623169, -0.21081328392028809], [0.35940438508987427, -0.017793387174606323, 0.03135669231414795, -0.35251787304878235, 0.294988214969635, -0.30571654438972473], [-0.3107262849807739, 0.1253812164068222, -0.12625961005687714, 0.19252081215381622, -0.11099227517843246, -0.232396200299263], [-0.09322390705347061, -0.22552275657653809, 0.13292385637760162, -0.3661069869995117, 0.3589838147163391, -0.37052398920059204], [-0.22353707253932953, 0.10790897905826569, -0.1295199990272522, 0.07100290060043335, -0.3484485447406769, -0.1994607299566269], [-0.2289896160364151, 0.011678849346935749, 0.24612711369991302, 0.2393476963043213, -0.5923634767532349, 0.15103957056999207], [0.36812829971313477, 0.08213147521018982, -0.3729535639286041, 0.17482183873653412, -0.15268348157405853, 0.08832335472106934], [0.010850013233721256, 0.060191381722688675, -0.4051192104816437, -0.20781154930591583, -0.25922784209251404, 0.08039125055074692], [0.16625730693340302, 0.3192038834095001, -0.3098008334636688, -0.33771243691444397, -0.12987564504146576, 0.16806797683238983], [0.15402713418006897, -0.18018299341201782, 0.0857740193605423, 0.1285267174243927, -0.09879052639007568, 0.014413595199584961], [0.22354990243911743, -0.22824575006961823, -0.016748519614338875, 0.2512343227863312, 0.27330633997917175, -0.2915950119495392], [-0.3748367130756378, -0.10353126376867294, -0.2833457589149475, -0.002823593793436885, 0.20766593515872955, -0.27643534541130066], [0.06434673815965652, -0.379851758480072, -0.3959147036075592, -0.15165047347545624, -0.08733777701854706, 0.26621806621551514], [0.20528529584407806, 0.12517832219600677, 0.06055162101984024, -0.051373451948165894, 0.1672583818435669, -0.07233186811208725], [-0.27462509274482727, -0.2608323395252228, 0.07626107335090637, 0.008311299607157707, 0.0026199386920779943, -0.07215800881385803], [0.03709816932678223, 0.097209133207798, -0.0648912563920021, -0.020724771544337273, 0.28011807799339294, -0.1131499707698822], [0.34130123257637024, -0.30257803201675415, -0.21281534433364868, -0.15826867520809174, 0.4067056179046631, -0.23141881823539734], [-0.003435013582929969, 0.20048224925994873, 0.1682756543159485, -0.34064507484436035, -0.08935210853815079, -0.12836191058158875], [-0.09616860002279282, 0.3011847734451294, 0.1506011188030243, -0.07918503880500793, -0.27879202365875244, 0.06937824934720993], [-0.11415240168571472, -0.3154951333999634, -0.1161503866314888, -0.029848605394363403, 0.023899346590042114, 0.2896634042263031], [0.05425069481134415, 0.19982469081878662, 0.3320458233356476, 0.2106599062681198, -0.5106386542320251, -0.02067284844815731], [-0.009468594565987587, -0.13552325963974, 0.12212444096803665, 0.21472065150737762, -0.10570745170116425, 0.18325790762901306], [0.09993119537830353, -0.18024396896362305, 0.09192165732383728, -0.04066626355051994, 0.14225952327251434, 0.02358376421034336], [-0.10364798456430435, 0.13902810215950012, 0.3502753973007202, 0.09703265130519867, 0.09209495782852173, -0.28133949637413025]]),
+# 	np.array([-0.35013189911842346, -0.07662559300661087, -0.2327706664800644, 0.1426277756690979, -0.26829949021339417, -0.2749239206314087, 0.008289753459393978, -0.005134612787514925, -0.13348735868930817, 0.13077761232852936, -0.3399444818496704, -0.1822856068611145, 0.13728028535842896, -0.06740762293338776, -0.37524235248565674, -0.35254666209220886, -0.30924558639526367, -0.40658044815063477, 0.08855806291103363, -0.3710115849971771, 0.04799285903573036, 0.1415630728006363, -0.3119862973690033, -0.2686323821544647, 0.40054965019226074, -0.3456103801727295, 0.2954481542110443, -0.2746080458164215, 0.49937903881073, -0.2764087915420532, -0.3522328734397888, -0.33341240882873535]),
+# 	np.array([[-0.1277223825454712, 0.038480304181575775, -0.09511411935091019, -0.04501725360751152, -0.10838019102811813, -0.03907988592982292, -0.028251003473997116, -0.07987416535615921, -0.08902031183242798, 0.11550714820623398, -0.05225953087210655, -0.1055372953414917, -0.017984671518206596, -0.10148447006940842, 0.011215844191610813, -0.13509881496429443, -0.04222998023033142, 0.059486351907253265, -0.07268806546926498, 0.054491426795721054, -0.11638081818819046, 0.027601050212979317, 0.043549053370952606, 0.08494274318218231, 0.10856407135725021, -0.025245245546102524, 0.15317626297473907, 0.16332943737506866, 0.11494680494070053, 0.008696518838405609, 0.011656967923045158, 0.13762147724628448], [-0.011051788926124573, 0.10769259929656982, -0.10396938025951385, -0.001124453847296536, -0.10208737850189209, 0.06148356944322586, -0.10203485190868378, 0.04208879917860031, 0.03779646381735802, -0.10110235959291458, -0.06994976103305817, -0.007830646820366383, 0.00814806018024683, -0.032135698944330215, 0.02347487583756447, 0.14413990080356598, -0.05777342990040779, -0.0028052774723619223, -0.04153238609433174, 0.051893528550863266, 0.035465896129608154, -0.03389936313033104, -0.13267754018306732, -0.014378066174685955, 0.07336251437664032, 0.10371329635381699, -0.08981803059577942, -0.04036366567015648, 0.033303167670965195, 0.07781950384378433, -0.008381600491702557, 0.014750420115888119], [-0.16092562675476074, 0.06608253717422485, -0.02308802306652069, 0.06328058987855911, 0.16295291483402252, -0.06544636189937592, -0.12403378635644913, -0.049123093485832214, -0.26523837447166443, -0.09420067816972733, -0.02140757627785206, 0.06914673000574112, 0.10426080971956253, 0.30438050627708435, -0.06974902004003525, 0.02235846035182476, -0.002063348889350891, -0.10268498957157135, 0.07002653181552887, -0.13177305459976196, 0.018611615523695946, 0.2114093005657196, 0.0861697569489479, -0.044849615544080734, 0.1547384113073349, 0.17469266057014465, -0.11307299882173538, -0.08097246289253235, 0.4340546131134033, 0.012066660448908806, -0.05965685099363327, 0.015725860372185707], [-0.109695665538311, 0.004842747002840042, 0.15755459666252136, -0.1208781749010086, -0.0951317772269249, -0.0806490033864975, -0.013799147680401802, 0.09152249246835709, 0.02528965100646019, 0.0870790034532547, 0.15406647324562073, 0.02285461314022541, -0.01755460537970066, -0.20822809636592865, -0.09508014470338821, 0.15762358903884888, -0.050648439675569534, 0.17532439529895782, 0.08595092594623566, 0.11316174268722534, 0.07247680425643921, -0.017120109871029854, 0.0770685225725174, -0.08652453124523163, -0.1406962275505066, -0.1489506959915161, -0.06713920831680298, 0.1328742355108261, -0.20334000885486603, -0.04573554918169975, -0.05829198285937309, -0.06683619320392609], [0.1602477729320526, 0.09294966608285904, 0.1323126256465912, 0.05184043571352959, 0.04736645892262459, -0.002634494099766016, -0.15715517103672028, -0.04914256930351257, 0.06961449980735779, 0.02863796055316925, 0.0071042850613594055, 0.12422611564397812, 0.12307202070951462, 0.001675190171226859, -0.03220616653561592, 0.17087209224700928, -0.04493798688054085, 0.10572489351034164, 0.022567179054021835, -0.02784053422510624, -0.017484445124864578, -0.12334640324115753, -0.04965520277619362, 0.08869720995426178, -0.014529142528772354, -0.1046973243355751, 0.1258557140827179, 0.07328572124242783, -0.04109830781817436, -0.09627965092658997, -0.10834648460149765, -0.014836686663329601], [0.16885565221309662, 0.16862083971500397, 0.144147127866745, 0.10002544522285461, 0.030950594693422318, -0.13965058326721191, -0.014408177696168423, 0.02755114994943142, 0.06932272762060165, 0.07018279284238815, 0.10723481327295303, -0.062175203114748, 0.042500268667936325, -0.14842046797275543, -0.028404489159584045, -0.08654846996068954, -0.06710441410541534, -0.10958336293697357, -0.010443863458931446, -0.1252545416355133, 0.008245271630585194, -0.0694112703204155, -0.07176678627729416, -0.04256371408700943, 0.08422030508518219, -0.15917079150676727, -0.025356872007250786, -0.09687673300504684, 0.027529284358024597, 0.08607015758752823, -0.0750555545091629, 0.0026272465474903584]]),
+# 	np.array([0.04490027576684952, 0.04691123217344284, 0.1847277134656906, -0.23162177205085754, 0.10889579355716705, -0.1154339537024498]),
+# ]
+# Weights and biases of the model layers, created once at import
+weights = [
+	np.array([[0.1408301144838333, 0.19454064965248108, 0.14749903976917267, 0.2854022979736328, 0.21521078050136566, -0.13022667169570923], [0.14836880564689636, 0.3784830570220947, -0.1481931507587433, 0.10641366988420486, -0.028707318007946014, -0.35397830605506897], [-0.16601067781448364, 0.0867081731557846, 0.25726303458213806, 0.3214321434497833, -0.20880816876888275, 0.3547455966472626], [0.04655525088310242, -0.031852900981903076, -0.4005471467971802, -0.13768374919891357, -0.13388967514038086, 0.07932883501052856], [0.38578757643699646, 0.20654712617397308, -0.10896828025579453, 0.14501537382602692, 0.05183544009923935, -0.37372729182243347], [-0.23395295441150665, 0.22448578476905823, -0.0035432432778179646, 0.1625971496105194, -0.3737449049949646, -0.05570255219936371], [0.15192270278930664, -0.30027350783348083, 0.19791005551815033, 0.25960785150527954, 0.3304290175437927, -0.2680714726448059], [-0.23557570576667786, -0.08237971365451813, -0.18691092729568481, 0.029760953038930893, -0.1297973245382309, 0.24784326553344727], [-0.1895160675048828, -0.38462013006210327, -0.11480382084846497, -0.27287203073501587, -0.36508992314338684, 0.14493773877620697], [-0.24655038118362427, 0.3678840398788452, 0.3237808644771576, -0.17169645428657532, -0.212789848446846, -0.30973201990127563], [-0.34043949842453003, -0.00354945519939065, 0.17396286129951477, -0.017506156116724014, -0.080662302672863, 0.18085016310214996], [0.3915803134441376, -0.1153460144996643, -0.3900125324726105, 0.1484333574771881, 0.3901553452014923, -0.200985386967659], [0.09523430466651917, -0.01255276519805193, 0.1407184898853302, -0.04384789988398552, 0.19331420958042145, 0.14342239499092102], [-0.2819767892360687, -0.04418213292956352, -0.28220614790916443, -0.018969718366861343, 0.2153273969888687, -0.4306047260761261], [0.08212514966726303, -0.2161654829978943, -0.23918403685092926, 0.14399102330207825, -0.39590540528297424, -0.13941067457199097], [0.373220294713974, 0.1758517026901245, 0.32035040855407715, -0.26860329508781433, 0.039171330630779266, -0.3883984088897705], [0.3488311171531677, 0.06764718890190125, -0.0252677071839571, -0.3586844205856323, -0.02814820036292076, 0.3073626160621643], [-0.31948789954185486, -0.3796921670436859, 0.19711542129516602, -0.3441796600818634, -0.2241695076227188, -0.027091892436146736], [-0.24633276462554932, 0.37341707944869995, 0.18451222777366638, -0.389712393283844, -0.2197210043668747, 0.3434199392795563], [-0.3977641761302948, -0.30333763360977173, -0.04140061140060425, 0.14924708008766174, -0.376769483089447, 0.11723756045103073], [0.24761027097702026, 0.3983491361141205, 0.39988014101982117, 0.04133753851056099, 0.023818477988243103, -0.2504379153251648], [-0.3148113489151001, 0.3058558404445648, 0.15237875282764435, -0.3558921217918396, 0.09389844536781311, 0.19630004465579987], [-0.1571093052625656, 0.34930551052093506, -0.31160253286361694, -0.168978750705719, -0.2975735366344452, -0.020090902224183083], [0.16451895236968994, -0.22599071264266968, -0.12904809415340424, -0.18400366604328156, 0.29404979944229126, 0.3153468072414398], [-0.07822231203317642, 0.29161691665649414, -0.3480796813964844, 0.21777932345867157, 0.2452399730682373, 0.21534118056297302], [-0.1984267681837082, -0.07495983690023422, -0.037784986197948456, -0.4036455452442169, -0.20513954758644104, 0.1726258546113968], [0.3771525025367737, 0.23748140037059784, 0.0010000300826504827, 0.037986718118190765, 0.25189483165740967, -0.2929820716381073], [-0.16128858923912048, -0.2873549163341522, 0.015166337601840496, -0.23306913673877716, -0.2821566164493561, 0.1391248106956482], [0.09129674732685089, -0.3954299986362457, 0.2455274611711502, -0.1307412087917328, 0.31400516629219055, 0.25420182943344116], [0.3290889859199524, 0.2088438868522644, 0.33110541105270386, -0.2889801263809204, 0.24511371552944183, 0.01828797161579132], [0.2698228359222412, 0.2904162108898163, -0.1371413767337799, -0.2917857766151428, -0.049759045243263245, 0.43666356801986694], [0.3524758517742157, -0.3832121789455414, -0.046719104051589966, 0.14308932423591614, 0.1747511774301529, 0.27269479632377625], [-0.07808378338813782, -0.2159283608198166, 0.1753872036933899, 0.3598468005657196, -0.055517155677080154, 0.3608103096485138], [-0.26197606325149536, 0.3712848126888275, 0.37400901317596436, -0.23120123147964478, 0.0036692528519779444, 0.2060711830854416], [-0.31364884972572327, -0.05829878896474838, -0.20306053757667542, 0.20497265458106995, -0.32460805773735046, 0.2722628116607666], [-0.030707983300089836, 0.04389055073261261, 0.2671019732952118, -0.09467554092407227, -0.2715516984462738, 0.26401981711387634], [-0.37305834889411926, -0.2623622417449951, -0.3878762722015381, 0.12818992137908936, 0.3364461660385132, -0.307379812002182], [0.2875237762928009, 0.2699103057384491, 0.145914688706398, 0.07155879586935043, 0.2160395234823227, 0.016109395772218704], [0.04167144373059273, -0.22990746796131134, 0.10893376916646957, 0.19373862445354462, -0.1326342672109604, 0.25643789768218994], [0.27862823009490967, 0.21935266256332397, 0.4080134332180023, 0.35434743762016296, -0.06566736102104187, 0.1858530342578888], [0.011317168362438679, -0.31331899762153625, 0.38174718618392944, -0.052563466131687164, -0.2358657866716385, -0.21739470958709717], [-0.0788128450512886, 0.2852344810962677, 0.16802126169204712, 0.1749308854341507, 0.033067382872104645, 0.3118027150630951], [0.10023542493581772, 0.2689528465270996, 0.22996769845485687, 0.36190715432167053, -0.15340255200862885, 0.20550820231437683], [-0.10517992824316025, 0.11905814707279205, 0.3401851952075958, -0.36313942074775696, -0.06503263115882874, -0.11663467437028885], [0.1869613230228424, 0.3063233494758606, 0.0628257542848587, 0.03784443810582161, 0.27102628350257874, 0.12523379921913147], [-0.21567584574222565, -0.04726920649409294, -0.009042833000421524, -0.07770343124866486, 0.3565843403339386, -0.047862324863672256], [-0.20092104375362396, 0.03159048408269882, 0.29617252945899963, -0.1255147010087967, 0.1581205278635025, -0.3408850431442261], [-0.3808804750442505, 0.053632695227861404, -0.09593378752470016, 0.32794150710105896, -0.2520729899406433, -0.07089588791131973], [-0.4069507122039795, -0.0003677937784232199, 0.06882957369089127, 0.022930091246962547, 0.14255855977535248, 0.07772281765937805], [-0.2558216154575348, 0.2907375693321228, -0.23119884729385376, 0.1976124793291092, 0.11584275215864182, 0.17727041244506836], [-0.029847897589206696, -0.26687517762184143, -0.22875452041625977, -0.07976461946964264, 0.2568201720714569, -0.19615884125232697], [-0.34773245453834534, 0.2949103116989136, 0.2558946907520294, 0.27953988313674927, 0.3597995638847351, -0.08519633859395981], [-0.08056247979402542, -0.3921490013599396, -0.014262326061725616, -0.12451479583978653, -0.2579886019229889, 0.25293266773223877], [0.2848847806453705, 0.130172461271286, -0.2796669900417328, -0.2201225310564041, 0.12125485390424728, -0.11374031752347946], [-0.013764631003141403, -0.2795863449573517, 0.305082231760025, 0.07759175449609756, -0.23756428062915802, -0.27269312739372253], [0.22146663069725037, -0.30782419443130493, 0.006201835349202156, -0.17281527817249298, 0.16354626417160034, 0.2759598195552826], [0.4002018868923187, -0.0878429263830185, 0.3456163704395294, -0.1338839828968048, 0.2176978588104248, 0.22048629820346832], [-0.2735103964805603, 0.40682628750801086, -0.027272403240203857, 0.3046009838581085, 0.2580581605434418, -0.15344949066638947], [-0.2386442869901657, -0.013145935721695423, 0.12178285419940948, 0.18111714720726013, -0.2725662589073181, 0.19318251311779022], [-0.07487626373767853, 0.062062449753284454, 0.13132740557193756, -0.09595062583684921, -0.1739121675491333, 0.07784312218427658], [0.14900654554367065, -0.303507924079895, -0.19386126101016998, -0.29067400097846985, -0.139264777302742, -0.3257085680961609], [-0.20522622764110565, -0.061991412192583084, -0.14048242568969727, -0.2809521555900574, 0.17155073583126068, -0.2979690432548523], [-0.3076677918434143, -0.16759327054023743, -0.33053305745124817, 0.3084845244884491, 0.09042293578386307, 0.040324095636606216], [-0.02046847902238369, -0.15019650757312775, 0.1292853206396103, 0.13502809405326843, -0.2870553135871887, -0.12557046115398407]]),
+	np.array([0.03211063891649246, 0.30488452315330505, -0.3258211612701416, 0.30493324995040894, -0.03140434995293617, 0.39249029755592346, -0.01030000764876604, -0.2868082821369171, -0.0389123260974884, -0.03783099353313446, 0.0313091054558754, -0.3411775231361389, 0.1834053099155426, 0.32996317744255066, 0.23448342084884644, 0.3365872800350189, -0.13228745758533478, 0.22330069541931152, 0.08665965497493744, 0.12337379902601242, 0.2823176980018616, -0.1675911545753479, 0.016565853729844093, 0.21433855593204498, 0.09660926461219788, -0.10026723891496658, 0.29934850335121155, -0.2631601393222809, -0.26411575078964233, -0.2721172869205475, -0.24651722609996796, 0.3665059804916382, -0.3268098533153534, 0.008869041688740253, 0.013468344695866108, -0.01320482138544321, -0.11210254579782486, -0.043711382895708084, -0.3098194897174835, 0.31609559059143066, -0.37570711970329285, 0.25752222537994385, 0.1481480896472931, -0.12161184847354889, -0.29643505811691284, -0.31177961826324463, 0.2197808176279068, 0.11257718503475189, -0.09516043961048126, -0.18946854770183563, -0.4032369554042816, -0.4015476405620575, -0.16192209720611572, 0.04034140333533287, 0.32367220520973206, -0.23390820622444153, -0.12033602595329285, 0.26680630445480347, -0.38340842723846436, 0.16744014620780945, -0.0365508571267128, -0.1957659274339676, -0.20631526410579681, 0.33962613344192505]),
+	np.array([[-0.01581648923456669, -0.1016465276479721, -0.06494140625, -0.01368621177971363, -0.10588621348142624, 0.0002962976577691734, -0.07264469563961029, -0.018496232107281685, 0.055780574679374695, 0.008502110838890076, 0.09297572076320648, 0.0554971881210804, -0.017410116270184517, 0.032032351940870285, 0.012415745295584202, 0.034194424748420715, -0.09390520304441452, 0.033706024289131165, 0.07185348123311996, -0.04499083757400513, 0.09879443049430847, -0.020019348710775375, 0.059434786438941956, -0.13061755895614624, -0.10637246817350388, -0.09006518125534058, -0.08938219398260117, 0.006227031350135803, 0.08061989396810532, -0.02494034543633461, 0.050052445381879807, 0.03275419399142265, 0.07389336824417114, -0.024854298681020737, 0.0670275092124939, -0.1375897079706192, 0.08073902875185013, -0.11881045997142792, 0.014788669534027576, -0.05209038406610489, 0.12364423274993896, 0.10675157606601715, 0.06693069636821747, -0.09644734859466553, 0.033221758902072906, 0.058745626360177994, 0.10780663788318634, 0.06220710650086403, -0.0596950501203537, -0.023085815832018852, 0.12186771631240845, -0.046340834349393845, 0.05585506558418274, -0.09184133261442184, 0.11669731885194778, -0.012071622535586357, 0.08908089995384216, 0.09349818527698517, -0.00867424625903368, 0.09793810546398163, 0.04367166757583618, 0.08519866317510605, -0.014979418367147446, -0.11223442107439041], [0.010685635730624199, 0.08812735229730606, -0.0693579912185669, 0.07682900875806808, 0.009160608984529972, -0.036222752183675766, 0.047752562910318375, -0.02553214132785797, 0.07604962587356567, 0.09071624279022217, -0.047256700694561005, 0.03399454802274704, 0.042491503059864044, 0.10850995779037476, -0.03014145977795124, -0.04633845388889313, 0.02797992154955864, -0.10200290381908417, -0.13500919938087463, 0.10590296238660812, -0.03442149609327316, 0.08162198960781097, 0.0705413818359375, -0.11303916573524475, -0.031533800065517426, 0.025900261476635933, -0.07077797502279282, 0.12451434135437012, 0.03579811379313469, -0.08442185074090958, 0.09576387703418732, 0.010710456408560276, -0.04531511664390564, 0.06264238804578781, 0.0828668475151062, 0.09159202873706818, -0.0021198198664933443, 0.07952133566141129, -0.03451002761721611, 0.005656047724187374, -0.0016569793224334717, 0.11403539031744003, 0.04239946976304054, 0.10426487028598785, -0.05331471934914589, -0.045145921409130096, -0.03995882719755173, -0.07091142982244492, -0.04323047772049904, 0.007191074080765247, -0.030568400397896767, -0.07688234001398087, -0.08564422279596329, 0.08976557105779648, -0.12342124432325363, -0.0020768390968441963, 0.07836878299713135, 0.11397774517536163, -0.10095193982124329, -0.0027489974163472652, -0.03082519769668579, 0.027792692184448242, -0.06570128351449966, -0.03375270217657089], [0.13539308309555054, -0.1311255395412445, 0.04514200612902641, 0.0285320021212101, 0.10969462990760803, 0.03639954328536987, -0.05464813858270645, 0.022993585094809532, -0.020043835043907166, 0.03062736988067627, -0.08350580930709839, -0.03241082280874252, 0.10228698700666428, -0.0266549214720726, -0.09512115269899368, -0.05008973181247711, -0.0014174181269481778, 0.07770992815494537, -0.005984385032206774, 0.062010761350393295, -0.010667279362678528, 0.03987150639295578, 0.0010271966457366943, 0.013414944522082806, -0.08477948606014252, 0.06218026578426361, -0.02970319241285324, 0.11792078614234924, 0.0552661158144474, -0.032527465373277664, 0.03331947699189186, -0.06072544679045677, -0.12168410420417786, -0.1120649203658104, -0.03957359865307808, 0.09422095119953156, -0.03651396185159683, 0.11510957032442093, 0.05722431465983391, -0.049369532614946365, 0.0010809898376464844, 0.09914565831422806, 0.025181928649544716, 0.07861299812793732, -0.033521488308906555, -0.07005961239337921, 0.031544771045446396, 0.09397197514772415, 0.09953623265028, -0.005748974159359932, 0.016893690451979637, 0.01586359180510044, -0.04102878272533417, -0.05889440327882767, 0.035732246935367584, -0.1453501433134079, 0.10108420252799988, 0.0095475809648633, 0.039938803762197495, 0.07769402116537094, -0.025208398699760437, 0.06424163281917572, -0.02119121514260769, 0.029987219721078873], [-0.040128547698259354, 0.07514393329620361, -0.06842698901891708, -0.03691793978214264, -0.05700347572565079, -0.06359098851680756, -0.0319080725312233, -0.07364605367183685, -0.09022918343544006, -0.07192827761173248, -0.10305944830179214, -0.0573093555867672, 0.09376963973045349, -0.035597968846559525, 0.034738440066576004, 0.10830654203891754, 0.0796070322394371, 0.06869792938232422, 0.04293646290898323, -0.012419207021594048, 0.0910770520567894, 0.02873370237648487, 0.07851317524909973, -0.1313551962375641, 0.05225570127367973, 0.07214154303073883, 0.06237788870930672, -0.07733835279941559, -0.02175797149538994, -0.11281266063451767, -0.0741998627781868, 0.08048224449157715, 0.0686500146985054, -0.030879352241754532, 0.07842401415109634, -0.07177764922380447, 0.0703110322356224, -0.014054757542908192, -0.0071450951509177685, -0.06153310835361481, 0.09944896399974823, 0.1099681556224823, 0.005881646182388067, 0.08678990602493286, -0.07134314626455307, 0.05026542767882347, 0.09203647077083588, 0.04751408472657204, 0.12075676023960114, -0.10313892364501953, 0.011334164999425411, -0.06058890372514725, -0.06943720579147339, 0.09157910943031311, 0.038593608886003494, 0.13844336569309235, -0.04510263726115227, -0.05407501384615898, -0.13720428943634033, -0.07994914799928665, -0.06649385392665863, 0.11151636391878128, 0.13235720992088318, -0.032452549785375595], [0.04325848072767258, 0.003317710245028138, -0.06978641450405121, 0.061599019914865494, 0.027980107814073563, -0.07577528059482574, -0.035793937742710114, 0.024619391188025475, 0.019055351614952087, 0.00687660276889801, -0.0451093390583992, 0.055620163679122925, 0.03820167854428291, -0.026312926784157753, -0.06966039538383484, 0.12382060289382935, -0.062443457543849945, -0.09345762431621552, -0.03784148767590523, -0.0787208080291748, -0.10884857922792435, -0.07958019524812698, -0.004536524415016174, 0.10086933523416519, -0.00537102809175849, 0.0058665708638727665, 0.07660991698503494, -0.07082433998584747, -0.005030945409089327, 0.03843597322702408, -0.03153841942548752, -0.052531275898218155, 0.000492749095428735, 0.06043855473399162, -0.03435785323381424, 0.09563916176557541, -0.1073998436331749, -0.041443467140197754, -0.05703030526638031, 0.0836610198020935, 0.0299207866191864, 0.07710970193147659, 0.022144660353660583, -0.012819156050682068, -0.02990957535803318, 0.013902260921895504, -0.00853597093373537, 0.07981809973716736, -0.014044949784874916, -0.05911816284060478, 0.02348349615931511, -0.05513297766447067, 0.08919306099414825, -0.014237573370337486, 0.025005677714943886, 0.015204419381916523, 0.010822860524058342, 0.08756236732006073, 0.04458506777882576, 0.00389429135248065, -0.022149428725242615, 0.03670482710003853, -0.06767596304416656, -0.05258442088961601], [0.062387216836214066, -0.017617013305425644, -0.022926073521375656, 0.02081133797764778, 0.008341045118868351, -0.07016333192586899, -0.0021141518373042345, 0.08693110942840576, -0.04837484657764435, -0.01420624554157257, -0.04857967793941498, -0.003960483241826296, 0.06805358827114105, -0.06789083033800125, 0.07467930018901825, 0.08792293071746826, -0.042822688817977905, -0.08614486455917358, 0.08221742510795593, 0.13011400401592255, 0.11763741821050644, -0.044321320950984955, -0.020026057958602905, 0.020608428865671158, 0.018314996734261513, -0.04350937530398369, 0.09113389253616333, 0.005972996354103088, 0.025972073897719383, 0.10098671168088913, 0.042868562042713165, -0.0013445091899484396, 0.06757594645023346, 0.015456250868737698, -0.07340559363365173, 0.07213359326124191, -0.06948109716176987, -0.010812503285706043, -0.04852399602532387, 0.014460141770541668, 0.0019568800926208496, -0.062113404273986816, -0.0529937781393528, -0.009185194969177246, -0.11526228487491608, 0.005994458217173815, 0.04134715721011162, -0.06503280997276306, 0.00028908991953358054, 0.07312435656785965, -0.024118155241012573, -0.04423627257347107, 0.03650865703821182, 0.04000776633620262, -0.04182025417685509, -0.06732474267482758, -0.05279436707496643, -0.042710259556770325, 0.0619574673473835, -0.11159800738096237, 0.022897228598594666, 0.1252373307943344, 0.11431610584259033, 0.004233251791447401]]),
+	np.array([-0.019082752987742424, -0.06422685831785202, 0.11463014036417007, 0.0955633819103241, 0.14574605226516724, -0.031497012823820114]),
+]
+
+idx_to_color = {0: 'w', 1: 'y', 2: 'r', 3: 'o', 4: 'g', 5: 'b'}
+
+# One-hot codes of square position, the first part of model input
+positions_codes = {
+	"central": (1, 0, 0),
+	"cross": (0, 1, 0),
+	"corner": (0, 0, 1),
+}
+
+# One-hot position of every square of side, shape (3, 3, 3)
+side_positions = np.array([
+	[positions_codes["corner"], positions_codes["cross"], positions_codes["corner"]],
+	[positions_codes["cross"], positions_codes["central"], positions_codes["cross"]],
+	[positions_codes["corner"], positions_codes["cross"], positions_codes["corner"]],
+])
+
+def get_scores(rgb:np.ndarray, positions:np.ndarray) -> np.ndarray:
+	"""
+	Scores of colors (idx_to_color) for percent rgb with shape (..., 3) and
+	one-hot positions which are broadcast to it. All squares go through
+	every layer by one matrix multiply.
+	"""
+	rgb, positions = np.broadcast_arrays(rgb, positions)
+	data = np.concatenate([positions, rgb], axis=-1).astype(np.float16)
+	shape = data.shape[:-1]
 
-	data = np.array([ctype + rgb], dtype=np.float16)
+	data = data.reshape(-1, data.shape[-1])
 	for i in range(0, len(weights)-2, 2):
 		weight, bias = weights[i:i+2]
 		data = relu(data.dot(weight.T) + bias)
 
 	data = data.dot(weights[-2].T) + weights[-1]
-	idx_to_color = {0: 'w', 1: 'y', 2: 'r', 3: 'o', 4: 'g', 5: 'b'}
-	return idx_to_color[data.argmax()]
+	return data.reshape(shape + (len(idx_to_color),))
+
+def classify_scans(raw_scans) -> np.ndarray:
+	"""Colors indices (idx_to_color) of scans with shape (n, 6, 3, 3, 3), returns shape (n, 6, 3, 3)."""
+	return get_scores(np.asarray(raw_scans), side_positions).argmax(axis=-1)
+
+def model(rgb:tuple, position:str):
+	"""Convert percent rgb to color."""
+	if position not in positions_codes:
+		raise ValueError(f"position argument must be 'central', 'cross' or 'corner' but not '{position}'")
+
+	return idx_to_color[get_scores(np.array(rgb), np.array(positions_codes[position])).argmax()]
 
 def rgb_to_color_name(raw_inp:list):
-	result = []
-	for side in range(6):
-		res_side = []
-		for row in range(3):
-			res_row = []
-			for col in range(3):
-				if (row == 0 or row == 2) and (col == 0 or col == 2):
-					ctype = 'corner'
-				elif row == col == 1:
-					ctype = 'central'
-				else:
-					ctype = 'cross'
-
-				res_row.append(model(tuple(raw_inp[side][row][col]), ctype))
-
-			res_side.append(res_row)
-
-		result.append(res_side)
-
-	return result
+	colors_idx = classify_scans([raw_inp])[0]
+	return [[[idx_to_color[idx] for idx in row] for row in side] for side in colors_idx.tolist()]
@@ -1,7 +1,7 @@
 import copy
 import numpy as np
-from shortcuts import (adjacent_sides_codes, colors_shortcuts,
-					   side_idx_to_rotation, adjacent_indices)
+from shortcuts import (adjacent_sides_codes, colors_shortcuts, colors_order,
+					   colors_codes, side_idx_to_rotation, adjacent_indices)
 
 
 class Square:
@@ -24,6 +24,174 @@ class Square:
 			self.adjace_colors.append(color)
 
 
+def rotate_all_sides_map(sides_map:np.ndarray, target_side_idx:int) -> np.ndarray:
+	"""
+	Returns sides map (array with shape (6, 3, 3) of any dtype) of the whole
+	cube rotated so that side with target_side_idx will be at the top.
+	"""
+	if target_side_idx == 0:
+		return sides_map
+
+	new_sides_map = np.empty_like(sides_map)
+
+	if target_side_idx == 1:
+		new_sides_map[0] = sides_map[1]
+		new_sides_map[1] = np.rot90(sides_map[5], 1)
+		new_sides_map[2] = np.rot90(sides_map[2], -1)
+		new_sides_map[3] = np.rot90(sides_map[0], 2)
+		new_sides_map[4] = np.rot90(sides_map[4], 1)
+		new_sides_map[5] = np.rot90(sides_map[3], 1)
+
+	elif target_side_idx == 2:
+		new_sides_map[0] = np.rot90(sides_map[2], 1)
+		new_sides_map[1] = np.rot90(sides_map[1], 1)
+		new_sides_map[2] = np.rot90(sides_map[5], 2)
+		new_sides_map[3] = np.rot90(sides_map[3], -1)
+		new_sides_map[4] = np.rot90(sides_map[0], 1)
+		new_sides_map[5] = sides_map[4]
+
+	elif target_side_idx == 3:
+		new_sides_map[0] = np.rot90(sides_map[3], 2)
+		new_sides_map[1] = sides_map[0]
+		new_sides_map[2] = np.rot90(sides_map[2], 1)
+		new_sides_map[3] = np.rot90(sides_map[5], -1)
+		new_sides_map[4] = np.rot90(sides_map[4], -1)
+		new_sides_map[5] = np.rot90(sides_map[1], -1)
+
+	elif target_side_idx == 4:
+		new_sides_map[0] = np.rot90(sides_map[4], -1)
+		new_sides_map[1] = np.rot90(sides_map[1], -1)
+		new_sides_map[2] = np.rot90(sides_map[0], -1)
+		new_sides_map[3] = np.rot90(sides_map[3], 1)
+		new_sides_map[4] = sides_map[5]
+		new_sides_map[5] = np.rot90(sides_map[2], 2)
+
+	elif target_side_idx == 5:
+		new_sides_map[0] = np.rot90(sides_map[5], -1)
+		new_sides_map[1] = np.rot90(sides_map[1], -2)
+		new_sides_map[2] = np.rot90(sides_map[4], 2)
+		new_sides_map[3] = np.rot90(sides_map[3], -2)
+		new_sides_map[4] = np.rot90(sides_map[2], 2)
+		new_sides_map[5] = np.rot90(sides_map[0], 1)
+
+	return new_sides_map
+
+
+def rotate_side_sides_map(sides_map:np.ndarray, side_idx:int, n:int, byclockwise:bool=True) -> np.ndarray:
+	"""Returns sides map (array with shape (6, 3, 3) of any dtype) with side_idx rotated n times."""
+	# -1 : By clockwise
+	# 1 : Counter clockwise
+	n %= 4
+	n *= -1 if byclockwise else 1
+
+	main_side = int()
+	if side_idx == 5 or side_idx == 0:
+		main_side = side_idx
+	else:
+		main_side = (side_idx + 2) % 5 + (side_idx + 2) // 5
+
+	loc_sides_map = rotate_all_sides_map(sides_map, target_side_idx=side_idx)
+	new_sides_map = loc_sides_map.copy()
+
+	# Rotate main side
+	new_sides_map[0] = np.rot90(loc_sides_map[0], n)
+
+	# Rotate neighbor squares
+	for side in range(1, 5):
+		new_sides_map[side, 0, :] = loc_sides_map[(side - n - 1) % 4 + 1, 0, :]
+
+	return rotate_all_sides_map(new_sides_map, target_side_idx=main_side)
+
+
+def get_adjacent_facelets() -> tuple:
+	"""
+	Returns for every of 54 facelets (flat index side * 9 + row * 3 + col)
+	tuple of flat indices of facelets which belongs to the same cubie.
+	"""
+	indices = np.arange(54).reshape(6, 3, 3)
+	adjacent_facelets = list()
+
+	for side in range(6):
+		loc_indices = indices.copy()
+		for adj_side, rot_n in side_idx_to_rotation[side].items():
+			loc_indices[adj_side] = np.rot90(loc_indices[adj_side], rot_n)
+
+		for row in range(3):
+			for col in range(3):
+				adjacent_facelets.append(tuple(
+					int(loc_indices[adjacent_sides_codes[side][adj_side], adj_row, adj_col])
+					for adj_side, adj_row, adj_col in adjacent_indices[(row, col)]
+				))
+
+	return tuple(adjacent_facelets)
+
+
+def get_move_idx(side_idx:int, n:int, byclockwise:bool=True) -> int:
+	"""
+	Returns index of move at moves_permutations: side_idx * 3 + n - 1 where
+	n is number of rotations by clockwise. Returns -1 if move does nothing.
+	"""
+	n %= 4
+	if not byclockwise:
+		n = (4 - n) % 4
+
+	return side_idx * 3 + n - 1 if n else -1
+
+
+def get_moves_permutations() -> np.ndarray:
+	"""
+	Returns array with shape (18, 54). Row with get_move_idx(side_idx, n, byclockwise)
+	index is a permutation of flat facelets indices: facelets[permutation] is
+	the same as rotate_side_sides_map(sides_map, side_idx, n, byclockwise).
+	"""
+	indices = np.arange(54).reshape(6, 3, 3)
+	permutations = np.empty((18, 54), dtype=np.intp)
+	for side_idx in range(6):
+		for n in range(1, 4):
+			permutations[get_move_idx(side_idx, n)] = rotate_side_sides_map(indices, side_idx, n).reshape(54)
+
+	return permutations
+
+
+def get_rotations_permutations() -> np.ndarray:
+	"""
+	Returns array with shape (6, 54). Row target_side_idx is a permutation of
+	flat facelets indices which is the same as rotate_all_sides_map(sides_map, target_side_idx).
+	"""
+	indices = np.arange(54).reshape(6, 3, 3)
+	permutations = np.empty((6, 54), dtype=np.intp)
+	for target_side_idx in range(6):
+		permutations[target_side_idx] = rotate_all_sides_map(indices, target_side_idx).reshape(54)
+
+	return permutations
+
+
+def get_orientations() -> list:
+	"""
+	Returns all 24 whole cube rotations as pairs (permutation, sides_codes):
+	rotated facelets are facelets[permutation] and side with code k of
+	rotated cube is the side with code sides_codes[k] of the original one.
+	First six are rotations of RubiksCube.rotate_all_cube(target_side_idx).
+	"""
+	permutations = [tuple(permutation) for permutation in rotations_permutations.tolist()]
+	idx = 0
+	while idx < len(permutations):
+		for rotation in rotations_permutations.tolist():
+			permutation = tuple(permutations[idx][i] for i in rotation)
+			if permutation not in permutations:
+				permutations.append(permutation)
+		idx += 1
+
+	return [(np.array(permutation), [permutation[side * 9 + 4] // 9 for side in range(6)])
+			for permutation in permutations]
+
+
+adjacent_facelets = get_adjacent_facelets()
+moves_permutations = get_moves_permutations()
+rotations_permutations = get_rotations_permutations()
+orientations = get_orientations()
+
+
 class RubiksCube:
 	def __init__(self, sides_map:list):
 		self.sides_map = copy.deepcopy(sides_map)
@@ -48,74 +216,209 @@ class RubiksCube:
 						)
 
 	def rotate_side(self, side_idx:int, n:int, byclockwise:bool=True):
-		# -1 : By clockwise
-		# 1 : Counter clockwise
-		n %= 4
-		n *= -1 if byclockwise else 1
-
-		main_side = int()
-		if side_idx == 5 or side_idx == 0:
-			main_side = side_idx
-		else:
-			main_side = (side_idx + 2) % 5 + (side_idx + 2) // 5
+		move_idx = get_move_idx(side_idx, n, byclockwise)
+		if move_idx >= 0:
+			self.apply_move(move_idx)
+
+	def apply_move(self, move_idx:int):
+		"""Applies move with index get_move_idx(side_idx, n, byclockwise)."""
+		self.sides_map = self.sides_map.reshape(54)[moves_permutations[move_idx]].reshape(6, 3, 3)
+
+	def rotate_all_cube(self, target_side_idx:int):
+		"""After rotation side with target_side_idx will be at the top."""
+		if target_side_idx == 0:
+			return
+
+		self.sides_map = self.sides_map.reshape(54)[rotations_permutations[target_side_idx]].reshape(6, 3, 3)
+
 
-		self.rotate_all_cube(target_side_idx=side_idx)
-		loc_sides_map = copy.deepcopy(self.sides_map)
+class SidesMapView:
+	"""
+	Read-only view of FaceletCube which is indexed as RubiksCube.sides_map:
+	view[side, row, col], view[side][row, col] and view[side][row][col]
+	returns Square built on demand.
+	"""
+	shape = (6, 3, 3)
+	strides = (9, 3, 1)
 
-		# Rotate main side
-		self.sides_map[0] = np.rot90(loc_sides_map[0], n)
+	__slots__ = ("cube", "offset", "dim")
 
-		# Rotate neighbor squares
-		for side in range(1, 5):
-			self.sides_map[side, 0, :] = loc_sides_map[(side - n - 1) % 4 + 1, 0, :]
+	def __init__(self, cube:"FaceletCube", offset:int=0, dim:int=0):
+		self.cube = cube
+		self.offset = offset
+		self.dim = dim
 
-		self.rotate_all_cube(target_side_idx=main_side)
+	def __getitem__(self, key):
+		if not isinstance(key, tuple):
+			key = (key,)
+
+		dim = self.dim + len(key)
+		if dim > 3:
+			raise IndexError(f"too many indices: {len(key)} for view with {3 - self.dim} dimensions")
+
+		offset = self.offset
+		for key_dim, idx in enumerate(key, self.dim):
+			size = self.shape[key_dim]
+			if not -size <= idx < size:
+				raise IndexError(f"index {idx} is out of bounds for axis with size {size}")
+
+			offset += (idx % size) * self.strides[key_dim]
+
+		if dim == 3:
+			return self.cube.get_square(offset)
+
+		return SidesMapView(self.cube, offset, dim)
+
+	def __len__(self):
+		return self.shape[self.dim]
+
+	def __iter__(self):
+		for idx in range(len(self)):
+			yield self[idx]
+
+
+class FaceletCube:
+	"""
+	Compact Rubik's cube: state is flat uint8 array of 54 colors codes
+	(shortcuts.colors_codes) with index side * 9 + row * 3 + col.
+	Adjacent colors are taken from static adjacent_facelets table, so it may
+	be used by Solver and Display instead of RubiksCube.
+	"""
+	__slots__ = ("facelets",)
+
+	def __init__(self, sides_map:list):
+		self.facelets = np.array(
+			[colors_codes[color] for side in sides_map for row in side for color in row],
+			dtype=np.uint8,
+		)
+
+	@classmethod
+	def from_facelets(cls, facelets:np.ndarray) -> "FaceletCube":
+		"""Creates cube from flat array of 54 colors codes without copying."""
+		rubcube = cls.__new__(cls)
+		rubcube.facelets = facelets
+		return rubcube
+
+	@classmethod
+	def from_cube(cls, rubcube) -> "FaceletCube":
+		"""Creates cube from RubiksCube (or any cube with sides_map). FaceletCube is copied."""
+		if isinstance(rubcube, FaceletCube):
+			return rubcube.copy()
+
+		return cls([[[square.color for square in row] for row in side] for side in rubcube.sides_map])
+
+	def __copy__(self) -> "FaceletCube":
+		return self.from_facelets(self.facelets.copy())
+
+	def __deepcopy__(self, memo:dict) -> "FaceletCube":
+		return self.__copy__()
+
+	def __eq__(self, other) -> bool:
+		return isinstance(other, FaceletCube) and np.array_equal(self.facelets, other.facelets)
+
+	def __hash__(self) -> int:
+		return hash(self.facelets.tobytes())
+
+	def copy(self) -> "FaceletCube":
+		return self.__copy__()
+
+	@property
+	def sides_map(self) -> SidesMapView:
+		return SidesMapView(self)
+
+	def get_square(self, facelet_idx:int) -> Square:
+		"""Builds Square of facelet with flat index facelet_idx."""
+		facelets = self.facelets
+		return Square(
+			colors_order[facelets[facelet_idx]],
+			[colors_order[facelets[adj_idx]] for adj_idx in adjacent_facelets[facelet_idx]],
+		)
+
+	def to_sides_map(self) -> list:
+		"""Returns sides map with colors like the one that the cube was created from."""
+		colors = [colors_order[code] for code in self.facelets.tolist()]
+		return [[colors[side * 9 + row * 3:side * 9 + row * 3 + 3] for row in range(3)] for side in range(6)]
+
+	def rotate_side(self, side_idx:int, n:int, byclockwise:bool=True):
+		move_idx = get_move_idx(side_idx, n, byclockwise)
+		if move_idx >= 0:
+			self.apply_move(move_idx)
+
+	def apply_move(self, move_idx:int):
+		"""Applies move with index get_move_idx(side_idx, n, byclockwise)."""
+		self.facelets = self.facelets[moves_permutations[move_idx]]
 
 	def rotate_all_cube(self, target_side_idx:int):
 		"""After rotation side with target_side_idx will be at the top."""
-		if target_side_idx == 0:
-			return
+		if target_side_idx != 0:
+			self.facelets = self.facelets[rotations_permutations[target_side_idx]]
+
+
+class CubeBatch:
+	"""
+	N cubes states stored as one (N, 54) uint8 matrix of colors codes
+	(facelets of FaceletCube). Every move is applied to all cubes by one
+	fancy indexing with moves_permutations. Move index -1 does nothing.
+	"""
+	# Extra identity row: move index -1 leaves cube as it is
+	permutations = np.vstack([moves_permutations, np.arange(54)])
+
+	def __init__(self, states:np.ndarray):
+		self.states = np.asarray(states, dtype=np.uint8).reshape(-1, 54)
+
+	@classmethod
+	def from_cubes(cls, rubcubes:list) -> "CubeBatch":
+		"""Creates batch from FaceletCube (or any cube with sides_map) objects."""
+		return cls(np.array([FaceletCube.from_cube(rubcube).facelets for rubcube in rubcubes], dtype=np.uint8))
+
+	@classmethod
+	def from_sides_map(cls, sides_map:list, n:int) -> "CubeBatch":
+		"""Creates batch of n copies of cube with sides_map."""
+		return cls(np.tile(FaceletCube(sides_map).facelets, (n, 1)))
+
+	def __len__(self) -> int:
+		return len(self.states)
+
+	def __getitem__(self, idx:int) -> FaceletCube:
+		return FaceletCube.from_facelets(self.states[idx].copy())
+
+	def copy(self) -> "CubeBatch":
+		return CubeBatch(self.states.copy())
+
+	def apply(self, moves) -> "CubeBatch":
+		"""
+		Applies one move index (see get_move_idx) to every cube or
+		vector of N moves indices (one per cube).
+		"""
+		moves = np.asarray(moves)
+		if moves.ndim == 0:
+			self.states = self.states[:, self.permutations[moves]]
+		else:
+			rows = np.arange(len(self.states))[:, np.newaxis]
+			self.states = self.states[rows, self.permutations[moves]]
+
+		return self
+
+	def apply_sequence(self, moves) -> "CubeBatch":
+		"""
+		Applies sequence of moves indices with shape (L,) to every cube or
+		matrix with shape (N, L) (one row per cube, padded by -1).
+		"""
+		moves = np.asarray(moves)
+		for step in range(moves.shape[-1]):
+			self.apply(moves[..., step])
+
+		return self
+
+	def colors_counts(self) -> np.ndarray:
+		"""Returns (N, 6) matrix with number of squares of every color code."""
+		return (self.states[:, :, np.newaxis] == np.arange(6)).sum(axis=1)
+
+	def is_valid_counts(self) -> np.ndarray:
+		"""Returns bool vector: every color of the cube has exactly 9 squares."""
+		return (self.colors_counts() == 9).all(axis=1)
 
-		new_sides_map = np.empty((6, 3, 3), dtype=Square)
-
-		if target_side_idx == 1:
-			new_sides_map[0] = self.sides_map[1]
-			new_sides_map[1] = np.rot90(self.sides_map[5], 1)
-			new_sides_map[2] = np.rot90(self.sides_map[2], -1)
-			new_sides_map[3] = np.rot90(self.sides_map[0], 2)
-			new_sides_map[4] = np.rot90(self.sides_map[4], 1)
-			new_sides_map[5] = np.rot90(self.sides_map[3], 1)
-
-		elif target_side_idx == 2:
-			new_sides_map[0] = np.rot90(self.sides_map[2], 1)
-			new_sides_map[1] = np.rot90(self.sides_map[1], 1)
-			new_sides_map[2] = np.rot90(self.sides_map[5], 2)
-			new_sides_map[3] = np.rot90(self.sides_map[3], -1)
-			new_sides_map[4] = np.rot90(self.sides_map[0], 1)
-			new_sides_map[5] = self.sides_map[4]
-
-		elif target_side_idx == 3:
-			new_sides_map[0] = np.rot90(self.sides_map[3], 2)
-			new_sides_map[1] = self.sides_map[0]
-			new_sides_map[2] = np.rot90(self.sides_map[2], 1)
-			new_sides_map[3] = np.rot90(self.sides_map[5], -1)
-			new_sides_map[4] = np.rot90(self.sides_map[4], -1)
-			new_sides_map[5] = np.rot90(self.sides_map[1], -1)
-
-		elif target_side_idx == 4:
-			new_sides_map[0] = np.rot90(self.sides_map[4], -1)
-			new_sides_map[1] = np.rot90(self.sides_map[1], -1)
-			new_sides_map[2] = np.rot90(self.sides_map[0], -1)
-			new_sides_map[3] = np.rot90(self.sides_map[3], 1)
-			new_sides_map[4] = self.sides_map[5]
-			new_sides_map[5] = np.rot90(self.sides_map[2], 2)
-
-		elif target_side_idx == 5:
-			new_sides_map[0] = np.rot90(self.sides_map[5], -1)
-			new_sides_map[1] = np.rot90(self.sides_map[1], -2)
-			new_sides_map[2] = np.rot90(self.sides_map[4], 2)
-			new_sides_map[3] = np.rot90(self.sides_map[3], -2)
-			new_sides_map[4] = np.rot90(self.sides_map[2], 2)
-			new_sides_map[5] = np.rot90(self.sides_map[0], 1)
-
-		self.sides_map = new_sides_map
+	def is_solved(self) -> np.ndarray:
+		"""Returns bool vector: every side of the cube has the color of its central square."""
+		sides = self.states.reshape(-1, 6, 9)
+		return (sides == sides[:, :, 4:5]).all(axis=(1, 2))
@@ -1,9 +1,16 @@
 import numpy as np
 from ursina import *
 
-from shortcuts import (sides_codes, colors_shortcuts, sides_names,
+from shortcuts import (sides_codes, colors_shortcuts, colors_order, sides_names,
 					   sides_positions, sides_rotations, rotation_axises)
-from datatypes import RubiksCube
+from datatypes import RubiksCube, FaceletCube
+from moves import Move
+from replay import get_states
+
+
+def get_grid_key(position:Vec3) -> tuple:
+	"""Integer (x, y, z) of cube position, key of Display.grid."""
+	return tuple(int(round(coord)) for coord in position)
 
 
 class Display(Ursina):
@@ -19,6 +26,9 @@ class Display(Ursina):
 
 		self.all_poses = set(self.left_poses + self.right_poses + self.top_poses + \
 							 self.bottom_poses + self.front_poses + self.back_poses)
+		# Grid keys of places of every side, cubes of side are looked up at grid by them
+		self.sides_keys = {side_name: frozenset(get_grid_key(pos) for pos in getattr(self, f"{side_name}_poses"))
+						   for side_name in sides_names}
 		self.cam = EditorCamera(rotation=(30, -45, 0)) # rotation=(45, 45, 0) world_position=(2, 1, -2), 
 		self.pivot = Entity()
 
@@ -35,6 +45,9 @@ class Display(Ursina):
 
 
 		self.cubes = list()
+		# Cube at every grid key, updated when cubes come back from pivot
+		self.grid = dict()
+		self.pivot_cubes = list()
 		self.sides_map = np.empty((6, 3, 3), dtype=Entity)
 
 		for idx in range(9):
@@ -42,11 +55,9 @@ class Display(Ursina):
 				side_code = sides_codes[side_name]
 				side_position = sides_positions[side_name]
 				side_rotation = sides_rotations[side_name]
-				side_color = eval(
-					f"color.{rubcube.sides_map[side_code, idx//3, idx%3].color_name}"
-				)
+				side_color = getattr(color, rubcube.sides_map[side_code, idx//3, idx%3].color_name)
 
-				cube = self.get_cube(position=eval(f"self.{side_name}_poses[idx]"))
+				cube = self.get_cube(position=getattr(self, f"{side_name}_poses")[idx])
 
 				self.sides_map[side_code, idx//3, idx%3] = Entity(
 					parent=cube,
@@ -57,25 +68,38 @@ class Display(Ursina):
 					rotation=side_rotation,
 				)
 	
+		# State which is shown, replay starts from it
+		self.rubcube = FaceletCube.from_cube(rubcube)
+		# Cubes at their starting places, replay starts every frame from them
+		self.home = dict(self.grid)
+		self.at_home = True
+		self.player = None
+
 	def get_cube(self, position:Vec3):
-		cubes = list(filter(lambda cube: cube.world_position == position, self.cubes))
-		if cubes:
-			cube = cubes[0]
-		else:
-			cube = Entity(position=position)
-			self.cubes.append(cube)
+		key = get_grid_key(position)
+		if key not in self.grid:
+			self.grid[key] = Entity(position=position)
+			self.cubes.append(self.grid[key])
 
-		return cube
+		return self.grid[key]
 
 	def reaprent_all_cubes_to_scene(self):
-		for cube in self.cubes:
-			if cube.parent == self.pivot:
-				world_pos, world_rot = round(cube.world_position, 1), cube.world_rotation
-				cube.parent = scene
-				cube.position, cube.rotation = world_pos, world_rot
-
+		"""Cubes of the last rotation come back to scene, only they change places at grid."""
+		for cube in self.pivot_cubes:
+			world_pos, world_rot = round(cube.world_position, 1), cube.world_rotation
+			cube.parent = scene
+			cube.position, cube.rotation = world_pos, world_rot
+			self.grid[get_grid_key(world_pos)] = cube
+
+		self.pivot_cubes = list()
 		self.pivot.rotation = 0
 
+	def to_pivot(self, cubes:list) -> None:
+		self.pivot_cubes = list(cubes)
+		for cube in self.pivot_cubes:
+			cube.parent = self.pivot
+		self.at_home = False
+
 	def rotation_to_false(self):
 		self.rotation = False
 
@@ -89,15 +113,12 @@ class Display(Ursina):
 
 		self.rotation = True
 		self.reaprent_all_cubes_to_scene()
+		self.rubcube.rotate_side(side_code, 1, byclockwise)
 
-		cubes_poses = eval(f"self.{side_name}_poses")
 		rotation_axis = rotation_axises[side_name]
+		self.to_pivot(self.grid[key] for key in self.sides_keys[side_name])
 
-		for cube in self.cubes:
-			if cube.position in cubes_poses:
-				cube.parent = self.pivot
-
-		eval(f"self.pivot.animate_rotation_{rotation_axis}(n, duration=self.animation_time)")
+		getattr(self.pivot, f"animate_rotation_{rotation_axis}")(n, duration=self.animation_time)
 		invoke(self.rotation_to_false, delay=self.animation_time + 0.11)
 
 	def rotate_all_cube(self, rotation_axis:str, byclockwise:bool=True):
@@ -107,15 +128,108 @@ class Display(Ursina):
 		self.rotation = True
 		self.reaprent_all_cubes_to_scene()
 
-		for cube in self.cubes:
-			cube.parent = self.pivot
+		self.to_pivot(self.cubes)
 
-		eval(f"self.pivot.animate_rotation_{rotation_axis}(n, duration=self.animation_time)")
+		getattr(self.pivot, f"animate_rotation_{rotation_axis}")(n, duration=self.animation_time)
 		invoke(self.rotation_to_false, delay=self.animation_time + 0.11)
 
+	def replay(self, moves:list, speed:float=1.0, step:int=0) -> "Replay":
+		"""
+		Plays moves back from the state which is shown instead of rotate_side
+		calls, speed is turns per animation_time. Keys: space - pause, left /
+		right - previous / next step, up / down - faster / slower.
+		"""
+		if self.player is not None:
+			destroy(self.player)
+		self.player = Replay(self, moves, speed, step)
+		return self.player
+
+	def show_state(self, facelets:np.ndarray, move:int=None, fraction:float=0.0) -> None:
+		"""
+		Shows colors of facelets (see replay.get_states) with side of move
+		rotated by fraction of the move. Nothing depends on previous frames.
+		"""
+		self.rubcube = FaceletCube.from_facelets(np.array(facelets, dtype=np.uint8))
+		# Layer of the previous frame comes back to its places at home
+		self.pivot.rotation = 0
+		self.reaprent_all_cubes_to_scene()
+		if not self.at_home:
+			for key, cube in self.home.items():
+				cube.parent = scene
+				cube.position, cube.rotation = Vec3(*key), Vec3(0, 0, 0)
+			self.grid = dict(self.home)
+
+		for side in range(6):
+			for row in range(3):
+				for col in range(3):
+					color_name = colors_shortcuts[colors_order[facelets[side * 9 + row * 3 + col]]]
+					self.sides_map[side, row, col].color = getattr(color, color_name)
+
+		if move is None or fraction <= 0:
+			return
+
+		side_code, n, byclockwise = Move(move).to_rotation()
+		side_name = sides_codes[side_code]
+		angle = 90 * n * (1 if byclockwise else -1)
+		if side_name in ["back", "left", "bottom"]:
+			angle *= -1
+
+		self.to_pivot(self.grid[key] for key in self.sides_keys[side_name])
+		# Cubes are still at home, they are put back to the same places by the next frame
+		self.at_home = True
+		setattr(self.pivot, f"rotation_{rotation_axises[side_name]}", angle * fraction)
+
 	# def input(self, key):
 	# 	keys = dict(zip('asdwqe', 'left bottom right top front back'.split()))
 	# 	if key in keys and not self.rotation:
 	# 		self.rotate_side(keys[key])
 
 	# 	super().input(key)
+
+
+class Replay(Entity):
+	"""
+	Replay of moves at Display. Frame is taken from states of the cube
+	after every step (replay.get_states) and time since the start, so
+	replay doesn't depend on frame rate and may be seeked to any step.
+	"""
+	def __init__(self, display:Display, moves:list, speed:float=1.0, step:int=0) -> None:
+		super().__init__()
+		self.display = display
+		self.moves = list(moves)
+		self.states = get_states(display.rubcube, self.moves)
+		self.speed = speed
+		self.paused = False
+		# Steps since the start of replay, fraction is the part of the current move
+		# (position and show are attributes of Entity)
+		self.progress = 0.0
+		self.seek(step)
+
+	def seek(self, step:int) -> None:
+		self.progress = float(min(max(step, 0), len(self.moves)))
+		self.show_frame()
+
+	def show_frame(self) -> None:
+		step = int(self.progress)
+		if step >= len(self.moves):
+			self.display.show_state(self.states[-1])
+		else:
+			self.display.show_state(self.states[step], self.moves[step], self.progress - step)
+
+	def update(self) -> None:
+		if self.paused or self.progress >= len(self.moves):
+			return
+
+		self.progress = min(self.progress + time.dt * self.speed / self.display.animation_time, len(self.moves))
+		self.show_frame()
+
+	def input(self, key) -> None:
+		if key == "space":
+			self.paused = not self.paused
+		elif key in ("left arrow", "right arrow"):
+			self.paused = True
+			self.seek(int(self.progress) + (1 if key == "right arrow" else -1))
+		elif key == "up arrow":
+			self.speed *= 2
+		elif key == "down arrow":
+			self.speed /= 2
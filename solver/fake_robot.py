@@ -0,0 +1,199 @@
+import time
+import random
+import asyncio
+import numpy as np
+
+from datatypes import FaceletCube
+from robot_model import RobotModel, expand_program
+from protocol import encode_message, MessageReader
+from calibration import typical_rgb
+
+
+def get_raw_colors(rubcube, noise:float=0.01, rng:np.random.Generator=None, gains=1.0, misread:float=0.0) -> list:
+	"""
+	Returns raw colors as robot sends them after scan of rubcube: every
+	reading is typical_rgb of the square multiplied by gains of channels
+	(light of the session) and by normal noise with noise std. With
+	probability misread the reading is random (glare, missed square).
+	"""
+	rng = rng or np.random.default_rng()
+	rubcube = FaceletCube.from_cube(rubcube)
+	rgb = np.array([typical_rgb[color] for side in rubcube.to_sides_map() for row in side for color in row], dtype=float)
+	rgb *= np.asarray(gains) * (1 + rng.normal(0, noise, size=rgb.shape))
+	misread_squares = rng.random(len(rgb)) < misread
+	rgb[misread_squares] = rng.uniform(0, 100, size=(misread_squares.sum(), 3))
+	return np.clip(rgb, 0, 100).round().astype(int).reshape(6, 3, 3, 3).tolist()
+
+
+def scramble(n_moves:int=30, rng:random.Random=None) -> FaceletCube:
+	"""Returns solved cube after n_moves random moves."""
+	rng = rng or random.Random()
+	sides_map = [[[color] * 3 for _ in range(3)] for color in "ybrgow"]
+	rubcube = FaceletCube(sides_map)
+	for _ in range(n_moves):
+		rubcube.apply_move(rng.randrange(18))
+
+	return rubcube
+
+
+class FakeRobot:
+	"""
+	Client which speaks protocol of robot (robot/Rubik's cube solver/main.py)
+	for rubcube: answers scan by get_raw_colors and runs moves by
+	RobotModel, sleeping time_scale of predicted robot time. Cube is turned
+	as robot would turn it, so run checks that solution is right. Readings
+	of the session are brighter or darker at every channel up to drift,
+	misread is probability of random reading of a square. Scan takes
+	scan_time, every side is sent as soon as it's scanned if stream_sides.
+	"""
+	def __init__(
+			self,
+			host:str,
+			port:int,
+			rubcube,
+			noise:float=0.01,
+			drift:float=0.0,
+			misread:float=0.0,
+			time_scale:float=0.0,
+			scan_time:float=0.0,
+			stream_sides:bool=True,
+			seed:int=None) -> None:
+		self.host = host
+		self.port = port
+		self.rubcube = FaceletCube.from_cube(rubcube)
+		self.noise = noise
+		self.misread = misread
+		self.time_scale = time_scale
+		self.scan_time = scan_time
+		self.stream_sides = stream_sides
+		self.rng = np.random.default_rng(seed)
+		self.gains = 1 + self.rng.uniform(-drift, drift, size=3)
+		self.reader = None
+		self.writer = None
+		self.seq = 0
+
+	async def send(self, cmd:str, data=None) -> None:
+		self.writer.write(encode_message(self.seq, cmd, data))
+		self.seq += 1
+		await self.writer.drain()
+
+	def scan(self) -> list:
+		return get_raw_colors(self.rubcube, self.noise, self.rng, self.gains, self.misread)
+
+	async def run_moves(self, robot:RobotModel, moves:list) -> None:
+		"""Turns the cube by moves (primitives separated by spaces) as robot does."""
+		robot_time = robot.time
+		for move in moves:
+			for code in move.split():
+				if code[0] == "T":
+					self.rubcube.apply_move(robot.side_codes_seq[5] * 3 + int(code[1]) - 1)
+				robot.apply_primitive(code)
+		await asyncio.sleep((robot.time - robot_time) * self.time_scale)
+
+	async def run(self) -> dict:
+		"""
+		Returns metrics of the session in seconds: time_to_first_move (since
+		connection), solve_latency (since the last colors until "solving"),
+		session_time, and rescans, rereads, moves, messages (received and
+		sent) and solved.
+		"""
+		start = time.perf_counter()
+		self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+		messages = MessageReader()
+		robot = RobotModel.after_scan()
+		metrics = {"rescans": 0, "rereads": 0, "moves": 0, "messages": 0, "time_to_first_move": None, "solve_latency": None}
+		colors_sent = None
+
+		await self.send("hello")
+		try:
+			while True:
+				data = await self.reader.read(4096)
+				if not data:
+					break
+
+				for message in messages.feed(data):
+					metrics["messages"] += 1
+					cmd = message["cmd"]
+					if cmd in ("scan", "rescan"):
+						metrics["rescans"] += cmd == "rescan"
+						raw_colors = self.scan()
+						for side, side_colors in enumerate(raw_colors):
+							await asyncio.sleep(self.scan_time / 6)
+							if self.stream_sides:
+								await self.send("side", [side, side_colors])
+						await self.send("colors", raw_colors)
+						colors_sent = time.perf_counter()
+
+					elif cmd == "reread":
+						metrics["rereads"] += 1
+						await asyncio.sleep(self.scan_time * len(message["data"]) / 54)
+						raw_colors = self.scan()
+						await self.send("squares", [[side, row, col, raw_colors[side][row][col]] for side, row, col in message["data"]])
+						colors_sent = time.perf_counter()
+
+					elif cmd == "solving":
+						metrics["solve_latency"] = time.perf_counter() - colors_sent
+
+					elif cmd == "move":
+						if metrics["time_to_first_move"] is None:
+							metrics["time_to_first_move"] = time.perf_counter() - start
+
+						await self.run_moves(robot, [message["data"]])
+						metrics["moves"] += 1
+						await self.send("ok", message["seq"])
+
+					elif cmd == "program":
+						if metrics["time_to_first_move"] is None:
+							metrics["time_to_first_move"] = time.perf_counter() - start
+
+						for step, moves in enumerate(expand_program(message["data"])):
+							await self.run_moves(robot, moves)
+							metrics["moves"] += len(moves)
+							await self.send("ok", [message["seq"], step])
+		finally:
+			self.writer.close()
+
+		sides = self.rubcube.facelets.reshape(6, 9)
+		metrics["messages"] += self.seq
+		metrics["solved"] = bool((sides == sides[:, 4:5]).all())
+		metrics["session_time"] = time.perf_counter() - start
+		return metrics
+
+
+async def run_fake_robots(host:str, port:int, n:int, seed:int=0, **kwargs) -> list:
+	"""Runs n fake robots with different scrambled cubes at once, returns their metrics."""
+	rng = random.Random(seed)
+	robots = [FakeRobot(host, port, scramble(rng=rng), seed=seed + i, **kwargs) for i in range(n)]
+	return await asyncio.gather(*(robot.run() for robot in robots))
+
+
+def get_report(results:list) -> str:
+	"""p50 / p95 / p99 of time metrics of run_fake_robots in milliseconds."""
+	lines = [f"robots: {len(results)}, solved: {sum(r['solved'] for r in results)}, "
+			 f"rescans: {sum(r['rescans'] for r in results)}, rereads: {sum(r['rereads'] for r in results)}, "
+			 f"moves: {sum(r['moves'] for r in results)}, messages: {sum(r['messages'] for r in results)}"]
+	for metric in ("time_to_first_move", "solve_latency", "session_time"):
+		values = np.array([r[metric] for r in results if r[metric] is not None]) * 1000
+		if len(values) == 0:
+			continue
+		p50, p95, p99 = np.percentile(values, [50, 95, 99])
+		lines.append(f"{metric:>20}: p50 {p50:8.1f} ms, p95 {p95:8.1f} ms, p99 {p99:8.1f} ms")
+
+	return "\n".join(lines)
+
+
+if __name__ == "__main__":
+	from server import SolverServer
+
+	N_ROBOTS = 8
+	# Fraction of predicted robot time which fake robots really sleep
+	TIME_SCALE = 0.01
+
+	async def main():
+		server = SolverServer("127.0.0.1", 0)
+		await server.start()
+		results = await run_fake_robots("127.0.0.1", server.port, N_ROBOTS, time_scale=TIME_SCALE)
+		await server.shutdown()
+		print(get_report(results))
+
+	asyncio.run(main())
@@ -5,6 +5,7 @@ import threading
 from color_detector import rgb_to_color_name
 from datatypes import RubiksCube
 from solver import Solver
+from moves import Move
 from display import Display
 
 # raw_input = [[[(5, 22, 49), (44, 18, 8), (58, 88, 100)], [(7, 33, 13), (29, 9, 6), (7, 35, 11)], [(46, 57, 13), (41, 18, 8), (5, 23, 49)]], [[(38, 16, 6), (7, 34, 11), (29, 9, 4)], [(56, 67, 15), (7, 24, 54), (28, 10, 6)], [(22, 8, 5), (26, 10, 6), (54, 82, 95)]], [[(53, 64, 13), (58, 69, 15), (25, 9, 4)], [(64, 95, 100), (66, 94, 100), (6, 31, 10)], [(6, 30, 10), (61, 93, 100), (22, 9, 5)]], [[(5, 22, 49), (6, 24, 55), (39, 17, 7)], [(27, 10, 6), (7, 33, 12), (42, 19, 8)], [(49, 60, 13), (6, 23, 52), (5, 21, 45)]], [[(57, 86, 100), (64, 96, 100), (6, 31, 10)], [(58, 70, 15), (47, 54, 16), (26, 10, 5)], [(37, 16, 6), (42, 18, 9), (54, 82, 95)]], [[(52, 63, 13), (64, 96, 100), (6, 31, 10)], [(57, 68, 15), (48, 19, 9), (6, 24, 53)], [(5, 29, 9), (6, 23, 53), (37, 16, 6)]]]
@@ -13,10 +14,10 @@ from display import Display
 def assemble_the_cube() -> None:
 	solving_steps = solver.solve()
 	print(f"Len of solving steps: {len(solving_steps)}")
-	print("Solving steps:\n", solving_steps)
+	print("Solving steps:\n", solving_steps.to_codes())
 
-	for i, step in enumerate(solving_steps[:]):
-		side_code, n, byclockwise = map(int, list(step))
+	for i, move in enumerate(map(Move, solving_steps)):
+		side_code, n, byclockwise = move.to_rotation()
 		for _ in range(n):
 			time.sleep(1)
 			display.rotate_side(side_code=side_code, byclockwise=bool(byclockwise))
@@ -0,0 +1,83 @@
+from array import array
+
+from datatypes import get_move_idx
+
+
+class Move(int):
+	"""
+	Move index 0-17 (datatypes.get_move_idx): side_idx * 3 + n - 1, where n
+	is number of rotations by clockwise. Legacy solving step code is
+	"{side_idx}{n}{byclockwise}" with n 1 or 2.
+	"""
+	__slots__ = ()
+
+	@classmethod
+	def from_rotation(cls, side_idx:int, n:int, byclockwise:bool=True) -> "Move":
+		"""Returns None if rotation does nothing."""
+		move_idx = get_move_idx(side_idx, n, byclockwise)
+		return cls(move_idx) if move_idx >= 0 else None
+
+	@classmethod
+	def from_code(cls, code:str) -> "Move":
+		"""Returns None if solving step code does nothing (e.g. "100")."""
+		return cls.from_rotation(int(code[0]), int(code[1]), code[2] == "1")
+
+	@property
+	def side_idx(self) -> int:
+		return self // 3
+
+	@property
+	def turns(self) -> int:
+		"""Number of rotations by clockwise: 1, 2 or 3."""
+		return self % 3 + 1
+
+	def inverse(self) -> "Move":
+		return Move(self - self % 3 + 2 - self % 3)
+
+	def to_rotation(self) -> tuple:
+		"""Returns (side_idx, n, byclockwise) with n 1 or 2 as Solver.rotate_side writes it."""
+		if self.turns == 3:
+			return self.side_idx, 1, False
+
+		return self.side_idx, self.turns, True
+
+	def to_code(self) -> str:
+		side_idx, n, byclockwise = self.to_rotation()
+		return f"{side_idx}{n}{int(byclockwise)}"
+
+	def __repr__(self) -> str:
+		return f"Move({self.to_code()})"
+
+
+class MoveSequence(array):
+	"""Compact sequence of moves indices: one byte per move."""
+	def __new__(cls, moves=()):
+		return super().__new__(cls, "B", moves)
+
+	@classmethod
+	def from_codes(cls, codes:list) -> "MoveSequence":
+		"""Converts legacy solving steps codes, steps which do nothing are skipped."""
+		moves = cls()
+		for code in codes:
+			move = Move.from_code(code)
+			if move is not None:
+				moves.append(move)
+
+		return moves
+
+	@classmethod
+	def from_bytes(cls, data:bytes) -> "MoveSequence":
+		moves = cls()
+		moves.frombytes(data)
+		return moves
+
+	def to_codes(self) -> list:
+		"""Converts to legacy solving steps codes."""
+		return [Move(move).to_code() for move in self]
+
+	def moves(self):
+		"""Iterates over moves as Move objects."""
+		return map(Move, self)
+
+	def __repr__(self) -> str:
+		return f"MoveSequence({self.to_codes()})"
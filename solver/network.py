@@ -1,13 +1,24 @@
+import os
 import sys
 import time
-import json
 import socket
 import threading
 
-from color_detector import rgb_to_color_name
+from color_assignment import assign_colors, check_scan
 from datatypes import RubiksCube
 from solver import Solver
-from display import Display
+from moves import Move
+from protocol import Connection
+from cache import SolutionCache
+from robot_model import get_robot_program, compress_program, expand_program
+from tables import get_cache_dir
+
+# Time for looking for shorter solution. Every saved move is about a second of robot time
+SOLVE_DEADLINE_MS = 2000
+# Program is sent by one message with macros instead of message for every move
+COMPRESS_PROGRAM = True
+# Solutions of scanned cubes, rescans and repeated cubes aren't solved again
+SOLUTIONS_CACHE_PATH = os.path.join(get_cache_dir(), "solutions.sqlite")
 
 
 def validation(rubcube:RubiksCube) -> bool:
@@ -25,29 +36,79 @@ def validation(rubcube:RubiksCube) -> bool:
 
 	return True
 
-def assemble_the_cube(solving_steps:list, conn:socket.socket, addr:tuple) -> None:
+def get_display(rubcube:RubiksCube):
+	"""
+	Returns display.Display of rubcube or None if ursina or panda3d isn't
+	installed. Display is imported only here: ursina and panda3d are slow to
+	import and need a window, so headless server and tests don't load them.
 	"""
-	Solves the Rubik's cube by solving_steps.
-	Rotates sides at display synchronously with robot.
+	try:
+		from display import Display
+	except ImportError as e:
+		# Other import errors are bugs, not a missing optional dependency
+		if e.name is None or e.name.split(".")[0] not in ("ursina", "panda3d", "direct"):
+			raise
+		print(f"[ Display isn't available: {e} ]")
+		return None
+
+	return Display(rubcube)
+
+def assemble_the_cube(
+		solving_steps:list,
+		program:list,
+		link:Connection,
+		window:int=None,
+		compress:bool=COMPRESS_PROGRAM,
+		display=None) -> None:
+	"""
+	Solves the Rubik's cube by solving_steps (moves indices).
+	Robot gets every move as its primitives program[i] separated by spaces
+	(see robot_model.get_robot_program). Moves are streamed: at most window
+	moves (all moves by default) are sent before robot acknowledges them,
+	robot runs them from its queue. If compress, the whole program is sent
+	by one message (see robot_model.compress_program) and robot
+	acknowledges its steps. Rotates sides at display (if any) when robot
+	acknowledges the moves.
 	"""
 	# Starts solving
-	conn.sendto("solving".encode(), addr)
-
-	time.sleep(1)
+	link.send("solving", len(solving_steps))
 	print("[ Starts solving! ]")
-	for i, step in enumerate(solving_steps[:]):
-		print(f"{i} / {len(solving_steps)}")
-		side_code, n, byclockwise = map(int, list(step))
-		conn.sendto(step.encode(), addr)
-		for _ in range(n):
-			time.sleep(1)
-			display.rotate_side(side_code=side_code, byclockwise=bool(byclockwise))
-
-		resp = conn.recv(1024)
-		if not resp:
+
+	# {data of acknowledgement: indices of moves}
+	pending = dict()
+	sent = done = 0
+	if compress:
+		compressed = compress_program(program)
+		seq = link.send("program", compressed)
+		for step, moves in enumerate(expand_program(compressed)):
+			pending[(seq, step)] = range(sent, sent + len(moves))
+			sent += len(moves)
+
+	window = window or len(solving_steps)
+	while done < len(solving_steps):
+		while sent < len(solving_steps) and sent - done < window:
+			pending[link.send("move", " ".join(program[sent]))] = range(sent, sent + 1)
+			sent += 1
+
+		message = link.recv()
+		if message is None:
 			# Error
 			print("[ Robot disconnected! ]")
 			return
+		if message["cmd"] != "ok":
+			continue
+
+		data = message["data"]
+		for i in pending.pop(tuple(data) if isinstance(data, list) else data):
+			done += 1
+			print(f"{done} / {len(solving_steps)}")
+			if display is None:
+				continue
+
+			side_code, n, byclockwise = Move(solving_steps[i]).to_rotation()
+			for _ in range(n):
+				display.rotate_side(side_code=side_code, byclockwise=bool(byclockwise))
+				time.sleep(display.animation_time + 0.2)
 
 	print("[ Solving finished! ]")
 
@@ -55,6 +116,11 @@ if __name__ == "__main__":
 	HOST = "10.42.0.1"
 	#HOST = "192.168.137.1"
 	PORT = 56789
+	# Solving isn't shown, ursina isn't imported
+	HEADLESS = "--headless" in sys.argv
+
+	os.makedirs(os.path.dirname(SOLUTIONS_CACHE_PATH), exist_ok=True)
+	solutions_cache = SolutionCache(path=SOLUTIONS_CACHE_PATH)
 
 	with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
 		# Creates a server at HOST and PORT
@@ -66,53 +132,76 @@ if __name__ == "__main__":
 		conn, addr = s.accept()
 		with conn:
 			print(f"[ Connected by {addr} ]")
+			link = Connection(conn)
 			# Checks test message
-			test_message = conn.recv(1024)
-			if not test_message:
+			test_message = link.recv()
+			if test_message is None or test_message["cmd"] != "hello":
 				# Error at robot side
 				print("[ Test message didn't recived ]")
 				s.close()
 				sys.exit()
 
 			print("[ Test message recived! ]")
-			conn.sendto("scan".encode(), addr)
+			link.send("scan")
 
 			# Gets raw colors (red, green blue at percents)
+			raw_colors, rereads = None, 0
+			sides = [None] * 6
 			while True:
-				raw_colors = conn.recv(1024)
-				if not raw_colors:
+				message = link.recv()
+				if message is None or message["cmd"] not in ("side", "colors", "squares"):
 					print("[ Colors didn't recived ]")
 					s.close()
 					sys.exit()
 
-				print("[ Colors recived! ]")
+				if message["cmd"] == "side":
+					side, side_colors = message["data"]
+					sides[side] = side_colors
+					if sides.count(None) == 1:
+						# The last side is predicted by the rest, solution is cached while robot scans it
+						print("[ Solving while the last side is scanned ]")
+						try:
+							Solver(RubiksCube(assign_colors(sides)[0]), cache=solutions_cache).solve(deadline_ms=SOLVE_DEADLINE_MS)
+						except ValueError as e:
+							# Assigned cube can't be solved, it's solved after the full scan
+							print(f"[ Predicted cube isn't solved: {e} ]")
+					continue
+
+				if message["cmd"] == "colors":
+					print("[ Colors recived! ]")
+					raw_colors, rereads = message["data"], 0
+					sides = [None] * 6
+				else:
+					print("[ Squares recived! ]")
+					for side, row, col, rgb in message["data"]:
+						raw_colors[side][row][col] = rgb
 
-				raw_colors = json.loads(raw_colors.decode())
-				sides_map = rgb_to_color_name(raw_colors)
+				sides_map, confidences = assign_colors(raw_colors)
 				print(sides_map)
 
-				color_counter = {'r': 0, 'o': 0, 'w': 0, 'y': 0, 'g': 0, 'b': 0}
-				for side in sides_map:
-					for row in side:
-						for cube_color in row:
-							color_counter[cube_color] += 1
+				doubtful, rescan = check_scan(confidences, rereads)
+				if doubtful:
+					rereads += 1
+					print(f"[ Rereading {len(doubtful)} squares ]")
+					link.send("reread", doubtful)
+					continue
 
-				if min(color_counter.values()) != 9 and max(color_counter.values()) != 9:
-					print(color_counter)
+				if rescan:
+					print(f"[ {int((confidences < 0).sum())} squares were misread ]")
 					print("[ Rescanning ]")
-					conn.sendto("rescan".encode(), addr)
+					link.send("rescan")
 					continue
 
 				rubcube = RubiksCube(sides_map)
-				solver = Solver(rubcube)
+				solver = Solver(rubcube, cache=solutions_cache)
 
 				try:
 					# If solver.solve() raise exception then cube was scanned incorrectly
-					solving_steps = solver.solve()
+					solving_steps = solver.solve(deadline_ms=SOLVE_DEADLINE_MS)
 				except:
 					# Cube was scanned incorrectly
 					print("[ Rescanning ]")
-					conn.sendto("rescan".encode(), addr)
+					link.send("rescan")
 					continue
 
 				if validation(solver.rubcube):
@@ -121,18 +210,27 @@ if __name__ == "__main__":
 				else:
 					# Cube was scanned incorrectly
 					print("[ Rescanning ]")
-					conn.sendto("rescan".encode(), addr)
+					link.send("rescan")
 					continue
 
+			# Robot primitives which take the least robot time
+			solving_steps, program, robot_time = get_robot_program(solving_steps)
+			print(f"[ {len(solving_steps)} moves, about {robot_time:.0f} s of robot time ]")
+
 			# sides_map = []
 			# rubcube = RubiksCube(sides_map)
 			# solver = Solver(rubcube)
 			# solving_steps = solver.solve()
 
-			display = Display(rubcube)
+			display = None if HEADLESS else get_display(rubcube)
+			if display is None:
+				assemble_the_cube(solving_steps, program, link)
+				s.close()
+				sys.exit()
 
 			# Visual assembler starts at thread
-			assembler = threading.Thread(target=assemble_the_cube, args=(solving_steps, conn, addr))
+			assembler = threading.Thread(target=assemble_the_cube, args=(solving_steps, program, link),
+										 kwargs={"display": display})
 			assembler.start()
 
 			# Launching display visualisation
@@ -0,0 +1,35 @@
+from shortcuts import counter_side
+from moves import MoveSequence
+
+
+def optimize_moves(moves) -> MoveSequence:
+	"""
+	Shortens sequence of moves indices at one pass. Rotations of the same side
+	and of the opposite side (they commute) go to one block, rotations of one
+	side at block are summed: top, bottom, top gives top twice, bottom.
+	Blocks which sum to nothing are removed, so previous block may be merged
+	with next rotations: top, right, right back, top back gives nothing.
+	"""
+	# Stack of blocks, every block is a dict {side_idx: turns by clockwise}
+	# of one axis in order of the first rotation. Neighbour blocks are of
+	# different axes.
+	blocks = list()
+	for move in moves:
+		side_idx, turns = move // 3, move % 3 + 1
+
+		if blocks and (side_idx in blocks[-1] or counter_side[side_idx] in blocks[-1]):
+			block = blocks[-1]
+			block[side_idx] = (block.get(side_idx, 0) + turns) % 4
+			if block[side_idx] == 0:
+				del block[side_idx]
+				if not block:
+					blocks.pop()
+		else:
+			blocks.append({side_idx: turns})
+
+	return MoveSequence(side_idx * 3 + turns - 1 for block in blocks for side_idx, turns in block.items())
+
+
+def optimize_steps(solving_steps:list) -> list:
+	"""optimize_moves for legacy solving steps codes "{side}{n}{byclockwise}", e.g. robot logs."""
+	return optimize_moves(MoveSequence.from_codes(solving_steps)).to_codes()
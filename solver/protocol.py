@@ -0,0 +1,78 @@
+import json
+import struct
+import socket
+
+
+# Every message is a frame: length of body (4 bytes, big-endian) and body,
+# body is JSON {"seq": sequence number of sender, "cmd": command, "data": data}.
+# The same framing is at robot/Rubik's cube solver/main.py (Link).
+# Server: "scan", "rescan", "reread" (data is [side, row, col] of squares
+# which are read again), "solving" (data is number of moves), "move" (data
+# is robot primitives of one move, see robot_model.get_robot_program) or
+# "program" (data is the whole program, see robot_model.compress_program).
+# Robot: "hello", "side" (data is [side, raw colors of the side] as soon as
+# the side is scanned), "colors" (data is raw colors), "squares" (data is
+# [side, row, col, raw color] of reread squares) and "ok" after every done
+# move (data is seq of "move" message) or step of program (data is [seq of
+# "program" message, index of step]).
+length_format = ">I"
+length_size = struct.calcsize(length_format)
+# Protection from garbage instead of length
+max_body_size = 1 << 20
+
+
+def encode_message(seq:int, cmd:str, data=None) -> bytes:
+	body = json.dumps({"seq": seq, "cmd": cmd, "data": data}).encode()
+	return struct.pack(length_format, len(body)) + body
+
+
+class MessageReader:
+	"""
+	Splits stream of bytes into messages. Frames may come in any chunks:
+	half of frame or several frames at once.
+	"""
+	def __init__(self) -> None:
+		self.buffer = bytearray()
+
+	def feed(self, data:bytes) -> list:
+		"""Returns messages (dicts) which are completed by data."""
+		self.buffer += data
+		messages = list()
+		while len(self.buffer) >= length_size:
+			length, = struct.unpack_from(length_format, self.buffer)
+			if length > max_body_size:
+				raise ValueError(f"Frame of {length} bytes is too large")
+			if len(self.buffer) < length_size + length:
+				break
+
+			body = bytes(self.buffer[length_size:length_size + length])
+			del self.buffer[:length_size + length]
+			messages.append(json.loads(body.decode()))
+
+		return messages
+
+
+class Connection:
+	"""Blocking framed connection over socket with sequence numbers of sent messages."""
+	def __init__(self, conn:socket.socket) -> None:
+		self.conn = conn
+		self.reader = MessageReader()
+		self.messages = list()
+		self.seq = 0
+
+	def send(self, cmd:str, data=None) -> int:
+		"""Returns sequence number of sent message."""
+		seq = self.seq
+		self.seq += 1
+		self.conn.sendall(encode_message(seq, cmd, data))
+		return seq
+
+	def recv(self) -> dict:
+		"""Returns next message or None if connection is closed."""
+		while not self.messages:
+			data = self.conn.recv(4096)
+			if not data:
+				return None
+			self.messages.extend(self.reader.feed(data))
+
+		return self.messages.pop(0)
@@ -0,0 +1,108 @@
+import zlib
+import struct
+import numpy as np
+
+from datatypes import FaceletCube
+
+# RGB of colors (shortcuts.colors_order) at rendered images
+colors_rgb = np.array([
+	(255, 255, 255),
+	(255, 213, 0),
+	(196, 30, 58),
+	(255, 88, 0),
+	(0, 158, 96),
+	(0, 81, 186),
+], dtype=np.uint8)
+background_rgb = (40, 40, 40)
+
+# Place (row, col) of every side at the net, in sides. The net is
+# unfolded as the cube is seen at display.Display
+net_places = {0: (0, 1), 4: (1, 0), 1: (1, 1), 2: (1, 2), 3: (1, 3), 5: (2, 1)}
+# Rotations by 90 degrees counterclockwise which bring side to the net,
+# bottom side is stored by columns at Display
+net_rotations = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: 1}
+
+
+def get_states(rubcube, moves) -> np.ndarray:
+	"""
+	Returns array (len(moves) + 1, 54): colors codes (shortcuts.colors_order)
+	of rubcube after every step of moves, state 0 is rubcube itself.
+	"""
+	rubcube = FaceletCube.from_cube(rubcube)
+	states = np.empty((len(moves) + 1, 54), dtype=np.uint8)
+	states[0] = rubcube.facelets
+	for step, move in enumerate(moves, start=1):
+		rubcube.apply_move(move)
+		states[step] = rubcube.facelets
+
+	return states
+
+
+def render_net(facelets:np.ndarray, square_size:int=12, gap:int=1) -> np.ndarray:
+	"""Image (height, width, 3) of unfolded cube with 54 colors codes facelets."""
+	side_size = 3 * square_size + 4 * gap
+	image = np.full((3 * side_size, 4 * side_size, 3), background_rgb, dtype=np.uint8)
+	sides = np.asarray(facelets).reshape(6, 3, 3)
+	for side, (place_row, place_col) in net_places.items():
+		colors = np.rot90(sides[side], net_rotations[side])
+		for row in range(3):
+			for col in range(3):
+				top = place_row * side_size + gap + row * (square_size + gap)
+				left = place_col * side_size + gap + col * (square_size + gap)
+				image[top:top + square_size, left:left + square_size] = colors_rgb[colors[row, col]]
+
+	return image
+
+
+def render_steps(states:np.ndarray, steps=None, columns:int=8, **kwargs) -> np.ndarray:
+	"""Nets of states of steps (every step by default) in rows of columns, as one image."""
+	steps = range(len(states)) if steps is None else steps
+	nets = [render_net(states[step], **kwargs) for step in steps]
+	height, width, _ = nets[0].shape
+	rows = (len(nets) + columns - 1) // columns
+	image = np.full((rows * height, min(columns, len(nets)) * width, 3), background_rgb, dtype=np.uint8)
+	for i, net in enumerate(nets):
+		row, col = divmod(i, columns)
+		image[row * height:(row + 1) * height, col * width:(col + 1) * width] = net
+
+	return image
+
+
+def encode_png(image:np.ndarray) -> bytes:
+	"""PNG of RGB image (height, width, 3) of uint8, without Pillow."""
+	height, width, _ = image.shape
+
+	def chunk(kind:bytes, data:bytes) -> bytes:
+		return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+	# Every row starts with filter type 0 (none)
+	rows = np.hstack([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, width * 3)])
+	header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+	return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+			+ chunk(b"IDAT", zlib.compress(rows.tobytes(), 9)) + chunk(b"IEND", b""))
+
+
+def save_png(path:str, image:np.ndarray) -> None:
+	with open(path, "wb") as file:
+		file.write(encode_png(image))
+
+
+def render_replay(rubcube, moves, path:str, steps=None, columns:int=8) -> None:
+	"""
+	Headless replay: saves nets of rubcube at steps of moves (every step by
+	default) to PNG at path, so solution can be checked without a window.
+	"""
+	save_png(path, render_steps(get_states(rubcube, moves), steps, columns))
+
+
+if __name__ == "__main__":
+	import random
+	from solver import Solver
+	from fake_robot import scramble
+
+	PATH = "replay.png"
+
+	rubcube = scramble(rng=random.Random(0))
+	moves = Solver(rubcube.copy()).solve("two_phase")
+	render_replay(rubcube, moves, PATH)
+	print(f"[ {len(moves)} moves are rendered to {PATH} ]")
@@ -0,0 +1,379 @@
+import copy
+import heapq
+import itertools
+from array import array
+
+from moves import MoveSequence
+from optimizer import optimize_moves
+from shortcuts import counter_side
+
+
+class RobotModel:
+	"""
+	Simulation of EV3 robot (robot/Rubik's cube solver/main.py) to predict
+	its time. Methods repeat the ones of Robot and change side_codes_seq the
+	same way. Every motor command takes motor_overhead seconds (acceleration
+	and braking) and angle / speed seconds, speeds are the ones of Robot.
+	self.time is predicted time since the start in seconds,
+	self.primitives is the log of motor commands (name, angle).
+	"""
+	def __init__(
+			self,
+			platform_speed:float=180 / 12 * 40,
+			hand_speed:float=330,
+			motor_overhead:float=0.1,
+			move_overhead:float=0.05) -> None:
+		self.platform_speed = platform_speed
+		self.hand_speed = hand_speed
+		self.motor_overhead = motor_overhead
+		# Time of sending one move to robot and getting "ok"
+		self.move_overhead = move_overhead
+
+		# 0 - Top, 1 - front, 2 - left, 3 - back, 4 - right, 5 - bottom
+		self.side_codes_seq = [0, 1, 2, 3, 4, 5]
+		self.hand_angle = 0
+		self.time = 0.0
+		self.primitives = list()
+
+	@classmethod
+	def after_scan(cls, **timings) -> "RobotModel":
+		"""Robot which has scanned the cube (Robot.scan_cube and then the rest of "scan" command)."""
+		robot = cls(**timings)
+		robot.hand_rotate(1, hand_raised=True)
+		robot.rotate_platform(1)
+		robot.hand_rotate(1, hand_raised=True)
+		robot.hand_rotate(1, hand_raised=True)
+		robot.hand_rotate(1, hand_raised=True)
+		robot.rotate_platform(1, byclockwise=False)
+		robot.hand_rotate(1, hand_raised=True)
+		robot.hand_rotate(2, hand_raised=True)
+		robot.rotate_platform(1)
+
+		robot.time = 0.0
+		robot.primitives.clear()
+		return robot
+
+	def copy(self) -> "RobotModel":
+		robot = copy.copy(self)
+		robot.side_codes_seq = self.side_codes_seq.copy()
+		robot.primitives = self.primitives.copy()
+		return robot
+
+	def get_state(self) -> tuple:
+		"""Everything which changes time of next moves."""
+		return tuple(self.side_codes_seq), self.hand_angle
+
+	def run_platform(self, angle:float) -> None:
+		self.time += self.motor_overhead + abs(angle) / self.platform_speed
+		self.primitives.append(("platform", angle))
+
+	def run_hand(self, target_angle:float) -> None:
+		if target_angle == self.hand_angle:
+			return
+
+		self.time += self.motor_overhead + abs(target_angle - self.hand_angle) / self.hand_speed
+		self.primitives.append(("hand", target_angle))
+		self.hand_angle = target_angle
+
+	def rotate_platform(self, n:int, byclockwise:bool=True, side_control:bool=True) -> None:
+		"""Robot.rotate_platform with rot_optim."""
+		n %= 4
+		if n == 0:
+			return
+		elif n > 2:
+			n = 1
+			byclockwise = not byclockwise
+
+		n *= 1 if byclockwise else -1
+		self.run_platform(n * 270)
+
+		if side_control:
+			scs = self.side_codes_seq
+			scs[1], scs[2], scs[3], scs[4] = scs[(1+n-1)%4+1], scs[(2+n-1)%4+1], scs[(3+n-1)%4+1], scs[(4+n-1)%4+1]
+
+	def hand_rotate(self, n:int, hand_raised:bool=False) -> None:
+		n %= 4
+		for t in range(n):
+			self.run_hand(200)
+			if t < n - 1:
+				self.run_hand(90)
+			scs = self.side_codes_seq
+			scs[0], scs[1], scs[5], scs[3] = scs[1], scs[5], scs[3], scs[0]
+
+		if hand_raised:
+			self.run_hand(10)
+
+	def rotate_current_side(self, n:int=1, byclockwise:bool=True, hand_raised:bool=True) -> None:
+		n %= 4
+		byclockwise = not byclockwise
+		if n == 3:
+			n = 1
+			byclockwise = not byclockwise
+
+		if n > 0:
+			self.run_hand(90)
+			self.rotate_platform(n, byclockwise, side_control=False)
+			if hand_raised:
+				self.run_hand(10)
+
+	def flip(self) -> None:
+		"""Robot.flip: hand_rotate(1) from any hand position."""
+		if self.hand_angle == 200:
+			self.run_hand(90)
+		self.hand_rotate(1)
+
+	def spin(self, n:int) -> None:
+		"""Robot.spin: rotates the whole cube by platform."""
+		self.run_hand(10)
+		self.rotate_platform(n)
+
+	def apply_primitive(self, code:str) -> None:
+		"""
+		Primitive command of robot program (see get_robot_program):
+		"F" - flip, "P{n}" - spin, "T{n}" - rotate bottom side n times by
+		clockwise, hand stays on the cube.
+		"""
+		if code == "F":
+			self.flip()
+		elif code[0] == "P":
+			self.spin(int(code[1]))
+		elif code[0] == "T":
+			self.rotate_current_side(int(code[1]), hand_raised=False)
+		else:
+			raise ValueError(f"Unknown robot primitive '{code}'")
+
+
+# Primitives which reorient the cube
+reorienting_primitives = ["F", "P1", "P2", "P3"]
+
+
+def get_axis_blocks(moves) -> list:
+	"""
+	Splits moves into blocks of neighbour moves of one axis (rotations of
+	opposite sides commute). After optimize_moves every block has at most two moves.
+	"""
+	blocks = list()
+	for move in moves:
+		side_idx = move // 3
+		if blocks and blocks[-1][-1] // 3 in (side_idx, counter_side[side_idx]):
+			blocks[-1].append(move)
+		else:
+			blocks.append([move])
+
+	return blocks
+
+
+def search_move_programs(paths:dict, move:int) -> dict:
+	"""
+	Step of get_robot_program. paths is {state: (robot, moves, program)}.
+	Dijkstra's search by reorienting primitives from all paths together,
+	then bottom side is rotated at every state where it's the side of move.
+	"""
+	side_idx, turns = move // 3, move % 3 + 1
+	# {state: (robot, moves, program, primitives of move)}
+	reached = {state: (robot, moves, program, []) for state, (robot, moves, program) in paths.items()}
+	counter = itertools.count()
+	heap = [(robot.time, next(counter), state) for state, (robot, _, _) in paths.items()]
+	heapq.heapify(heap)
+	visited = set()
+
+	next_paths = dict()
+	while heap:
+		_, _, state = heapq.heappop(heap)
+		if state in visited:
+			continue
+		visited.add(state)
+
+		robot, moves, program, primitives = reached[state]
+		if robot.side_codes_seq[5] == side_idx:
+			next_robot = robot.copy()
+			next_robot.time += next_robot.move_overhead
+			next_robot.rotate_current_side(turns, hand_raised=False)
+			next_state = next_robot.get_state()
+			if next_state not in next_paths or next_robot.time < next_paths[next_state][0].time:
+				next_paths[next_state] = (next_robot, moves + array("B", [move]), program + [primitives + [f"T{turns}"]])
+
+		for code in reorienting_primitives:
+			next_robot = robot.copy()
+			next_robot.apply_primitive(code)
+			next_state = next_robot.get_state()
+			if next_state not in visited and (next_state not in reached or next_robot.time < reached[next_state][0].time):
+				reached[next_state] = (next_robot, moves, program, primitives + [code])
+				heapq.heappush(heap, (next_robot.time, next(counter), next_state))
+
+	return next_paths
+
+
+def get_robot_program(moves, robot:RobotModel=None) -> tuple:
+	"""
+	Returns (moves, program, time): moves are equivalent to
+	optimize_moves(moves), program[i] is list of robot primitives (see
+	RobotModel.apply_primitive) which make moves[i], the last one of them
+	rotates the bottom side. The program takes the least predicted robot
+	time (time) out of every order of commuting moves and every way to
+	reorient the cube by flips and spins, so cube isn't reoriented blindly
+	as Robot.target_to_current does.
+	"""
+	robot = robot or RobotModel.after_scan()
+	# {state: (robot, moves, program)}, robot has the least time for the state
+	paths = {robot.get_state(): (robot, array("B"), [])}
+	for block in get_axis_blocks(optimize_moves(moves)):
+		next_paths = dict()
+		for order in itertools.permutations(block):
+			order_paths = paths
+			for move in order:
+				order_paths = search_move_programs(order_paths, move)
+
+			for state, path in order_paths.items():
+				if state not in next_paths or path[0].time < next_paths[state][0].time:
+					next_paths[state] = path
+		paths = next_paths
+
+	robot, moves, program = min(paths.values(), key=lambda path: path[0].time)
+	return MoveSequence(moves), program, robot.time
+
+
+def get_pairs_counts(items:list) -> dict:
+	"""Number of non-overlapping occurrences of every pair of neighbouring items."""
+	counts = dict()
+	last = dict()
+	for i in range(len(items) - 1):
+		pair = (items[i], items[i + 1])
+		if last.get(pair, -2) < i - 1:
+			counts[pair] = counts.get(pair, 0) + 1
+			last[pair] = i
+
+	return counts
+
+
+def run_length(items:list) -> list:
+	"""Neighbouring equal items as [item, n]."""
+	encoded = list()
+	for item in items:
+		if encoded and encoded[-1][0] == item:
+			encoded[-1][1] += 1
+		else:
+			encoded.append([item, 1])
+
+	return [item if n == 1 else [item, n] for item, n in encoded]
+
+
+def compress_program(program:list, moves_per_ack:int=10) -> dict:
+	"""
+	Returns program of get_robot_program as data of "program" message:
+	{"macros": [...], "steps": [...]}. Every macro and step is a list of
+	items, item is a move (its primitives separated by spaces), index of
+	a macro or [item, n] - item repeated n times. Macros are found by
+	Re-Pair: the most frequent pair of neighbouring items becomes a macro
+	until every pair is unique, so sequences of moves which are repeated
+	(like pif-paf of layers method, wherever it's done) are sent once.
+	Robot acknowledges every step, steps have at most moves_per_ack moves
+	(items which are longer are split into their parts).
+	"""
+	items = [" ".join(codes) for codes in program]
+	# Pairs of items, index of pair is its symbol
+	rules = list()
+	while True:
+		counts = get_pairs_counts(items)
+		if not counts or max(counts.values()) < 2:
+			break
+
+		pair = max(counts, key=counts.get)
+		symbol = len(rules)
+		rules.append(list(pair))
+		replaced = list()
+		i = 0
+		while i < len(items):
+			if i + 1 < len(items) and (items[i], items[i + 1]) == pair:
+				replaced.append(symbol)
+				i += 2
+			else:
+				replaced.append(items[i])
+				i += 1
+		items = replaced
+
+	# Rules which are used once are put into their place
+	uses = [0] * len(rules)
+	for item in items + [item for rule in rules for item in rule]:
+		if isinstance(item, int):
+			uses[item] += 1
+
+	def inline(items:list) -> list:
+		inlined = list()
+		for item in items:
+			if isinstance(item, int) and uses[item] == 1:
+				inlined.extend(inline(rules[item]))
+			else:
+				inlined.append(item)
+		return inlined
+
+	# Macros are numbered in order of the first use
+	numbers = dict()
+	def renumber(items:list) -> list:
+		renumbered = list()
+		for item in inline(items):
+			if isinstance(item, int):
+				if item not in numbers:
+					numbers[item] = len(numbers)
+					renumber(rules[item])
+				item = numbers[item]
+			renumbered.append(item)
+		return renumbered
+
+	items = run_length(renumber(items))
+	macros = [None] * len(numbers)
+	for symbol, number in numbers.items():
+		macros[number] = run_length(renumber(rules[symbol]))
+
+	steps = list()
+	n_moves = 0
+	stack = items[::-1]
+	while stack:
+		item = stack.pop()
+		size = len(expand_item(item, macros))
+		if size > moves_per_ack:
+			stack.extend(split_item(item, macros, moves_per_ack)[::-1])
+			continue
+
+		if not steps or n_moves + size > moves_per_ack:
+			steps.append(list())
+			n_moves = 0
+		steps[-1].append(item)
+		n_moves += size
+
+	return {"macros": macros, "steps": steps}
+
+
+def split_item(item, macros:list, max_moves:int) -> list:
+	"""
+	Parts of item of compress_program which is longer than max_moves:
+	items of macro or repetitions of item, as many at once as fit max_moves.
+	"""
+	if isinstance(item, int):
+		return macros[item]
+
+	item, n = item
+	per_part = max(1, max_moves // len(expand_item(item, macros)))
+	parts = list()
+	while n > 0:
+		k = min(per_part, n)
+		parts.append(item if k == 1 else [item, k])
+		n -= k
+
+	return parts
+
+
+def expand_item(item, macros:list) -> list:
+	"""Moves (primitives separated by spaces) of item of compress_program."""
+	if isinstance(item, str):
+		return [item]
+	if isinstance(item, int):
+		return [move for macro_item in macros[item] for move in expand_item(macro_item, macros)]
+
+	item, n = item
+	return expand_item(item, macros) * n
+
+
+def expand_program(compressed:dict) -> list:
+	"""Moves of every step of compress_program."""
+	return [[move for item in step for move in expand_item(item, compressed["macros"])] for step in compressed["steps"]]
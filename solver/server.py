@@ -0,0 +1,332 @@
+import os
+import signal
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from color_assignment import assign_colors, check_scan
+from datatypes import FaceletCube
+from solver import Solver
+from two_phase import Tables
+from cache import SolutionCache
+from robot_model import get_robot_program, compress_program
+from protocol import encode_message, MessageReader
+from tables import get_cache_dir
+
+HOST = "10.42.0.1"
+PORT = 56789
+# Time for looking for shorter solution. Every saved move is about a second of robot time
+SOLVE_DEADLINE_MS = 2000
+SOLUTIONS_CACHE_PATH = os.path.join(get_cache_dir(), "solutions.sqlite")
+# Program is sent by one message with macros instead of message for every move
+COMPRESS_PROGRAM = True
+
+
+def is_solved(rubcube:FaceletCube) -> bool:
+	sides = rubcube.facelets.reshape(6, 9)
+	return bool((sides == sides[:, 4:5]).all())
+
+
+def warm_up() -> None:
+	"""Runs at process pool to import solver and load its tables before robots come."""
+	Tables.get()
+
+
+def plan_solution(sides_map:list, deadline_ms:float, moves=None) -> tuple:
+	"""
+	Runs at process pool. Solves the cube (if moves aren't known yet) and
+	plans robot program. Returns (moves, program, robot_time) of
+	robot_model.get_robot_program. Raises ValueError if cube was scanned incorrectly.
+	"""
+	rubcube = FaceletCube(sides_map)
+	if moves is None:
+		try:
+			moves = Solver(rubcube).solve(deadline_ms=deadline_ms)
+		except Exception as e:
+			raise ValueError(f"Cube can't be solved: {e}") from e
+
+	solved = rubcube.copy()
+	for move in moves:
+		solved.apply_move(move)
+	if not is_solved(solved):
+		raise ValueError("Cube can't be solved")
+
+	return get_robot_program(moves)
+
+
+class RobotSession:
+	"""
+	One robot connection, the protocol (see protocol.py) goes through:
+	waiting for "hello" of robot; scanning: "scan", "rescan" or "reread" is
+	sent, waits for colors, the cube is solved while the last side is
+	scanned (see speculate); solving: moves are streamed (or sent as one
+	compressed program), waits for acknowledgements.
+	"""
+	def __init__(self, server:"SolverServer", reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+		self.server = server
+		self.reader = reader
+		self.writer = writer
+		self.addr = writer.get_extra_info("peername")
+		self.messages = MessageReader()
+		self.received = list()
+		self.seq = 0
+		# (predicted sides_map, task of SolverServer.solve)
+		self.speculation = None
+
+	async def send(self, cmd:str, data=None) -> int:
+		"""Returns sequence number of sent message."""
+		seq = self.seq
+		self.seq += 1
+		self.writer.write(encode_message(seq, cmd, data))
+		await self.writer.drain()
+		return seq
+
+	async def recv(self) -> dict:
+		"""Returns next message or None if connection is closed."""
+		while not self.received:
+			data = await self.reader.read(4096)
+			if not data:
+				return None
+			self.received.extend(self.messages.feed(data))
+
+		return self.received.pop(0)
+
+	async def read_colors(self) -> list:
+		"""
+		Waits for colors of scan, rereads doubtful squares (see
+		color_assignment.assign_colors) and rescans the cube if too many
+		squares are misread. Returns sides_map or None if connection is closed.
+		"""
+		raw_colors, rereads = None, 0
+		sides = [None] * 6
+		while True:
+			message = await self.recv()
+			if message is None:
+				return None
+
+			if message["cmd"] == "side":
+				side, side_colors = message["data"]
+				sides[side] = side_colors
+				if sides.count(None) == 1:
+					self.speculate(sides)
+				continue
+
+			if message["cmd"] == "colors":
+				raw_colors, rereads = message["data"], 0
+				sides = [None] * 6
+			elif message["cmd"] == "squares" and raw_colors is not None:
+				for side, row, col, rgb in message["data"]:
+					raw_colors[side][row][col] = rgb
+			else:
+				continue
+
+			sides_map, confidences = assign_colors(raw_colors)
+			doubtful, rescan = check_scan(confidences, rereads)
+			if doubtful:
+				rereads += 1
+				print(f"[ {self.addr}: Rereading {len(doubtful)} squares ]")
+				await self.send("reread", doubtful)
+			elif rescan:
+				print(f"[ {self.addr}: Rescanning ]")
+				await self.send("rescan")
+			else:
+				return sides_map
+
+	def speculate(self, sides:list) -> None:
+		"""
+		Starts solving of the cube when all sides but one are scanned, the
+		last side is predicted by the rest (usually it's the only possible one).
+		Nothing is started if the sides can't be assigned or every worker of
+		the pool is busy: cancelled solving still takes its worker.
+		"""
+		self.cancel_speculation()
+		if self.server.is_busy():
+			return
+
+		try:
+			sides_map, _ = assign_colors(sides)
+		except ValueError as e:
+			print(f"[ {self.addr}: Sides can't be assigned yet: {e} ]")
+			return
+
+		self.speculation = (sides_map, asyncio.ensure_future(self.server.solve(sides_map)))
+
+	def cancel_speculation(self) -> None:
+		if self.speculation is not None:
+			self.speculation[1].cancel()
+			self.speculation = None
+
+	async def solve(self, sides_map:list) -> tuple:
+		"""SolverServer.solve, but solution of speculate is used if the cube was predicted right."""
+		if self.speculation is not None and self.speculation[0] == sides_map:
+			print(f"[ {self.addr}: Cube was solved while scanning ]")
+			return await self.speculation[1]
+
+		self.cancel_speculation()
+		return await self.server.solve(sides_map)
+
+	async def run(self) -> None:
+		message = await self.recv()
+		if message is None or message["cmd"] != "hello":
+			print(f"[ {self.addr}: Test message didn't recived ]")
+			return
+
+		await self.send("scan")
+		solution = None
+		while solution is None:
+			sides_map = await self.read_colors()
+			if sides_map is None:
+				print(f"[ {self.addr}: Colors didn't recived ]")
+				return
+
+			solution = await self.solve(sides_map)
+			if solution is None:
+				print(f"[ {self.addr}: Rescanning ]")
+				await self.send("rescan")
+
+		moves, program, robot_time = solution
+		print(f"[ {self.addr}: {len(moves)} moves, about {robot_time:.0f} s of robot time ]")
+		await self.send("solving", len(moves))
+		if self.server.compress:
+			# Robot expands macros itself and acknowledges steps
+			compressed = compress_program(program)
+			await self.send("program", compressed)
+			n_acks = len(compressed["steps"])
+		else:
+			# The whole program is streamed, robot runs it from its queue
+			for codes in program:
+				await self.send("move", " ".join(codes))
+			n_acks = len(program)
+
+		done = 0
+		while done < n_acks:
+			message = await self.recv()
+			if message is None:
+				print(f"[ {self.addr}: Robot disconnected! ]")
+				return
+			if message["cmd"] == "ok":
+				done += 1
+
+		print(f"[ {self.addr}: Solving finished! ]")
+
+
+class SolverServer:
+	"""
+	Asyncio server of many robots at once. Every connection is RobotSession,
+	cubes are solved at process pool, so slow solving doesn't stop
+	communication with other robots. Solutions are cached by cache.SolutionCache.
+	"""
+	def __init__(
+			self,
+			host:str=HOST,
+			port:int=PORT,
+			deadline_ms:float=SOLVE_DEADLINE_MS,
+			cache:SolutionCache=None,
+			max_workers:int=None,
+			compress:bool=COMPRESS_PROGRAM) -> None:
+		self.host = host
+		self.port = port
+		self.deadline_ms = deadline_ms
+		self.cache = cache if cache is not None else SolutionCache()
+		self.max_workers = max_workers
+		self.compress = compress
+		self.pool = None
+		self.workers = None
+		# Jobs of the pool which aren't done, cancelled solving may still run
+		self.jobs = set()
+		self.server = None
+		self.sessions = set()
+		self.stopping = None
+
+	async def start(self) -> None:
+		# Forked workers would keep sockets of robots open after sessions end
+		self.pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+		loop = asyncio.get_running_loop()
+		self.workers = self.max_workers or os.cpu_count() or 1
+		await asyncio.gather(*(loop.run_in_executor(self.pool, warm_up) for _ in range(self.workers)))
+
+		self.stopping = asyncio.Event()
+		self.server = await asyncio.start_server(self.handle, self.host, self.port)
+		self.port = self.server.sockets[0].getsockname()[1]
+		print(f"[ Server started at host:{self.host}, port:{self.port} ]")
+
+	async def handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+		session = RobotSession(self, reader, writer)
+		task = asyncio.current_task()
+		self.sessions.add(task)
+		print(f"[ Connected by {session.addr} ]")
+		try:
+			await session.run()
+		except (ConnectionError, ValueError) as e:
+			print(f"[ {session.addr}: {e} ]")
+		except asyncio.CancelledError:
+			# Server is shutting down
+			print(f"[ {session.addr}: Disconnected by server ]")
+		finally:
+			session.cancel_speculation()
+			self.sessions.discard(task)
+			writer.close()
+			try:
+				await writer.wait_closed()
+			except ConnectionError:
+				pass
+
+	async def solve(self, sides_map:list) -> tuple:
+		"""
+		Returns (moves, program, robot_time) for scanned cube or None if
+		cube was scanned incorrectly.
+		"""
+		rubcube = FaceletCube(sides_map)
+		moves = self.cache.get(rubcube, "anytime")
+		job = self.pool.submit(plan_solution, sides_map, self.deadline_ms, moves)
+		self.jobs.add(job)
+		job.add_done_callback(self.jobs.discard)
+		try:
+			solution = await asyncio.wrap_future(job)
+		except ValueError:
+			return None
+
+		if moves is None:
+			self.cache.put(rubcube, solution[0], "anytime")
+		return solution
+
+	def is_busy(self) -> bool:
+		"""Every worker of the pool has a job."""
+		return len(self.jobs) >= self.workers
+
+	async def shutdown(self, timeout:float=10.0) -> None:
+		"""Stops accepting robots, waits timeout seconds for sessions and cancels the rest."""
+		self.server.close()
+		if self.sessions:
+			print(f"[ Waiting for {len(self.sessions)} robots ]")
+			_, pending = await asyncio.wait(set(self.sessions), timeout=timeout)
+			for task in pending:
+				task.cancel()
+			await asyncio.gather(*pending, return_exceptions=True)
+
+		await self.server.wait_closed()
+		self.pool.shutdown(wait=True, cancel_futures=True)
+		print("[ Server stopped ]")
+
+	def stop(self) -> None:
+		"""Makes serve_forever shut down, may be called by signal."""
+		self.stopping.set()
+
+	async def serve_forever(self, shutdown_timeout:float=10.0) -> None:
+		await self.start()
+		loop = asyncio.get_running_loop()
+		for sig in (signal.SIGINT, signal.SIGTERM):
+			try:
+				loop.add_signal_handler(sig, self.stop)
+			except NotImplementedError:
+				# Windows
+				pass
+
+		await self.stopping.wait()
+		await self.shutdown(shutdown_timeout)
+
+
+if __name__ == "__main__":
+	os.makedirs(os.path.dirname(SOLUTIONS_CACHE_PATH), exist_ok=True)
+	server = SolverServer(cache=SolutionCache(path=SOLUTIONS_CACHE_PATH))
+	asyncio.run(server.serve_forever())
@@ -13,6 +13,18 @@ colors_shortcuts = {
 	"yellow" : "y",
 }
 
+# Order of colors at compact (uint8) cube representation
+colors_order = ["w", "y", "r", "o", "g", "b"]
+
+colors_codes = {
+	"w": 0,
+	"y": 1,
+	"r": 2,
+	"o": 3,
+	"g": 4,
+	"b": 5,
+}
+
 adjacent_sides_colors = {
 	"w": ["r", "b", "o", "g"],
 	"r": ["y", "b", "w", "g"],
@@ -1,19 +1,60 @@
+import os
 import copy
+import time
+import itertools
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
-from datatypes import RubiksCube
+from datatypes import RubiksCube, FaceletCube, orientations, get_move_idx
+from two_phase import TwoPhaseSolver
+from optimizer import optimize_moves
+from moves import MoveSequence
 from shortcuts import (adjacent_sides_colors, sides_codes,
 					   counter_side, adjacent_sides_codes)
 
 
-side_idx_by_best_side = {
-	0: {0: 0, 1: 1, 2: 2, 3: 3, 4: 4, 5: 5},
-	1: {0: 1, 1: 5, 2: 2, 3: 0, 4: 4, 5: 3},
-	2: {0: 2, 1: 5, 2: 3, 3: 0, 4: 1, 5: 4},
-	3: {0: 3, 1: 5, 2: 4, 3: 0, 4: 2, 5: 1},
-	4: {0: 4, 1: 5, 2: 1, 3: 0, 4: 3, 5: 2},
-	5: {0: 5, 1: 1, 2: 4, 3: 3, 4: 2, 5: 0},
-}
+# Pool for parallel solving, created on the first use
+process_pool = None
+# Methods of Solver which solve the cube layer by layer, in order
+layers_phases = (
+	"color_to_code_init",
+	"solve_0_layer_crosspiece",
+	"solve_0_layer_corners",
+	"solve_1_layer_corners",
+	"solve_2_layer_crosspiece",
+	"solve_2_layer_corners",
+	"optim_solving_steps",
+)
+# Orientation (datatypes.orientations) of layer by layer solving if the
+# other ones aren't tried: bottom side is the main one
+default_orientation_idx = 5
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+	global process_pool
+	if process_pool is None:
+		process_pool = ProcessPoolExecutor()
+
+	return process_pool
+
+
+def solve_layers(facelets:np.ndarray, orientation_idx:int, timings:dict=None) -> MoveSequence:
+	"""
+	Solves the cube with facelets (FaceletCube.facelets) rotated by
+	orientations[orientation_idx] layer by layer. Returns optimized moves
+	with sides codes of not rotated cube. If timings is given, seconds of
+	every phase (layers_phases) are added to it.
+	"""
+	permutation, rotated_sides = orientations[orientation_idx]
+	solver = Solver(FaceletCube.from_facelets(facelets[permutation]))
+	# Coding of colors, solving and optimization
+	for phase in layers_phases:
+		start = time.perf_counter()
+		getattr(solver, phase)()
+		if timings is not None:
+			timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+	return MoveSequence(rotated_sides[move // 3] * 3 + move % 3 for move in solver.solving_steps)
 
 
 class Solver:
@@ -23,14 +64,18 @@ class Solver:
 		0 - Top, 1 - front, 2 - left, 3 - back, 4 - right, 5 - bottom.
 	- 
 	"""
-	def __init__(self, rubcube:RubiksCube) -> None:
-		"""Initialize the main params to solving"""
+	def __init__(self, rubcube:RubiksCube, cache=None) -> None:
+		"""
+		Initialize the main params to solving.
+		cache is cache.SolutionCache which is looked up by self.solve.
+		"""
 		self.rubcube = copy.deepcopy(rubcube)
+		self.cache = cache
 		# Color to code coding
 		self.color_to_code = dict()
-		# Contains rotations codes which is a triplets 012 where (0) is code of side,
-		# (1) is number of spins, (2) is directon (by/counter clock wise)
-		self.solving_steps = list()
+		# Contains moves indices (see moves.Move): side_idx * 3 + n - 1
+		# where n is number of rotations by clockwise
+		self.solving_steps = MoveSequence()
 
 	def color_to_code_init(self) -> None:
 		"""Code colors to codes and writes this pairs to self.color_to_code"""
@@ -42,51 +87,131 @@ class Solver:
 	def rotate_side(self, side_idx:int, n:int, byclockwise:bool=True) -> None:
 		"""
 		Rotate self.rubcube side with side_idx n times byclockwise.
-		Add rotation code to self.solving_steps
+		Add move index to self.solving_steps
 		"""
-		n %= 4
+		move_idx = get_move_idx(side_idx, n, byclockwise)
+		if move_idx < 0:
+			return
 
-		if n == 3:
-			n = 1
-			byclockwise = not byclockwise
+		self.solving_steps.append(move_idx)
+		self.rubcube.apply_move(move_idx)
 
-		self.solving_steps.append(f"{side_idx}{n}{int(byclockwise)}")
-		self.rubcube.rotate_side(side_idx=side_idx, n=n, byclockwise=byclockwise)
+	def solve(
+			self,
+			method:str="layers",
+			deadline_ms:float=None,
+			parallel:bool=False,
+			all_orientations:bool=False,
+			all_sides:bool=False) -> MoveSequence:
+		"""
+		Returns moves (see moves.Move) which solve the cube by method:
+		- "layers" - layer by layer with bottom side as the main one. With
+		  all_sides the shortest of six solutions is looked for, each of six
+		  sides may be main one, with all_orientations every of 24 whole cube
+		  rotations is tried. If parallel, solutions are searched at the
+		  process pool;
+		- "two_phase" - Kociemba's two-phase algorithm, about 20 moves.
+		If deadline_ms is given, method is ignored: returns the shortest
+		solution of self.iter_solutions(deadline_ms).
+		If self.cache has solution of the same (up to whole cube rotation and
+		colors) cube found by the same method, it's returned without solving.
+		"""
+		if self.cache is None:
+			return self.solve_without_cache(method, deadline_ms, parallel, all_orientations, all_sides)
+
+		if deadline_ms is not None:
+			tag = "anytime"
+		elif method == "layers" and all_orientations:
+			tag = f"{method}_all"
+		elif method == "layers" and all_sides:
+			tag = f"{method}_sides"
+		else:
+			tag = method
+
+		solving_steps = self.cache.get(self.rubcube, tag)
+		if solving_steps is not None:
+			self.solving_steps = solving_steps
+			for move in self.solving_steps:
+				self.rubcube.apply_move(move)
+			return self.solving_steps
+
+		rubcube = FaceletCube.from_cube(self.rubcube)
+		solving_steps = self.solve_without_cache(method, deadline_ms, parallel, all_orientations, all_sides)
+		self.cache.put(rubcube, solving_steps, tag)
+		return solving_steps
+
+	def solve_without_cache(
+			self,
+			method:str="layers",
+			deadline_ms:float=None,
+			parallel:bool=False,
+			all_orientations:bool=False,
+			all_sides:bool=False) -> MoveSequence:
+		"""self.solve without looking up self.cache."""
+		if deadline_ms is not None:
+			for solving_steps in self.iter_solutions(deadline_ms=deadline_ms):
+				pass
+			return solving_steps
+
+		if method == "two_phase":
+			return self.solve_two_phase()
+		elif method != "layers":
+			raise ValueError(f"method argument must be 'layers' or 'two_phase' but not '{method}'")
+
+		facelets = FaceletCube.from_cube(self.rubcube).facelets
+		if all_orientations:
+			orientations_idx = range(len(orientations))
+		elif all_sides:
+			orientations_idx = range(6)
+		else:
+			orientations_idx = [default_orientation_idx]
+		if parallel:
+			# One chunk of orientations per worker
+			chunksize = -(-len(orientations_idx) // (os.cpu_count() or 1))
+			solutions = get_process_pool().map(solve_layers, itertools.repeat(facelets), orientations_idx, chunksize=chunksize)
+		else:
+			solutions = map(solve_layers, itertools.repeat(facelets), orientations_idx)
+
+		# The first shortest solution
+		self.solving_steps = min(solutions, key=len)
+		for move in self.solving_steps:
+			self.rubcube.apply_move(move)
+
+		return self.solving_steps
 
-	def solve(self) -> list:
+	def iter_solutions(self, deadline_ms:float=None):
 		"""
-		Looking for the optimal solution out of six possible solutions.
-		Each of six sides may be main one
+		Anytime solving: generator of moves, every next solution is
+		shorter. The first one is layer by layer solution which is ready in a
+		few milliseconds, next ones are found by two-phase algorithm until
+		deadline_ms milliseconds since the call are over (by default the
+		timeout of TwoPhaseSolver.solve). self.rubcube and self.solving_steps
+		are the ones of the last yielded solution.
 		"""
+		if deadline_ms is None:
+			deadline_ms = TwoPhaseSolver.default_timeout * 1000
+		deadline = time.perf_counter() + deadline_ms / 1000
 		rubcube = copy.deepcopy(self.rubcube)
 
-		best_side = -1
-		best_solving_steps = list()
+		best_solving_steps = self.solve(method="layers")
+		yield best_solving_steps
 
-		for main_side_idx in range(5, 6):
-			# Clean solving steps
-			self.solving_steps = list()
-			# Cloning main rubcube
+		two_phase_solver = TwoPhaseSolver(rubcube)
+		for moves in two_phase_solver.iter_solutions(deadline=deadline, max_length=len(best_solving_steps)):
 			self.rubcube = copy.deepcopy(rubcube)
-			self.rubcube.rotate_all_cube(target_side_idx=main_side_idx)
-			# Code the colors and get main_color (color of top central cube)
-			self.color_to_code_init()
-			# Solving
-			self.solve_0_layer_crosspiece()
-			self.solve_0_layer_corners()
-			self.solve_1_layer_corners()
-			self.solve_2_layer_crosspiece()
-			self.solve_2_layer_corners()
-			# Optimization
-			self.optim_solving_steps()
-
-			# Is best this solving way?
-			if len(best_solving_steps) > len(self.solving_steps) or not best_solving_steps:
-				best_side = main_side_idx
-				best_solving_steps = self.solving_steps
-
-		best_solving_steps = list(map(lambda s: f"{side_idx_by_best_side[best_side][int(s[0])]}{s[1]}{s[2]}", best_solving_steps))
-		return best_solving_steps
+			for move in moves:
+				self.rubcube.apply_move(move)
+
+			self.solving_steps = best_solving_steps = moves
+			yield best_solving_steps
+
+	def solve_two_phase(self) -> MoveSequence:
+		"""Solves the cube by two_phase.TwoPhaseSolver."""
+		self.solving_steps = TwoPhaseSolver(self.rubcube).solve()
+		for move in self.solving_steps:
+			self.rubcube.apply_move(move)
+
+		return self.solving_steps
 
 	def solve_0_layer_crosspiece(self) -> None:
 		"""Solves the crosspiece of the top layer."""
@@ -680,43 +805,5 @@ class Solver:
 		return best_side['side_idx']
 
 	def optim_solving_steps(self):
-		step_idx = 0
-		while step_idx < len(self.solving_steps):
-			step = self.solving_steps[step_idx]
-
-			if len(self.solving_steps) == step_idx + 1:
-				next_step = None
-			else:
-				next_step = self.solving_steps[step_idx + 1]
-
-			if step[1] == "0":
-				self.solving_steps = self.solving_steps[:step_idx] + self.solving_steps[step_idx + 1:]
-				step_idx -= 1 if step_idx > 0 else 0
-
-			elif step[1] == "3":
-				self.solving_steps = self.solving_steps[:step_idx] + \
-									 [f"{step[0]}1{int(not int(step[2]))}"] + \
-									 self.solving_steps[step_idx + 1:]
-
-				step_idx -= 1 if step_idx > 0 else 0
-
-			elif next_step and step[0] == next_step[0]:
-				n1 = int(step[1]) * (-1 if step[2] == "1" else 1)
-				n2 = int(next_step[1]) * (-1 if next_step[2] == "1" else 1)
-				n = n1 + n2
-
-				if n == 0:
-					self.solving_steps = self.solving_steps[:step_idx] + self.solving_steps[step_idx + 2:]
-
-				else:
-					byclockwise = "0" if n > 0 else "1"
-					n = abs(n)
-
-					self.solving_steps = self.solving_steps[:step_idx] + \
-										 [f"{step[0]}{n}{byclockwise}"] + \
-										 self.solving_steps[step_idx + 2:]
-
-				step_idx -= 1 if step_idx > 0 else 0
-
-			else:
-				step_idx += 1
+		"""Shortens self.solving_steps by optimizer.optimize_moves."""
+		self.solving_steps = optimize_moves(self.solving_steps)
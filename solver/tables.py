@@ -0,0 +1,104 @@
+import os
+import zlib
+import struct
+import tempfile
+import numpy as np
+
+
+# Header of table file (64 bytes), then raw C-ordered data:
+# magic, format version, dtype, number of dimensions, shape (up to 4 dims),
+# crc32 of the key of the builder and crc32 of data.
+header_format = "<4sH8sB4III"
+header_size = 64
+magic = b"RCTB"
+format_version = 1
+
+default_cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+
+def get_cache_dir() -> str:
+	"""Directory with tables, may be changed by RUBIKS_TABLES_DIR environment variable."""
+	return os.environ.get("RUBIKS_TABLES_DIR", default_cache_dir)
+
+
+def is_verify_enabled() -> bool:
+	"""
+	Checksums of loaded tables are checked only if RUBIKS_VERIFY_TABLES
+	environment variable is set: it reads the whole table at every start.
+	"""
+	return os.environ.get("RUBIKS_VERIFY_TABLES", "") not in ("", "0")
+
+
+def write_table(path:str, key:str, table:np.ndarray) -> None:
+	"""Writes table with header. File is replaced atomically, so readers never see half of it."""
+	table = np.ascontiguousarray(table)
+	if table.ndim > 4:
+		raise ValueError(f"Table must have at most 4 dimensions but has {table.ndim}")
+
+	shape = tuple(table.shape) + (0,) * (4 - table.ndim)
+	header = struct.pack(
+		header_format, magic, format_version, table.dtype.str.encode(), table.ndim,
+		*shape, zlib.crc32(key.encode()), zlib.crc32(table.data),
+	)
+
+	directory = os.path.dirname(path)
+	os.makedirs(directory, exist_ok=True)
+	fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+	try:
+		with os.fdopen(fd, "wb") as f:
+			f.write(header.ljust(header_size, b"\0"))
+			f.write(table.data)
+		os.chmod(tmp_path, 0o644)
+		os.replace(tmp_path, path)
+	except BaseException:
+		os.remove(tmp_path)
+		raise
+
+
+def read_table(path:str, key:str, verify:bool=False) -> np.ndarray:
+	"""
+	Returns read-only memory-mapped table or None if file doesn't exist,
+	has other format version, was built with other key or has other size.
+	If verify, also None if checksum of data doesn't match.
+	"""
+	try:
+		with open(path, "rb") as f:
+			header = f.read(header_size)
+	except FileNotFoundError:
+		return None
+
+	if len(header) < header_size:
+		return None
+
+	file_magic, version, dtype, ndim, *shape, key_crc, data_crc = struct.unpack_from(header_format, header)
+	if file_magic != magic or version != format_version or key_crc != zlib.crc32(key.encode()):
+		return None
+
+	dtype = np.dtype(dtype.rstrip(b"\0").decode())
+	shape = tuple(shape[:ndim])
+	if os.path.getsize(path) != header_size + dtype.itemsize * int(np.prod(shape)):
+		return None
+
+	table = np.memmap(path, dtype=dtype, mode="r", offset=header_size, shape=shape)
+	if verify and zlib.crc32(table.data) != data_crc:
+		return None
+
+	return table
+
+
+def load_table(name:str, key:str, builder) -> np.ndarray:
+	"""
+	Returns memory-mapped table name from cache directory. If table is missing
+	or stale (was built with other key) it's built by builder() and saved.
+	key should be changed together with the code of builder. Built table is
+	verified once after writing, loaded one only if is_verify_enabled().
+	"""
+	path = os.path.join(get_cache_dir(), f"{name}.tbl")
+	table = read_table(path, key, is_verify_enabled())
+	if table is None:
+		write_table(path, key, builder())
+		table = read_table(path, key, verify=True)
+		if table is None:
+			raise RuntimeError(f"Table {path} is corrupted right after writing")
+
+	return table
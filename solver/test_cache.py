@@ -0,0 +1,58 @@
+import numpy as np
+
+from datatypes import FaceletCube, CubeBatch, orientations
+from cache import SolutionCache, get_canonical_state
+from solver import Solver
+from test_datatypes import sides_map
+from test_optimizer import apply
+
+
+def get_scrambled(seed:int) -> FaceletCube:
+	moves = np.random.default_rng(seed).integers(0, 18, size=(1, 40))
+	return CubeBatch.from_sides_map(sides_map, 1).apply_sequence(moves)[0]
+
+
+def get_variants(rubcube:FaceletCube) -> list:
+	"""rubcube rotated by every orientation, then with colors relabeled."""
+	colors = np.random.default_rng(0).permutation(6).astype(np.uint8)
+	rotated = [FaceletCube.from_facelets(rubcube.facelets[permutation]) for permutation, _ in orientations]
+	return rotated + [FaceletCube.from_facelets(colors[cube.facelets]) for cube in rotated]
+
+
+def is_solved(rubcube:FaceletCube) -> bool:
+	return bool(CubeBatch(rubcube.facelets).is_solved().all())
+
+
+def test_canonical_state_ignores_rotation_and_colors():
+	rubcube = get_scrambled(0)
+	state, _ = get_canonical_state(rubcube)
+	assert all(get_canonical_state(variant)[0] == state for variant in get_variants(rubcube))
+	assert get_canonical_state(get_scrambled(1))[0] != state
+
+
+def test_rotated_and_recolored_cubes_hit():
+	rubcube = get_scrambled(2)
+	cache = SolutionCache()
+	cache.put(rubcube, Solver(rubcube).solve())
+
+	for variant in get_variants(rubcube):
+		moves = cache.get(variant)
+		assert moves is not None
+		assert is_solved(apply(variant, moves))
+	assert cache.get(get_scrambled(3)) is None
+	assert cache.hits == 48 and cache.misses == 1
+
+
+def test_tags_and_database(tmp_path):
+	path = str(tmp_path / "solutions.sqlite")
+	rubcube = get_scrambled(4)
+	cache = SolutionCache(path=path)
+	cache.put(rubcube, Solver(rubcube).solve(), "anytime")
+	assert cache.get(rubcube, "layers") is None
+	cache.close()
+
+	cache = SolutionCache(max_size=1, path=path)
+	cache.put(get_scrambled(5), Solver(get_scrambled(5)).solve())
+	moves = cache.get(rubcube, "anytime")
+	assert moves is not None and is_solved(apply(rubcube, moves))
+	cache.close()
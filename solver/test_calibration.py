@@ -0,0 +1,46 @@
+import numpy as np
+
+from calibration import calibrate, reference_rgb
+from color_assignment import get_log_probs
+from test_color_assignment import get_scrambled
+
+# Sensor of other session (dim bluish light): gain and offset of every channel
+gains = np.array([0.6, 0.8, 1.2])
+offsets = np.array([8.0, 2.0, 0.0])
+
+
+def get_drifted(facelets:np.ndarray) -> list:
+	"""Readings (6, 3, 3, 3) of every square: reference_rgb of its color after the drift."""
+	return (reference_rgb[facelets] * gains + offsets).reshape(6, 3, 3, 3).tolist()
+
+
+def get_nearest_colors(rgb:np.ndarray) -> np.ndarray:
+	return ((rgb.reshape(-1, 1, 3) - reference_rgb[None]) ** 2).sum(axis=2).argmin(axis=1)
+
+
+def test_drift_is_removed():
+	facelets = get_scrambled(0)
+	raw_colors = get_drifted(facelets)
+	assert not np.array_equal(get_nearest_colors(np.array(raw_colors)), facelets)
+
+	rgb = calibrate(raw_colors).reshape(54, 3)
+	assert np.array_equal(get_nearest_colors(rgb), facelets)
+	# Ridge keeps transform closer to identity than the drift, so it isn't exact
+	errors = np.abs(rgb - reference_rgb[facelets]).max(axis=1)
+	raw_errors = np.abs(np.reshape(raw_colors, (54, 3)) - reference_rgb[facelets]).max(axis=1)
+	assert errors.mean() < raw_errors.mean() / 2
+
+
+def test_side_which_isnt_scanned_is_nan():
+	facelets = get_scrambled(1)
+	raw_colors = get_drifted(facelets)
+	raw_colors[3] = None
+
+	rgb = calibrate(raw_colors).reshape(54, 3)
+	assert np.isnan(rgb[27:36]).all()
+	scanned = np.arange(54) // 9 != 3
+	assert np.array_equal(get_nearest_colors(rgb[scanned]), facelets[scanned])
+
+	log_probs = get_log_probs(raw_colors)
+	assert np.allclose(log_probs[27:36], np.log(1 / 6))
+	assert np.array_equal(log_probs[scanned].argmax(axis=1), facelets[scanned])
@@ -0,0 +1,69 @@
+import itertools
+import numpy as np
+
+from datatypes import CubeBatch, FaceletCube
+from calibration import reference_rgb
+from color_assignment import (assign_colors, linear_sum_assignment, check_scan, max_rereads,
+							  max_reread_squares, max_corrected_squares)
+from two_phase import CubieCube
+from test_datatypes import sides_map
+
+
+def get_scrambled(seed:int) -> np.ndarray:
+	moves = np.random.default_rng(seed).integers(0, 18, size=(1, 40))
+	return CubeBatch.from_sides_map(sides_map, 1).apply_sequence(moves).states[0]
+
+
+def get_raw_colors(facelets:np.ndarray, rng, noise:float=3.0) -> list:
+	"""Readings of color sensor (6, 3, 3, 3) of every square: reference_rgb of its color with noise."""
+	rgb = reference_rgb[facelets] + rng.normal(0, noise, size=(54, 3))
+	return np.clip(np.round(rgb), 0, 100).reshape(6, 3, 3, 3).tolist()
+
+
+def test_linear_sum_assignment_is_optimal():
+	rng = np.random.default_rng(0)
+	for _ in range(20):
+		cost = rng.random((5, 5))
+		cols = linear_sum_assignment(cost.tolist())
+		best = min(itertools.permutations(range(5)), key=lambda perm: cost[range(5), perm].sum())
+		assert np.isclose(cost[range(5), cols].sum(), cost[range(5), best].sum())
+
+
+def test_noisy_scan_is_assigned_exactly():
+	rng = np.random.default_rng(0)
+	for seed in range(5):
+		facelets = get_scrambled(seed)
+		assigned, _ = assign_colors(get_raw_colors(facelets, rng))
+		assert assigned == FaceletCube.from_facelets(facelets).to_sides_map()
+
+
+def test_swapped_square_is_repaired():
+	rng = np.random.default_rng(1)
+	for seed in range(5):
+		facelets = get_scrambled(seed)
+		raw_colors = np.array(get_raw_colors(facelets, rng)).reshape(54, 3)
+		# Edge square is read as the color of another edge square
+		wrong = next(idx for idx in range(1, 54, 2) if facelets[idx] != facelets[1])
+		raw_colors[1] = raw_colors[wrong]
+
+		assigned, confidences = assign_colors(raw_colors.reshape(6, 3, 3, 3).tolist())
+		repaired = FaceletCube(assigned).facelets
+		CubieCube.from_facelets(repaired).verify()
+		assert np.array_equal(repaired, facelets)
+		assert confidences[0, 0, 1] < 0
+
+
+def test_check_scan():
+	confidences = np.ones((6, 3, 3))
+	assert check_scan(confidences, 0) == ([], False)
+
+	confidences[2, 0, 1] = 0.1
+	confidences[4, 2, 2] = -0.5
+	assert check_scan(confidences, 0) == ([[2, 0, 1], [4, 2, 2]], False)
+	assert check_scan(confidences, max_rereads) == ([], False)
+
+	confidences.flat[:max_reread_squares + 1] = 0.1
+	assert check_scan(confidences, 0) == ([], False)
+	confidences.flat[:max_corrected_squares + 1] = -0.1
+	assert check_scan(confidences, 0) == ([], True)
+	assert check_scan(confidences, max_rereads) == ([], True)
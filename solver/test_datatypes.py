@@ -0,0 +1,40 @@
+import numpy as np
+
+from datatypes import CubeBatch, FaceletCube
+
+sides_map = [[[color] * 3 for _ in range(3)] for color in "ybrgow"]
+
+
+def get_inverse(moves) -> list:
+	"""Moves which undo moves: reversed, every turn by the other direction."""
+	return [move // 3 * 3 + 2 - move % 3 for move in reversed(moves)]
+
+
+def test_apply_sequence_is_apply_move_of_every_cube():
+	rng = np.random.default_rng(0)
+	moves = rng.integers(0, 18, size=(8, 40))
+	batch = CubeBatch.from_sides_map(sides_map, len(moves)).apply_sequence(moves)
+
+	for i, cube_moves in enumerate(moves):
+		rubcube = FaceletCube(sides_map)
+		for move in cube_moves:
+			rubcube.apply_move(int(move))
+		assert np.array_equal(batch.states[i], rubcube.facelets)
+
+
+def test_padding_move_does_nothing():
+	batch = CubeBatch.from_sides_map(sides_map, 2).apply_sequence([[0, 4], [0, 4]])
+	padded = batch.copy().apply([-1, 7])
+
+	assert np.array_equal(padded.states[0], batch.states[0])
+	assert not np.array_equal(padded.states[1], batch.states[1])
+
+
+def test_inverse_sequence_solves_batch():
+	rng = np.random.default_rng(1)
+	moves = rng.integers(0, 18, size=(16, 30))
+	batch = CubeBatch.from_sides_map(sides_map, len(moves)).apply_sequence(moves)
+	assert not batch.is_solved().any()
+
+	batch.apply_sequence(np.array([get_inverse(cube_moves) for cube_moves in moves]))
+	assert (batch.is_valid_counts() & batch.is_solved()).all()
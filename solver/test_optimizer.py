@@ -0,0 +1,45 @@
+import numpy as np
+
+from datatypes import FaceletCube, CubeBatch
+from optimizer import optimize_moves
+from solver import Solver
+from test_datatypes import sides_map, get_inverse
+
+
+def apply(rubcube:FaceletCube, moves) -> FaceletCube:
+	rubcube = rubcube.copy()
+	for move in moves:
+		rubcube.apply_move(move)
+	return rubcube
+
+
+def test_opposite_sides_are_merged():
+	# Top, bottom, top back, bottom gives bottom twice
+	assert list(optimize_moves([0, 15, 2, 15])) == [16]
+	# Top, right, right back, top back gives nothing
+	assert list(optimize_moves([0, 6, 8, 2])) == []
+
+
+def test_optimized_moves_give_the_same_cube():
+	rng = np.random.default_rng(0)
+	rubcube = FaceletCube(sides_map)
+	for _ in range(50):
+		# Few sides, so there is a lot to optimize
+		moves = [int(move) for move in rng.choice([0, 1, 2, 15, 16, 17, 3], size=30)]
+		optimized = optimize_moves(moves)
+		assert len(optimized) <= len(moves)
+		assert apply(rubcube, optimized) == apply(rubcube, moves)
+
+
+def test_optimized_solutions_solve_cubes():
+	rng = np.random.default_rng(1)
+	moves = rng.integers(0, 18, size=(10, 40))
+	batch = CubeBatch.from_sides_map(sides_map, len(moves)).apply_sequence(moves)
+	for i, cube_moves in enumerate(moves):
+		# Undo of the scramble with front and front back at the end
+		redundant = get_inverse(cube_moves.tolist()) + [3, 5]
+		assert len(optimize_moves(redundant)) <= len(redundant) - 2
+
+		for solution in (redundant, Solver(batch[i]).solve()):
+			solved = apply(batch[i], optimize_moves(solution))
+			assert CubeBatch(solved.facelets).is_solved().all()
@@ -0,0 +1,32 @@
+import struct
+import pytest
+
+from protocol import MessageReader, encode_message, max_body_size, length_format
+
+messages = [
+	{"seq": 0, "cmd": "hello", "data": None},
+	{"seq": 1, "cmd": "move", "data": "F P1 T2"},
+	{"seq": 2, "cmd": "squares", "data": [[0, 1, 2, [58, 88, 100]]]},
+]
+stream = b"".join(encode_message(**message) for message in messages)
+
+
+def test_split_frames():
+	reader = MessageReader()
+	received = list()
+	for i in range(len(stream)):
+		received.extend(reader.feed(stream[i:i + 1]))
+
+	assert received == messages
+	assert not reader.buffer
+
+
+def test_coalesced_frames():
+	reader = MessageReader()
+	assert reader.feed(stream + stream[:3]) == messages
+	assert reader.feed(stream[3:]) == messages
+
+
+def test_oversize_frame():
+	with pytest.raises(ValueError):
+		MessageReader().feed(struct.pack(length_format, max_body_size + 1))
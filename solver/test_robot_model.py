@@ -0,0 +1,54 @@
+import random
+import pytest
+
+from datatypes import CubeBatch
+from robot_model import RobotModel, get_robot_program, compress_program, expand_program
+from solver import Solver
+from fake_robot import scramble
+
+
+def run_program(rubcube, program:list) -> RobotModel:
+	"""Turns rubcube by program as robot does (see fake_robot.FakeRobot.run_moves)."""
+	robot = RobotModel.after_scan()
+	for primitives in program:
+		for code in primitives:
+			if code[0] == "T":
+				rubcube.apply_move(robot.side_codes_seq[5] * 3 + int(code[1]) - 1)
+			robot.apply_primitive(code)
+
+	return robot
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_program_solves_cube(seed):
+	rubcube = scramble(rng=random.Random(seed))
+	moves, program, robot_time = get_robot_program(Solver(rubcube).solve())
+	assert len(program) == len(moves)
+	assert all(primitives[-1][0] == "T" for primitives in program)
+
+	robot = run_program(rubcube, program)
+	assert CubeBatch(rubcube.facelets).is_solved().all()
+	# Time of primitives and overhead of every move
+	assert robot_time == pytest.approx(robot.time + len(moves) * robot.move_overhead)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compressed_program_round_trip(seed):
+	rng = random.Random(seed)
+	# A few distinct moves, so there are repeated pairs and runs
+	moves = [" ".join(rng.choice(["F", "P1", "P2", "P3"]) for _ in range(rng.randrange(3))) + f" T{rng.randrange(1, 4)}"
+			 for _ in range(8)]
+	program = [rng.choice(moves).split() for _ in range(rng.randrange(1, 200))]
+	moves_per_ack = rng.choice([1, 3, 10, 50])
+
+	compressed = compress_program(program, moves_per_ack)
+	steps = expand_program(compressed)
+	assert [move.split() for step in steps for move in step] == program
+	assert all(1 <= len(step) <= moves_per_ack for step in steps)
+
+
+def test_compressed_solution_round_trip():
+	program = get_robot_program(Solver(scramble(rng=random.Random(0))).solve())[1]
+	compressed = compress_program(program)
+	assert compressed["macros"]
+	assert [move.split() for step in expand_program(compressed) for move in step] == program
@@ -0,0 +1,21 @@
+import random
+import asyncio
+
+from server import SolverServer
+from cache import SolutionCache
+from fake_robot import FakeRobot, scramble
+
+
+def test_fake_robot_is_solved():
+	async def run() -> dict:
+		server = SolverServer("127.0.0.1", 0, deadline_ms=200, cache=SolutionCache(), max_workers=1)
+		await server.start()
+		try:
+			robot = FakeRobot("127.0.0.1", server.port, scramble(rng=random.Random(0)), noise=0.02, seed=0)
+			return await asyncio.wait_for(robot.run(), timeout=60)
+		finally:
+			await server.shutdown()
+
+	metrics = asyncio.run(run())
+	assert metrics["solved"]
+	assert metrics["moves"] > 0
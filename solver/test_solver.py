@@ -1,50 +1,20 @@
-import random
-import copy
 import numpy as np
 
-from datatypes import RubiksCube
+from datatypes import CubeBatch
 from solver import Solver
 
-def disassemble_rubcube(rubcube:RubiksCube) -> RubiksCube:
-	"""Disassemble rebcube."""
-	for i in range(10**4 // 2):
-		side_idx = random.randint(0, 5)
-		n_rots = random.randint(1, 2)
-		rubcube.rotate_side(side_idx, n_rots)
+def disassemble_rubcubes(rubcubes:CubeBatch, n_moves:int=10**4 // 2, seed:int=0) -> CubeBatch:
+	"""Disassemble every rubcube of batch by its own n_moves random moves."""
+	moves = np.random.default_rng(seed).integers(0, 18, size=(len(rubcubes), n_moves))
+	return rubcubes.apply_sequence(moves)
 
-	return rubcube
+def validation(rubcubes:CubeBatch) -> np.ndarray:
+	"""Validation that every rubcube of batch was assembled correct."""
+	return rubcubes.is_valid_counts() & rubcubes.is_solved()
 
-def validation(rubcube:RubiksCube) -> bool:
-	"""Validation that rubcube was assembled correct."""
-	for side_idx in range(6):
-		central_cube_color = rubcube.sides_map[side_idx][1][1].color
-		for row_idx in range(3):
-			for col_idx in range(3):
-				if row_idx == col_idx == 1:
-					continue
-
-				color = rubcube.sides_map[side_idx][row_idx][col_idx].color
-				if color != central_cube_color:
-					return False
-
-	return True
-
-def get_color_from_sides_map(original_sides_map:np.ndarray) -> list:
-	"""Generates sides map with colors."""
-	original_sides_map = rubcube.sides_map
-	sides_map = []
-	for side in original_sides_map:
-		color_side = []
-		for row in side:
-			color_row = []
-			for cell in row:
-				color_row.append(cell.color)
-
-			color_side.append(color_row)
-
-		sides_map.append(color_side)
-
-	return sides_map
+def pad_moves(moves:list, length:int) -> list:
+	"""Pads moves indices by -1 (no move) to length."""
+	return list(moves) + [-1] * (length - len(moves))
 
 sides_map = [
 	[['y', 'y', 'y'], ['y', 'y', 'y'], ['y', 'y', 'y']],
@@ -55,27 +25,16 @@ sides_map = [
 	[['w', 'w', 'w'], ['w', 'w', 'w'], ['w', 'w', 'w']]
 ]
 
-rubcube = RubiksCube(sides_map)
-
 iter_num = 100
-for i in range(iter_num):
-	print(f"======= Iteration: {i+1}/{iter_num} =======")
-	original_sides_map = copy.deepcopy(rubcube.sides_map)
-	rubcube = disassemble_rubcube(rubcube)
-	print("Disassembled")
 
-	with open("last_sides_map.txt", 'w') as f:
-		f.write(str(get_color_from_sides_map(rubcube.sides_map)))
-		print("Sides map saved to file")
 
-	solver = Solver(rubcube)
-	solver.solve()
-	rubcube = solver.rubcube
-	print("Assembled")
+def test_layers_solutions_are_valid():
+	original_rubcubes = disassemble_rubcubes(CubeBatch.from_sides_map(sides_map, iter_num))
+	solutions = [Solver(original_rubcubes[i]).solve() for i in range(iter_num)]
+
+	max_len = max(map(len, solutions))
+	moves = np.array([pad_moves(solving_steps, max_len) for solving_steps in solutions])
+	valid = validation(original_rubcubes.copy().apply_sequence(moves))
 
-	valid = validation(rubcube)
-	if valid:
-		print("VALID")
-	else:
-		print("INVALID")
-		print(get_color_from_sides_map(original_sides_map))
+	invalid = [original_rubcubes[i].to_sides_map() for i in range(iter_num) if not valid[i]]
+	assert not invalid, invalid
@@ -0,0 +1,65 @@
+import os
+import numpy as np
+
+from tables import load_table, read_table, write_table, header_size
+
+
+expected = np.arange(24, dtype=np.uint16).reshape(4, 6)
+
+
+class Builder:
+	"""Builds expected table and counts calls."""
+	def __init__(self):
+		self.calls = 0
+
+	def __call__(self) -> np.ndarray:
+		self.calls += 1
+		return expected
+
+
+def test_table_is_built_once(tmp_path, monkeypatch):
+	monkeypatch.setenv("RUBIKS_TABLES_DIR", str(tmp_path))
+	builder = Builder()
+	assert np.array_equal(load_table("test", "v1", builder), expected)
+	assert np.array_equal(load_table("test", "v1", builder), expected)
+	assert builder.calls == 1
+
+
+def test_other_key_rebuilds_table(tmp_path, monkeypatch):
+	monkeypatch.setenv("RUBIKS_TABLES_DIR", str(tmp_path))
+	builder = Builder()
+	load_table("test", "v1", builder)
+	assert read_table(str(tmp_path / "test.tbl"), "v2") is None
+
+	assert np.array_equal(load_table("test", "v2", builder), expected)
+	assert builder.calls == 2
+	assert read_table(str(tmp_path / "test.tbl"), "v2") is not None
+
+
+def test_corrupted_table_is_rebuilt(tmp_path, monkeypatch):
+	monkeypatch.setenv("RUBIKS_TABLES_DIR", str(tmp_path))
+	path = str(tmp_path / "test.tbl")
+	builder = Builder()
+	write_table(path, "v1", expected)
+	with open(path, "r+b") as f:
+		f.seek(header_size)
+		f.write(b"\xff")
+
+	# Checksum isn't read by default
+	assert read_table(path, "v1") is not None
+	assert read_table(path, "v1", verify=True) is None
+
+	monkeypatch.setenv("RUBIKS_VERIFY_TABLES", "1")
+	assert np.array_equal(load_table("test", "v1", builder), expected)
+	assert builder.calls == 1
+
+
+def test_truncated_table_is_rebuilt(tmp_path, monkeypatch):
+	monkeypatch.setenv("RUBIKS_TABLES_DIR", str(tmp_path))
+	path = str(tmp_path / "test.tbl")
+	builder = Builder()
+	write_table(path, "v1", expected)
+	os.truncate(path, os.path.getsize(path) - 1)
+
+	assert np.array_equal(load_table("test", "v1", builder), expected)
+	assert builder.calls == 1
@@ -0,0 +1,37 @@
+import numpy as np
+
+from datatypes import CubeBatch
+from two_phase import CubieCube, TwoPhaseSolver, moves_cubies
+from test_datatypes import sides_map
+from test_optimizer import apply
+
+
+def get_scrambled(seed:int, n:int) -> CubeBatch:
+	moves = np.random.default_rng(seed).integers(0, 18, size=(n, 40))
+	return CubeBatch.from_sides_map(sides_map, n).apply_sequence(moves)
+
+
+def test_facelets_round_trip():
+	batch = get_scrambled(0, 20)
+	for i in range(len(batch)):
+		facelets = batch.states[i]
+		cubie_cube = CubieCube.from_facelets(facelets)
+		cubie_cube.verify()
+		assert np.array_equal(cubie_cube.to_facelets(facelets[4::9]), facelets)
+
+
+def test_moves_cubies_are_facelets_moves():
+	solved = CubeBatch.from_sides_map(sides_map, 18).apply(np.arange(18))
+	for move, move_cubie in enumerate(moves_cubies):
+		assert CubieCube.from_facelets(solved.states[move]) == CubieCube().multiply(move_cubie)
+
+
+def test_solutions_are_valid():
+	max_length = 22
+	batch = get_scrambled(1, 5)
+	for i in range(len(batch)):
+		rubcube = batch[i]
+		solution = TwoPhaseSolver(rubcube).solve(max_length=max_length)
+		assert len(solution) <= max_length
+		solved = apply(rubcube, solution)
+		assert CubeBatch(solved.facelets).is_solved().all()
@@ -0,0 +1,553 @@
+import time
+import zlib
+import itertools
+import numpy as np
+
+from datatypes import FaceletCube, adjacent_facelets, moves_permutations
+from shortcuts import counter_side
+from tables import load_table
+from moves import MoveSequence
+
+
+# Moves are indices of datatypes.moves_permutations: side_idx * 3 + n - 1,
+# where n is number of rotations by clockwise.
+# Phase 2 works in subgroup G1 where top (0) and bottom (5) sides are rotated
+# freely and lateral sides only by two rotations.
+phase_2_moves = [move for move in range(18) if move // 3 in (0, 5) or move % 3 == 1]
+# Width of rows of phase 2 move tables
+n_phase_2_moves = len(phase_2_moves)
+
+# Change it together with the code which builds tables
+tables_version = 1
+
+n_twist = 3 ** 7
+n_flip = 2 ** 11
+n_slice = 495
+n_corners_perm = 40320
+n_edges_perm = 40320
+n_slice_perm = 24
+
+factorials = [1, 1, 2, 6, 24, 120, 720, 5040]
+
+
+def get_cubies_facelets() -> tuple:
+	"""
+	Returns (corners, edges): tuples of facelets indices of every corner and edge
+	position. Corners and top/bottom edges start with the facelet at top or bottom
+	side, middle edges start with the facelet at front or back side. Facelets of
+	all corners are in the same cyclic order, so every move only shifts them.
+	Positions at top side go first, then at bottom side, then middle edges.
+	"""
+	corners = [(idx, *adj) for idx, adj in enumerate(adjacent_facelets) if len(adj) == 2 and idx // 9 in (0, 5)]
+	edges = [(idx, *adj) for idx, adj in enumerate(adjacent_facelets) if len(adj) == 1 and idx // 9 in (0, 5)]
+	edges += [(idx, *adj) for idx, adj in enumerate(adjacent_facelets)
+			  if len(adj) == 1 and idx // 9 in (1, 3) and adj[0] // 9 not in (0, 5)]
+
+	# Cyclic order of the first corner is taken as it is and spreads to other
+	# corners by moves, which keep cyclic order of facelets.
+	inverse_permutations = np.argsort(moves_permutations, axis=1).tolist()
+	corner_of_facelet = {idx: pos for pos, corner in enumerate(corners) for idx in corner}
+
+	ordered = {0: corners[0]}
+	queue = [0]
+	while queue:
+		pos = queue.pop()
+		for inverse in inverse_permutations:
+			image = [inverse[idx] for idx in ordered[pos]]
+			new_pos = corner_of_facelet[image[0]]
+			shift = [idx // 9 in (0, 5) for idx in image].index(True)
+			image = tuple(image[shift:] + image[:shift])
+
+			if new_pos not in ordered:
+				ordered[new_pos] = image
+				queue.append(new_pos)
+			elif image != ordered[new_pos]:
+				raise RuntimeError("Moves do not keep cyclic order of corners facelets")
+
+	corners = [ordered[pos] for pos in range(8)]
+	return tuple(corners), tuple(edges)
+
+
+corners_facelets, edges_facelets = get_cubies_facelets()
+
+
+class CubieCube:
+	"""
+	Cube on the level of cubies:
+	- cp[i], ep[i] - cubie at the corner (edge) position i;
+	- co[i], eo[i] - orientation of this cubie: index of its reference
+	  facelet (top/bottom or front/back color) at facelets of position i.
+	"""
+	__slots__ = ("cp", "co", "ep", "eo")
+
+	def __init__(self, cp:list=None, co:list=None, ep:list=None, eo:list=None):
+		self.cp = cp if cp is not None else list(range(8))
+		self.co = co if co is not None else [0] * 8
+		self.ep = ep if ep is not None else list(range(12))
+		self.eo = eo if eo is not None else [0] * 12
+
+	def __eq__(self, other) -> bool:
+		return (self.cp, self.co, self.ep, self.eo) == (other.cp, other.co, other.ep, other.eo)
+
+	def multiply(self, other:"CubieCube") -> "CubieCube":
+		"""Returns cube which is self after applying other."""
+		return CubieCube(
+			cp=[self.cp[pos] for pos in other.cp],
+			co=[(self.co[pos] + twist) % 3 for pos, twist in zip(other.cp, other.co)],
+			ep=[self.ep[pos] for pos in other.ep],
+			eo=[(self.eo[pos] + flip) % 2 for pos, flip in zip(other.ep, other.eo)],
+		)
+
+	@classmethod
+	def from_facelets(cls, facelets:np.ndarray) -> "CubieCube":
+		"""
+		Creates cubie cube from flat array of 54 colors codes (FaceletCube.facelets).
+		Raises ValueError if the facelets are not a reachable state of Rubik's cube.
+		"""
+		facelets = np.asarray(facelets).tolist()
+		centers = facelets[4::9]
+		if len(set(centers)) != 6:
+			raise ValueError(f"Central squares must have six different colors, but have {centers}")
+
+		# Color of every facelet as side, which central square has this color
+		side_of_color = {color: side for side, color in enumerate(centers)}
+		sides = [side_of_color.get(color, -1) for color in facelets]
+
+		cubie_cube = cls()
+		for cubies_facelets, perm, orient in ((corners_facelets, cubie_cube.cp, cubie_cube.co),
+											  (edges_facelets, cubie_cube.ep, cubie_cube.eo)):
+			cubie_by_sides = {frozenset(idx // 9 for idx in cubie): pos for pos, cubie in enumerate(cubies_facelets)}
+			for pos, cubie in enumerate(cubies_facelets):
+				cubie_sides = [sides[idx] for idx in cubie]
+				cubie = cubie_by_sides.get(frozenset(cubie_sides))
+				if cubie is None or len(set(cubie_sides)) != len(cubie_sides):
+					raise ValueError(f"Cubie with sides {cubie_sides} does not exist")
+
+				perm[pos] = cubie
+				orient[pos] = cubie_sides.index(cubies_facelets[cubie][0] // 9)
+
+		return cubie_cube
+
+	def to_facelets(self, centers:list) -> np.ndarray:
+		"""Flat array of 54 colors codes, centers are colors of central squares of every side."""
+		facelets = np.repeat(np.asarray(centers, dtype=np.uint8), 9)
+		for cubies_facelets, perm, orient in ((corners_facelets, self.cp, self.co),
+											  (edges_facelets, self.ep, self.eo)):
+			for pos, (cubie, shift) in enumerate(zip(perm, orient)):
+				size = len(cubies_facelets[pos])
+				for i, idx in enumerate(cubies_facelets[cubie]):
+					facelets[cubies_facelets[pos][(i + shift) % size]] = centers[idx // 9]
+
+		return facelets
+
+	def verify(self) -> None:
+		"""Raises ValueError if cube can't be solved."""
+		if sorted(self.cp) != list(range(8)) or sorted(self.ep) != list(range(12)):
+			raise ValueError("Some cubies are repeated")
+
+		if sum(self.co) % 3 != 0:
+			raise ValueError("One of the corners is twisted")
+
+		if sum(self.eo) % 2 != 0:
+			raise ValueError("One of the edges is flipped")
+
+		if permutation_parity(self.cp) != permutation_parity(self.ep):
+			raise ValueError("Two cubies are swapped")
+
+	def get_twist(self) -> int:
+		twist = 0
+		for orient in self.co[:7]:
+			twist = twist * 3 + orient
+
+		return twist
+
+	def get_flip(self) -> int:
+		flip = 0
+		for orient in self.eo[:11]:
+			flip = flip * 2 + orient
+
+		return flip
+
+	def get_slice(self) -> int:
+		"""Index of the positions which are taken by middle edges."""
+		mask = 0
+		for pos, cubie in enumerate(self.ep):
+			if cubie >= 8:
+				mask |= 1 << pos
+
+		return slice_by_mask[mask]
+
+	def get_corners_perm(self) -> int:
+		return permutation_rank(self.cp)
+
+	def get_edges_perm(self) -> int:
+		"""Permutation of top and bottom edges, valid only at subgroup G1."""
+		return permutation_rank(self.ep[:8])
+
+	def get_slice_perm(self) -> int:
+		"""Permutation of middle edges, valid only at subgroup G1."""
+		return permutation_rank([cubie - 8 for cubie in self.ep[8:]])
+
+
+def permutation_parity(perm:list) -> int:
+	parity = 0
+	for i in range(len(perm)):
+		for j in range(i + 1, len(perm)):
+			parity ^= perm[i] > perm[j]
+
+	return parity
+
+
+def permutation_rank(perm:list) -> int:
+	"""Index of perm at lexicographical order of all permutations."""
+	rank = 0
+	size = len(perm)
+	for i in range(size):
+		smaller = 0
+		for j in range(i + 1, size):
+			smaller += perm[j] < perm[i]
+
+		rank += smaller * factorials[size - 1 - i]
+
+	return rank
+
+
+def permutations_ranks(perms:np.ndarray) -> np.ndarray:
+	"""Vectorized permutation_rank for every row of perms."""
+	ranks = np.zeros(len(perms), dtype=np.int64)
+	size = perms.shape[1]
+	for i in range(size):
+		smaller = (perms[:, i + 1:] < perms[:, i:i + 1]).sum(axis=1)
+		ranks += smaller * factorials[size - 1 - i]
+
+	return ranks
+
+
+def get_moves_cubies() -> list:
+	"""Returns CubieCube of every move: solved cube after this move."""
+	moves_cubies = list()
+	for permutation in moves_permutations.tolist():
+		# Facelet idx goes to the position where it is taken from
+		inverse = {idx: new_idx for new_idx, idx in enumerate(permutation)}
+		move_cubie = CubieCube()
+		for cubies_facelets, perm, orient in ((corners_facelets, move_cubie.cp, move_cubie.co),
+											  (edges_facelets, move_cubie.ep, move_cubie.eo)):
+			position_of_facelet = {idx: pos for pos, cubie in enumerate(cubies_facelets) for idx in cubie}
+			for pos, cubie in enumerate(cubies_facelets):
+				image = [inverse[idx] for idx in cubie]
+				new_pos = position_of_facelet[image[0]]
+				perm[new_pos] = pos
+				orient[new_pos] = cubies_facelets[new_pos].index(image[0])
+
+		moves_cubies.append(move_cubie)
+
+	return moves_cubies
+
+
+moves_cubies = get_moves_cubies()
+slice_combinations = list(itertools.combinations(range(12), 4))
+slice_by_mask = {sum(1 << pos for pos in combination): idx for idx, combination in enumerate(slice_combinations)}
+solved_slice = CubieCube().get_slice()
+
+
+def get_twist_move_table() -> np.ndarray:
+	"""Returns (n_twist, 18) table: twist coordinate after every move."""
+	twists = np.arange(n_twist)
+	co = np.empty((n_twist, 8), dtype=np.int64)
+	for pos in range(6, -1, -1):
+		twists, co[:, pos] = np.divmod(twists, 3)
+	co[:, 7] = (-co[:, :7].sum(axis=1)) % 3
+
+	table = np.empty((n_twist, 18), dtype=np.uint16)
+	for move, move_cubie in enumerate(moves_cubies):
+		new_co = (co[:, move_cubie.cp] + move_cubie.co) % 3
+		table[:, move] = new_co[:, :7] @ (3 ** np.arange(6, -1, -1))
+
+	return table
+
+
+def get_flip_move_table() -> np.ndarray:
+	"""Returns (n_flip, 18) table: flip coordinate after every move."""
+	flips = np.arange(n_flip)
+	eo = np.empty((n_flip, 12), dtype=np.int64)
+	for pos in range(10, -1, -1):
+		flips, eo[:, pos] = np.divmod(flips, 2)
+	eo[:, 11] = eo[:, :11].sum(axis=1) % 2
+
+	table = np.empty((n_flip, 18), dtype=np.uint16)
+	for move, move_cubie in enumerate(moves_cubies):
+		new_eo = (eo[:, move_cubie.ep] + move_cubie.eo) % 2
+		table[:, move] = new_eo[:, :11] @ (2 ** np.arange(10, -1, -1))
+
+	return table
+
+
+def get_slice_move_table() -> np.ndarray:
+	"""Returns (n_slice, 18) table: slice coordinate after every move."""
+	masks = np.zeros((n_slice, 12), dtype=bool)
+	for idx, combination in enumerate(slice_combinations):
+		masks[idx, list(combination)] = True
+
+	slice_of_mask = np.zeros(1 << 12, dtype=np.uint16)
+	for mask, idx in slice_by_mask.items():
+		slice_of_mask[mask] = idx
+
+	table = np.empty((n_slice, 18), dtype=np.uint16)
+	for move, move_cubie in enumerate(moves_cubies):
+		new_masks = masks[:, move_cubie.ep]
+		table[:, move] = slice_of_mask[new_masks @ (1 << np.arange(12))]
+
+	return table
+
+
+def get_perm_move_table(size:int, offset:int, corners:bool) -> np.ndarray:
+	"""
+	Returns (size!, len(phase_2_moves)) table: rank of permutation of cubies
+	at positions offset..offset+size after every move of phase 2.
+	"""
+	perms = np.array(list(itertools.permutations(range(size))), dtype=np.int8)
+	table = np.empty((len(perms), len(phase_2_moves)), dtype=np.uint16)
+	for move_pos, move in enumerate(phase_2_moves):
+		move_perm = moves_cubies[move].cp if corners else moves_cubies[move].ep
+		move_perm = np.array(move_perm[offset:offset + size]) - offset
+		table[:, move_pos] = permutations_ranks(perms[:, move_perm])
+
+	return table
+
+
+def get_pruning_table(move_table_1:np.ndarray, move_table_2:np.ndarray, start:int) -> np.ndarray:
+	"""
+	Returns flat table of minimal number of moves to reach the state with index
+	start (coord_1 * len(move_table_2) + coord_2) from every pair of coordinates.
+	"""
+	size_2 = len(move_table_2)
+	table = np.full(len(move_table_1) * size_2, 255, dtype=np.uint8)
+	table[start] = 0
+
+	depth = 0
+	frontier = np.array([start])
+	while len(frontier):
+		coord_1, coord_2 = np.divmod(frontier, size_2)
+		new_frontier = list()
+		for move in range(move_table_1.shape[1]):
+			states = move_table_1[coord_1, move].astype(np.int64) * size_2 + move_table_2[coord_2, move]
+			states = np.unique(states[table[states] == 255])
+			table[states] = depth + 1
+			new_frontier.append(states)
+
+		frontier = np.unique(np.concatenate(new_frontier))
+		depth += 1
+
+	return table
+
+
+class Tables:
+	"""
+	Moves and pruning tables of both phases. They are built once, saved to the
+	cache directory of tables module and memory-mapped on the first use.
+	"""
+	instance = None
+
+	def __init__(self):
+		# Tables are rebuilt if version or cube layout were changed
+		key = f"{tables_version}:{zlib.crc32(moves_permutations.tobytes())}"
+
+		twist_move = load_table("twist_move", key, get_twist_move_table)
+		flip_move = load_table("flip_move", key, get_flip_move_table)
+		slice_move = load_table("slice_move", key, get_slice_move_table)
+		corners_perm_move = load_table("corners_perm_move", key, lambda: get_perm_move_table(8, 0, corners=True))
+		edges_perm_move = load_table("edges_perm_move", key, lambda: get_perm_move_table(8, 0, corners=False))
+		slice_perm_move = load_table("slice_perm_move", key, lambda: get_perm_move_table(4, 8, corners=False))
+
+		twist_slice_prune = load_table(
+			"twist_slice_prune", key, lambda: get_pruning_table(twist_move, slice_move, solved_slice))
+		flip_slice_prune = load_table(
+			"flip_slice_prune", key, lambda: get_pruning_table(flip_move, slice_move, solved_slice))
+		corners_slice_prune = load_table(
+			"corners_slice_prune", key, lambda: get_pruning_table(corners_perm_move, slice_perm_move, 0))
+		edges_slice_prune = load_table(
+			"edges_slice_prune", key, lambda: get_pruning_table(edges_perm_move, slice_perm_move, 0))
+
+		# Search reads tables by memoryview: indexing returns python int
+		self.twist_move = memoryview(twist_move).cast("B").cast("H")
+		self.flip_move = memoryview(flip_move).cast("B").cast("H")
+		self.slice_move = memoryview(slice_move).cast("B").cast("H")
+		self.corners_perm_move = memoryview(corners_perm_move).cast("B").cast("H")
+		self.edges_perm_move = memoryview(edges_perm_move).cast("B").cast("H")
+		self.slice_perm_move = memoryview(slice_perm_move).cast("B").cast("H")
+		self.twist_slice_prune = memoryview(twist_slice_prune)
+		self.flip_slice_prune = memoryview(flip_slice_prune)
+		self.corners_slice_prune = memoryview(corners_slice_prune)
+		self.edges_slice_prune = memoryview(edges_slice_prune)
+
+	@classmethod
+	def get(cls) -> "Tables":
+		if cls.instance is None:
+			cls.instance = Tables()
+
+		return cls.instance
+
+
+def get_allowed_moves(moves:list) -> list:
+	"""
+	allowed_moves[last_side + 1] is list of (move_pos, move) pairs from moves
+	which may follow move of last_side: not the same side and not opposite side
+	which commutes with it and was already tried in the other order.
+	last_side -1 means no previous move.
+	"""
+	allowed_moves = list()
+	for last_side in range(-1, 6):
+		allowed_moves.append([
+			(move_pos, move) for move_pos, move in enumerate(moves)
+			if last_side < 0 or not (move // 3 == last_side or
+									 (move // 3 == counter_side[last_side] and move // 3 < last_side))
+		])
+
+	return allowed_moves
+
+
+phase_1_allowed_moves = get_allowed_moves(list(range(18)))
+phase_2_allowed_moves = get_allowed_moves(phase_2_moves)
+phase_2_moves_set = set(phase_2_moves)
+
+
+class TwoPhaseSolver:
+	"""
+	Kociemba's two-phase solver. Phase 1 brings cube to subgroup G1 (no twisted
+	corners and flipped edges, middle edges at middle layer), phase 2 solves
+	it by moves of G1. Uses the same sides codes as solver.Solver.
+	"""
+	max_phase_1_length = 20
+	# Long phase 2 is rare, it's faster to try the next phase 1 solution
+	max_phase_2_length = 10
+	# Seconds of search if caller doesn't give its own limit
+	default_timeout = 10.0
+
+	def __init__(self, rubcube) -> None:
+		self.cubie_cube = CubieCube.from_facelets(FaceletCube.from_cube(rubcube).facelets)
+		self.cubie_cube.verify()
+		self.tables = Tables.get()
+		self.best_length = None
+		self.deadline = None
+		self.strict_deadline = False
+
+	def solve(self, max_length:int=22, timeout:float=default_timeout) -> MoveSequence:
+		"""
+		Search stops at the first solution with at most max_length moves or
+		after timeout seconds with the shortest solution found.
+		"""
+		best_solution = None
+		for solution in self.iter_solutions(deadline=time.perf_counter() + timeout):
+			best_solution = solution
+			if len(solution) <= max_length:
+				break
+
+		return best_solution
+
+	def iter_solutions(self, deadline:float=None, max_length:int=None):
+		"""
+		Generator of solutions (moves.MoveSequence), every next is shorter.
+		Stops after time.perf_counter() reaches deadline, but not before the
+		first solution. If max_length is given, only solutions shorter than it
+		are searched and deadline stops the search anyway: caller already has
+		a solution of max_length moves.
+		"""
+		self.best_length = self.max_phase_1_length + self.max_phase_2_length + 1
+		if max_length is not None:
+			self.best_length = min(self.best_length, max_length)
+
+		self.deadline = deadline
+		self.strict_deadline = max_length is not None
+
+		cubie_cube = self.cubie_cube
+		twist, flip, slice_ = cubie_cube.get_twist(), cubie_cube.get_flip(), cubie_cube.get_slice()
+		distance = max(self.tables.twist_slice_prune[twist * n_slice + slice_],
+					   self.tables.flip_slice_prune[flip * n_slice + slice_])
+
+		for depth in range(distance, self.max_phase_1_length + 1):
+			if depth >= self.best_length or self.is_timeout():
+				return
+
+			yield from self.search_phase_1(twist, flip, slice_, depth, list())
+
+	def is_timeout(self) -> bool:
+		"""Search is stopped by deadline only after the first solution if deadline isn't strict."""
+		if self.deadline is None:
+			return False
+
+		has_solution = self.strict_deadline or self.best_length <= self.max_phase_1_length + self.max_phase_2_length
+		return has_solution and time.perf_counter() > self.deadline
+
+	def search_phase_1(self, twist:int, flip:int, slice_:int, depth:int, moves:list):
+		if depth == 0:
+			yield from self.start_phase_2(moves)
+			return
+
+		tables = self.tables
+		twist_move, flip_move, slice_move = tables.twist_move, tables.flip_move, tables.slice_move
+		twist_slice_prune, flip_slice_prune = tables.twist_slice_prune, tables.flip_slice_prune
+
+		for _, move in phase_1_allowed_moves[moves[-1] // 3 + 1 if moves else 0]:
+			new_slice = slice_move[slice_ * 18 + move]
+			new_twist = twist_move[twist * 18 + move]
+			if twist_slice_prune[new_twist * n_slice + new_slice] >= depth:
+				continue
+
+			new_flip = flip_move[flip * 18 + move]
+			if flip_slice_prune[new_flip * n_slice + new_slice] >= depth:
+				continue
+
+			moves.append(move)
+			if depth > 1:
+				yield from self.search_phase_1(new_twist, new_flip, new_slice, depth - 1, moves)
+			elif move not in phase_2_moves_set:
+				# Phase 1 solution, which ends by move of G1, was found with less depth
+				yield from self.start_phase_2(moves)
+			moves.pop()
+
+			if len(moves) + depth >= self.best_length or self.is_timeout():
+				return
+
+	def start_phase_2(self, phase_1_moves:list):
+		cubie_cube = self.cubie_cube
+		for move in phase_1_moves:
+			cubie_cube = cubie_cube.multiply(moves_cubies[move])
+
+		corners, edges, slice_perm = cubie_cube.get_corners_perm(), cubie_cube.get_edges_perm(), cubie_cube.get_slice_perm()
+		distance = max(self.tables.corners_slice_prune[corners * n_slice_perm + slice_perm],
+					   self.tables.edges_slice_prune[edges * n_slice_perm + slice_perm])
+		max_depth = min(self.best_length - 1 - len(phase_1_moves), self.max_phase_2_length)
+
+		for depth in range(distance, max_depth + 1):
+			moves = list(phase_1_moves)
+			if self.search_phase_2(corners, edges, slice_perm, depth, moves):
+				self.best_length = len(moves)
+				yield MoveSequence(moves)
+				return
+
+	def search_phase_2(self, corners:int, edges:int, slice_perm:int, depth:int, moves:list) -> bool:
+		if depth == 0:
+			return corners == 0 and edges == 0 and slice_perm == 0
+
+		tables = self.tables
+		corners_perm_move, edges_perm_move = tables.corners_perm_move, tables.edges_perm_move
+		slice_perm_move = tables.slice_perm_move
+		corners_slice_prune, edges_slice_prune = tables.corners_slice_prune, tables.edges_slice_prune
+		width = n_phase_2_moves
+
+		for move_pos, move in phase_2_allowed_moves[moves[-1] // 3 + 1 if moves else 0]:
+			new_slice_perm = slice_perm_move[slice_perm * width + move_pos]
+			new_corners = corners_perm_move[corners * width + move_pos]
+			if corners_slice_prune[new_corners * n_slice_perm + new_slice_perm] >= depth:
+				continue
+
+			new_edges = edges_perm_move[edges * width + move_pos]
+			if edges_slice_prune[new_edges * n_slice_perm + new_slice_perm] >= depth:
+				continue
+
+			moves.append(move)
+			if self.search_phase_2(new_corners, new_edges, new_slice_perm, depth - 1, moves):
+				return True
+			moves.pop()
+
+		return False